@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+import os
+
+
+def writeAtomic(path, text):
+    """Replace the file at `path` with `text`, all or nothing.
+
+    The text goes to path + ".tmp", is flushed and synced to disk and only
+    then renamed over `path`, so a crash or power cut leaves either the old
+    or the new content, never a truncated file. IOError/OSError propagate;
+    the caller logs them and decides what a failed write means.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmp_path, path)
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the FootScores render and goal-detection hot paths.
+
+Runs on a PC (Python 3) with the Enigma2 modules stubbed out, against
+synthetic match days of 10, 100 and 1000 matches:
+
+    python benchmarks/bench.py                 # all cases, save + compare
+    python benchmarks/bench.py --sizes 10,100 --no-e2e
+    python benchmarks/bench.py --no-save       # just print
+
+Per case it reports the median and p95 latency of one call, the memory
+blocks a call leaves allocated and its peak traced memory (tracemalloc).
+"fetch_to_paint" times a full poll cycle against tools/mockserver.py:
+HTTP fetch on the worker thread, parse, diff, goal checks, render and
+setText on the scores widget. "boot" is the GUI-start and first-open
+import cost from benchmarks/boot.py.
+
+Results are written to benchmarks/results/<plugin version>-<commit>.json
+("+dirty" when the tree has uncommitted changes) and compared with the
+newest other result, so a regression shows up next to the number it
+regressed from even while PLUGIN_VERSION stays the same.
+"""
+import os
+import sys
+import json
+import time
+import glob
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "tools"))
+
+import e2stubs
+import mockserver
+import boot
+
+DEFAULT_SIZES = (10, 100, 1000)
+REGRESSION_RATIO = 1.2      # flag cases more than 20% slower than last time
+
+# Two moments of the synthetic match day: most matches live, several
+# goals (and the odd VAR decision) between them.
+MINUTE_A = 50
+MINUTE_B = 70
+
+
+class Bench(object):
+    """One plugin screen wired to stubs, temp storage and a synthetic day."""
+
+    def __init__(self, ui, size, workdir):
+        self.size = size
+        self.ui = ui
+        self.spec = mockserver.syntheticTimeline(size, seed=size)
+        self.codes = [code for code, name in mockserver.COMPETITIONS]
+        timeline = mockserver.ScriptedTimeline(self.spec, time.time() - MINUTE_A * 60)
+        self.payload_a = {"matches": timeline.payload(MINUTE_A)}
+        self.payload_b = {"matches": timeline.payload(MINUTE_B)}
+
+        snapshot = sys.modules[e2stubs.PACKAGE + ".snapshot"]
+        goalstore = sys.modules[e2stubs.PACKAGE + ".goalstore"]
+        teams = sys.modules[e2stubs.PACKAGE + ".teams"]
+        sound = sys.modules[e2stubs.PACKAGE + ".sound"]
+        service = sys.modules[e2stubs.PACKAGE + ".service"]
+        snapshot.SNAPSHOT_DIR = workdir
+        service.GoalStore = lambda: goalstore.GoalStore(path=os.path.join(workdir, "goals.json"))
+        service.TeamIndex = lambda: teams.TeamIndex(path=os.path.join(workdir, "teams.json"))
+        config = sys.modules[e2stubs.PACKAGE + ".config"]
+        settings = config.Settings(path=os.path.join(workdir, "config.json"))
+        settings.update({
+            "filter_league": ui.MULTI_LEAGUE,
+            "league_name": ", ".join(self.codes),
+            "api_key": mockserver.DEFAULT_KEY,
+            "filter_leagues": self.codes,
+        })
+        service.getSettings = lambda: settings
+        ui.GoalSound = lambda path: sound.GoalSound(path, backend=sound.NullBackend())
+
+        # A fresh service, renderer and notifier per size
+        service._service = None
+        ui.renderer = ui.notifier = None
+        self.session = e2stubs.Session()
+        self.service = ui.setup(self.session)
+        self.renderer = ui.renderer
+        self.screen = ui.FootballScoresScreen(self.session)
+        self.service.subscribe(self.screen.serviceUpdated)
+        self.service.applyPayload(self.payload_a)
+        self.records = self.service.matches
+        self.bar = ui.FootballScoresBar(self.session)
+        self.parseMatches = service.parseMatches
+        self.diffPayloads = service.diffPayloads
+        self.flip = False
+
+    def close(self):
+        self.service.stop()
+
+    def invalidate(self):
+        """Forget every cached rendering so the next paint is done from scratch."""
+        self.service.bumpGeneration()
+
+    # --- cases ---
+    def formatLines(self):
+        format_line = self.renderer.formatMatchLine
+        for match in self.records:
+            format_line(match)
+            format_line(match, True)
+
+    def displayCold(self):
+        self.invalidate()
+        self.screen.displayScores()
+
+    def displayWarm(self):
+        self.screen.displayScores()
+
+    def goalDetection(self):
+        # Alternate between the two moments: every call diffs, checks goals
+        # (and VAR reversals on the way back) and updates the goal store.
+        service = self.service
+        self.flip = not self.flip
+        matches = self.parseMatches(self.payload_b if self.flip else self.payload_a)
+        events = self.diffPayloads(service.matches, matches)
+        service.matches = matches
+        service.applyEvents(events)
+
+    def hiddenPoll(self):
+        # As with every screen closed: only the goal notifier subscribed
+        service = self.service
+        listeners = service.listeners
+        service.listeners = [entry for entry in listeners if not entry[1]]
+        self.flip = not self.flip
+        service.trackInBackground(self.payload_b if self.flip else self.payload_a)
+        service.listeners = listeners
+
+    def barCold(self):
+        self.invalidate()
+        self.bar.updateDisplay()
+
+    def barWarm(self):
+        self.bar.updateDisplay()
+
+
+CASES = [
+    ("formatMatchLine", Bench.formatLines),
+    ("displayScores_cold", Bench.displayCold),
+    ("displayScores_warm", Bench.displayWarm),
+    ("goal_detection", Bench.goalDetection),
+    ("hidden_poll", Bench.hiddenPoll),
+    ("bar_updateDisplay_cold", Bench.barCold),
+    ("bar_updateDisplay_warm", Bench.barWarm),
+]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(call, repeat):
+    call()      # warm-up: first-call imports, caches, lazily built state
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    return {
+        "median_ms": round(percentile(times, 0.5) * 1000, 4),
+        "p95_ms": round(percentile(times, 0.95) * 1000, 4),
+        "alloc_blocks": blocks,
+        "peak_kb": round((peak - base) / 1024.0, 1),
+        "runs": repeat,
+    }
+
+
+def measureFetchToPaint(bench, repeat):
+    """Poll cycles against the mock server, timed until the scores widget is set."""
+    server = mockserver.startServer(
+        mockserver.ScriptedTimeline(bench.spec, time.time() - MINUTE_A * 60),
+        speed=60, per_minute=10 ** 6)
+    service = bench.service
+    screen = bench.screen
+    service.config.set("api_base", "http://127.0.0.1:%d/v4/" % server.server_port)
+    # The bar and the main screen are never both painting; time the main one
+    service.unsubscribe(bench.bar.serviceUpdated)
+    # The mock has no quota: the request budget must not pace the cycles
+    service.budget.capacity = service.budget.tokens = 10 ** 6
+    widget = screen["scores"]
+    times = []
+    try:
+        for _ in range(repeat + 1):
+            # Unconditional request and forced repaint: measure a full cycle,
+            # not a 304 or an unchanged-data short cut
+            service.data_url = None
+            service.dirty = True
+            painted = widget.set_count
+            start = time.perf_counter()
+            service.fetchScores()
+            deadline = start + 10
+            while widget.set_count == painted and service.fetch_engine.pending:
+                service.fetch_engine.deliverResults()
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("no paint within 10s")
+                time.sleep(0.0005)
+            if widget.set_count == painted:
+                raise RuntimeError("poll ended without a paint: " + screen["status"].getText())
+            times.append(time.perf_counter() - start)
+    finally:
+        server.shutdown()
+        server.server_close()
+    times = times[1:]       # the first cycle opens the keep-alive connection
+    return {
+        "median_ms": round(percentile(times, 0.5) * 1000, 4),
+        "p95_ms": round(percentile(times, 0.95) * 1000, 4),
+        "runs": repeat,
+    }
+
+
+def repeatFor(size):
+    return max(5, min(500, 20000 // size))
+
+
+def run(sizes, e2e, boot_runs):
+    results = {}
+    if boot_runs:
+        # Child interpreters; must not see the modules imported below
+        results["boot"], _ = boot.measureBoot(boot_runs)
+        for stage in boot.STAGES:
+            report("boot", stage, results["boot"][stage])
+
+    ui = e2stubs.install()
+    version = ui.PLUGIN_VERSION
+    workdir = tempfile.mkdtemp(prefix="footscores-bench-")
+    try:
+        for size in sizes:
+            bench = Bench(ui, size, workdir)
+            try:
+                for name, case in CASES:
+                    stats = measure(lambda: case(bench), repeatFor(size))
+                    results.setdefault(name, {})[str(size)] = stats
+                    report(name, size, stats)
+                if e2e:
+                    stats = measureFetchToPaint(bench, min(20, repeatFor(size)))
+                    results.setdefault("fetch_to_paint", {})[str(size)] = stats
+                    report("fetch_to_paint", size, stats)
+            finally:
+                bench.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "version": version,
+        "commit": treeCommit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+
+
+def report(name, size, stats):
+    line = "%-24s %10s  median %9.3f ms  p95 %9.3f ms" % (name, size, stats["median_ms"], stats["p95_ms"])
+    if "alloc_blocks" in stats:
+        line += "  blocks %+6d" % stats["alloc_blocks"]
+    if "peak_kb" in stats:
+        line += "  peak %8.1f KiB" % stats["peak_kb"]
+    print(line)
+
+
+def treeCommit():
+    """Short commit of the plugin tree, "+dirty" with uncommitted changes; None outside git."""
+    root = os.path.dirname(BENCH_DIR)
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                         cwd=root, stderr=subprocess.DEVNULL)
+        changes = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                          cwd=root, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.decode("ascii").strip() + ("+dirty" if changes.strip() else "")
+
+def resultName(result):
+    if result.get("commit"):
+        return "%s-%s" % (result["version"], result["commit"])
+    return result["version"]
+
+def previousResults(name):
+    """The newest saved result other than `name`, by run date (file times change on checkout)."""
+    results = []
+    for path in glob.glob(os.path.join(RESULTS_DIR, "*.json")):
+        if os.path.basename(path) == name + ".json":
+            continue
+        with open(path, "r") as f:
+            results.append(json.load(f))
+    if not results:
+        return None
+    return max(results, key=lambda result: result["date"])
+
+
+def caseOrder(size):
+    return (0, int(size), "") if size.isdigit() else (1, 0, size)
+
+
+def compare(current, previous):
+    print("\nCompared with %s (%s):" % (resultName(previous), previous["date"]))
+    regressions = 0
+    for name, by_size in sorted(current["results"].items()):
+        for size, stats in sorted(by_size.items(), key=lambda item: caseOrder(item[0])):
+            old = previous["results"].get(name, {}).get(size)
+            if not old or not old["median_ms"]:
+                continue
+            ratio = stats["median_ms"] / old["median_ms"]
+            flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+            regressions += bool(flag)
+            print("%-24s %10s  %9.3f -> %9.3f ms  x%.2f%s" % (name, size, old["median_ms"], stats["median_ms"], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated match counts")
+    parser.add_argument("--no-e2e", action="store_true", help="skip the mock-server fetch-to-paint case")
+    parser.add_argument("--boot-runs", type=int, default=15, help="fresh interpreters for the boot case, 0 to skip")
+    parser.add_argument("--no-save", action="store_true", help="do not write benchmarks/results")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    current = run(sizes, not args.no_e2e, args.boot_runs)
+
+    name = resultName(current)
+    previous = previousResults(name)
+    if not args.no_save:
+        if not os.path.isdir(RESULTS_DIR):
+            os.makedirs(RESULTS_DIR)
+        path = os.path.join(RESULTS_DIR, name + ".json")
+        with open(path, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print("\nSaved " + path)
+    if previous is not None:
+        compare(current, previous)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
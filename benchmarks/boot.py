@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""What FootScores costs the Enigma2 boot, and what opening it first costs.
+
+Enigma2 imports plugin.py and calls Plugins() for every installed plugin
+at GUI start; everything else should only load on the first main().
+Each sample runs in a fresh interpreter (imports only happen once per
+process) with the Enigma2 modules stubbed:
+
+    boot        import plugin + Plugins()
+    first_open  import ui (screens, networking, parsing) as main() does
+
+    python benchmarks/boot.py              # median of 15 samples
+    python benchmarks/boot.py --runs 5
+
+Reported: import time, traced memory (tracemalloc, separate sample so
+tracing does not skew the timings), RSS growth and the modules loaded.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+STAGES = ("boot", "first_open")
+
+
+def rssKb():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except:
+        return 0
+
+
+def sample(trace):
+    """One child-process measurement of both stages; returns a dict per stage."""
+    sys.path.insert(0, BENCH_DIR)
+    import importlib
+    import e2stubs
+    e2stubs.installStubs()
+
+    def boot():
+        plugin = importlib.import_module(e2stubs.PACKAGE + ".plugin")
+        plugin.Plugins()
+
+    def firstOpen():
+        importlib.import_module(e2stubs.PACKAGE + ".ui")
+
+    result = {}
+    for stage, call in zip(STAGES, (boot, firstOpen)):
+        modules = set(sys.modules)
+        rss = rssKb()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        stats = {"ms": elapsed * 1000, "rss_kb": rssKb() - rss,
+                 "modules": sorted(set(sys.modules) - modules)}
+        if trace:
+            stats["traced_kb"] = tracemalloc.get_traced_memory()[0] / 1024.0
+            tracemalloc.stop()
+        result[stage] = stats
+    return result
+
+
+def runSample(trace):
+    args = [sys.executable, os.path.abspath(__file__), "--sample"]
+    if trace:
+        args.append("--trace")
+    output = subprocess.check_output(args)
+    return json.loads(output.decode("utf-8"))
+
+
+def measureBoot(runs=15):
+    """Median timings over `runs` fresh interpreters plus one traced run."""
+    samples = [runSample(False) for _ in range(runs)]
+    traced = runSample(True)
+    result = {}
+    for stage in STAGES:
+        times = sorted(s[stage]["ms"] for s in samples)
+        result[stage] = {
+            "median_ms": round(times[len(times) // 2], 4),
+            "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 4),
+            "rss_kb": sorted(s[stage]["rss_kb"] for s in samples)[len(samples) // 2],
+            "peak_kb": round(traced[stage]["traced_kb"], 1),
+            "modules": len(traced[stage]["modules"]),
+            "runs": runs,
+        }
+    return result, traced
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--sample", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--modules", action="store_true", help="list the modules each stage loads")
+    args = parser.parse_args(argv)
+
+    if args.sample:
+        sys.stdout.write(json.dumps(sample(args.trace)))
+        return 0
+
+    result, traced = measureBoot(args.runs)
+    for stage in STAGES:
+        stats = result[stage]
+        print("%-11s median %8.2f ms  p95 %8.2f ms  traced %8.1f KiB  rss %+6d KiB  modules %3d" % (
+            stage, stats["median_ms"], stats["p95_ms"], stats["peak_kb"], stats["rss_kb"], stats["modules"]))
+        if args.modules:
+            print("    " + " ".join(traced[stage]["modules"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Minimal stand-ins for the Enigma2 modules the plugin imports.
+
+Just enough for the screens to be constructed and driven outside a
+receiver: widgets remember their text and count setText calls, eTimers
+never fire on their own, and the session opens screens synchronously.
+"""
+import os
+import sys
+import types
+import importlib
+import importlib.util
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "Plugins.Extensions.FootScores"
+
+
+class eTimer(object):
+    def __init__(self):
+        self.callback = []
+        self.active = False
+        self.interval = None
+
+    def start(self, interval, single_shot=False):
+        self.active = True
+        self.interval = interval
+
+    def stop(self):
+        self.active = False
+
+    def isActive(self):
+        return self.active
+
+
+class Widget(object):
+    def __init__(self, text=""):
+        self.text = text
+        self.set_count = 0
+        self.visible = True
+        self.instance = types.SimpleNamespace(setPixmapFromFile=lambda path: None)
+
+    def setText(self, text):
+        self.text = text
+        self.set_count += 1
+
+    def getText(self):
+        return self.text
+
+    def show(self):
+        self.visible = True
+
+    def hide(self):
+        self.visible = False
+
+    def pageUp(self):
+        pass
+
+    def pageDown(self):
+        pass
+
+
+class Screen(dict):
+    def __init__(self, session, parent=None):
+        dict.__init__(self)
+        self.session = session
+        self.onLayoutFinish = []
+        self.onClose = []
+        self.onShow = []
+        self.onHide = []
+        self.shown = True
+
+    def show(self):
+        self.shown = True
+
+    def hide(self):
+        self.shown = False
+
+    def close(self, *args):
+        for callback in self.onClose:
+            callback()
+
+
+class ActionMap(object):
+    def __init__(self, contexts, actions, prio=0):
+        self.actions = actions
+
+
+class PluginDescriptor(object):
+    WHERE_PLUGINMENU = 0
+    WHERE_EXTENSIONSMENU = 1
+    WHERE_SESSIONSTART = 2
+    WHERE_AUTOSTART = 3
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class Session(object):
+    def __init__(self):
+        self.dialogs = []
+
+    def open(self, screen_class, *args, **kwargs):
+        screen = screen_class(self, *args, **kwargs)
+        self.dialogs.append(screen)
+        return screen
+
+    def openWithCallback(self, callback, screen_class, *args, **kwargs):
+        return self.open(screen_class, *args, **kwargs)
+
+
+def simpleScreen(name):
+    return type(name, (Screen,), {
+        "__init__": lambda self, session, *args, **kwargs: Screen.__init__(self, session),
+        "TYPE_YESNO": 0, "TYPE_INFO": 1, "TYPE_WARNING": 2, "TYPE_ERROR": 3,
+    })
+
+
+def installStubs():
+    """Register the stub modules and the empty plugin package, nothing else."""
+    if PACKAGE in sys.modules:
+        return sys.modules[PACKAGE]
+
+    def module(name, **attrs):
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attrs)
+        mod.__path__ = []
+        sys.modules[name] = mod
+        return mod
+
+    module("enigma", eTimer=eTimer)
+    module("Plugins")
+    module("Plugins.Extensions")
+    module("Plugins.Plugin", PluginDescriptor=PluginDescriptor)
+    module("Screens")
+    module("Screens.Screen", Screen=Screen)
+    module("Screens.MessageBox", MessageBox=simpleScreen("MessageBox"))
+    module("Screens.ChoiceBox", ChoiceBox=simpleScreen("ChoiceBox"))
+    module("Screens.VirtualKeyBoard", VirtualKeyBoard=simpleScreen("VirtualKeyBoard"))
+    module("Screens.Standby", TryQuitMainloop=simpleScreen("TryQuitMainloop"))
+    module("Components")
+    module("Components.ActionMap", ActionMap=ActionMap)
+    module("Components.Label", Label=Widget)
+    module("Components.ScrollLabel", ScrollLabel=Widget)
+    module("Components.Pixmap", Pixmap=Widget)
+
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(PLUGIN_DIR, "__init__.py"), submodule_search_locations=[PLUGIN_DIR])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def install():
+    """Stubs plus the plugin's screen module (ui.py); returns ui."""
+    installStubs()
+    return importlib.import_module(PACKAGE + ".ui")
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+from enigma import eTimer
+import time
+
+from .scheduler import headerInt
+
+BUDGET_REQUESTS = 10        # football-data.org free tier: requests per window
+BUDGET_WINDOW = 60          # seconds
+LOW_RESERVE = 2             # tokens low-priority work leaves for the live poll and user actions
+PREFETCH_RESERVE = 5        # prefetches only spend a budget that is mostly unused
+BLOCK_FALLBACK = 60         # 429 without a usable reset header
+
+# Priorities, lowest value first
+PRIORITY_LIVE = 0           # the scores poll, timed or user-triggered (league switch, key entry)
+PRIORITY_LOW = 1            # standings, fixtures, match details: deferred while the budget is short
+PRIORITY_PREFETCH = 2       # guesses at what is opened next: never wait, see canSend()
+
+# Request keys: a request queued under a key replaces the one waiting under it
+REQUEST_SCORES = "scores"
+REQUEST_STANDINGS = "standings"
+REQUEST_FIXTURES = "fixtures"
+REQUEST_DETAIL = "detail"
+REQUEST_PREFETCH = "prefetch"
+
+RESERVES = {PRIORITY_LIVE: 0, PRIORITY_LOW: LOW_RESERVE, PRIORITY_PREFETCH: PREFETCH_RESERVE}
+
+
+class RequestBudget(object):
+    """Token bucket that every API request goes through.
+
+    The bucket holds BUDGET_REQUESTS tokens and refills over BUDGET_WINDOW;
+    the quota headers of each response can only lower it, so other users of
+    the key (another box, a phone app) are accounted for as well. A request
+    goes out at once while a token is left, otherwise it waits in a queue
+    ordered by priority. Only one request per key waits: a newer one (the
+    next league switch, the next fixture page) replaces it, so quick
+    changes cost one request, not one each. Low-priority requests also
+    leave LOW_RESERVE tokens untouched, so opening tables never pushes the
+    live poll into a 429.
+    """
+
+    def __init__(self, capacity=BUDGET_REQUESTS, window=BUDGET_WINDOW):
+        self.capacity = capacity
+        self.rate = capacity / float(window)
+        self.tokens = float(capacity)
+        self.updated = time.time()
+        self.blocked_until = 0      # quota used up upstream: nothing goes out before this
+        self.queue = {}             # key -> [priority, order, start, dropped]
+        self.order = 0
+        self.sent = 0
+        self.deferred = 0
+        self.replaced = 0
+
+        self.timer = eTimer()
+        self.timer.callback.append(self.pump)
+
+    def submit(self, key, priority, start, dropped=None):
+        """Call start() once the budget allows; it must send exactly one request.
+
+        A request still waiting under `key` is replaced (its dropped() is
+        called); the queue position and the higher priority of both are kept.
+        """
+        entry = self.queue.get(key)
+        if entry is not None:
+            self.replaced += 1
+            if entry[3] is not None:
+                entry[3]()
+            entry[0] = min(entry[0], priority)
+            entry[2] = start
+            entry[3] = dropped
+        else:
+            self.order += 1
+            self.queue[key] = [priority, self.order, start, dropped]
+        self.pump()
+        if key in self.queue:
+            self.deferred += 1
+
+    def isQueued(self, key):
+        return key in self.queue
+
+    def canSend(self, priority):
+        """True if a request of `priority` would go out at once, with nothing waiting."""
+        return not self.queue and self.waitTime(priority, time.time()) == 0
+
+    def cancel(self, key):
+        entry = self.queue.pop(key, None)
+        if entry is not None and entry[3] is not None:
+            entry[3]()
+        if not self.queue:
+            self.timer.stop()
+
+    def clear(self):
+        self.queue = {}
+        self.timer.stop()
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(float(self.capacity), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def waitTime(self, priority, now):
+        """Seconds until a request of `priority` may go out; 0 means now."""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        needed = 1 + RESERVES[priority]
+        if self.tokens >= needed:
+            return 0
+        return (needed - self.tokens) / self.rate
+
+    def pump(self):
+        """Send what the budget allows, highest priority first; wake up for the rest."""
+        self.timer.stop()
+        while self.queue:
+            now = time.time()
+            key = min(self.queue, key=lambda k: self.queue[k][:2])
+            entry = self.queue[key]
+            wait = self.waitTime(entry[0], now)
+            if wait > 0:
+                self.timer.start(int(wait * 1000) + 1, True)
+                return
+            del self.queue[key]
+            self.tokens -= 1
+            self.sent += 1
+            try:
+                entry[2]()
+            except Exception as e:
+                print("[FootScores] request %s failed to start: %s" % (key, e))
+
+    def updateQuota(self, headers, now=None):
+        """Lower the bucket to what the API says is left."""
+        if not headers:
+            return
+        now = now or time.time()
+        available = headerInt(headers, "X-Requests-Available-Minute")
+        if available is None:
+            return
+        self.refill(now)
+        self.tokens = min(self.tokens, float(available))
+        if available <= 0:
+            reset = headerInt(headers, "X-RequestCounter-Reset")
+            self.blocked_until = now + (reset if reset is not None else BLOCK_FALLBACK)
+
+    def rateLimited(self, headers, now=None):
+        """429: nothing goes out until the API's counter resets."""
+        now = now or time.time()
+        reset = headerInt(headers or {}, "X-RequestCounter-Reset")
+        self.refill(now)
+        self.tokens = 0.0
+        self.blocked_until = now + (reset if reset is not None else BLOCK_FALLBACK)
+
+    def status(self, now=None):
+        now = now or time.time()
+        self.refill(now)
+        text = "Request budget: %.1f/%d tokens | sent %d, waited %d, coalesced %d" % (
+            self.tokens, self.capacity, self.sent, self.deferred, self.replaced)
+        if now < self.blocked_until:
+            text += " | blocked %ds" % (self.blocked_until - now)
+        if self.queue:
+            text += " | queued: " + ", ".join(sorted(self.queue))
+        return text
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+from enigma import eTimer
+import json
+
+from .atomicfile import writeAtomic
+
+CONFIG_FILE = "/etc/enigma2/footscores_config.json"
+
+# FOOTBALL-DATA.ORG (override with "api_base", e.g. for tools/mockserver.py)
+API_BASE = "https://api.football-data.org/v4/"
+
+# Special "filter_league" values
+MULTI_LEAGUE = "MULTI"
+TEAM_MODE = "TEAM"
+
+SAVE_DELAY = 5000           # ms; changes within this window cost one flash write
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+# name -> (type, default); a None default means the setting may be unset
+SETTINGS = {
+    "filter_league": (str, "PL"),
+    "league_name": (str, "Premier League"),
+    "api_key": (str, ""),
+    "api_base": (str, API_BASE),
+    "filter_leagues": (list, []),
+    "favorite_team": (str, ""),
+    "favorite_team_id": (int, None),
+    "diagnostics_log": (bool, False),
+    "share_mode": (str, "off"),
+    "share_leader": (str, ""),
+    "share_port": (int, 8765),
+}
+
+
+def coerceSetting(name, value):
+    """`value` as the type of setting `name`; ValueError if it cannot be one."""
+    if name not in SETTINGS:
+        raise ValueError("unknown setting " + name)
+    kind, default = SETTINGS[name]
+    if value is None and default is None:
+        return None
+    if kind is bool:
+        if isinstance(value, (bool, int)):
+            return bool(value)
+    elif kind is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, string_types) and value.strip().isdigit():
+            return int(value)
+    elif kind is list:
+        if isinstance(value, (list, tuple)) and all(isinstance(v, string_types) for v in value):
+            return list(value)
+    elif isinstance(value, string_types):
+        return value
+    raise ValueError("setting %s: %r is not a %s" % (name, value, kind.__name__))
+
+
+class Settings(object):
+    """The plugin's settings: read once per process, written back lazily.
+
+    Reads are plain lookups (get() works like the dict it replaces);
+    changes go through set()/update(), which check the type, tell the
+    observers which names changed and (re)start a SAVE_DELAY timer. The
+    file is only written when the timer fires or on flush(), only if its
+    content differs from what is on flash, and through writeAtomic(), so
+    a power cut leaves either the old or the new settings.
+    """
+
+    def __init__(self, path=CONFIG_FILE, delay=SAVE_DELAY):
+        self.path = path
+        self.delay = delay
+        self.values = dict((name, coerceSetting(name, default)) for name, (kind, default) in SETTINGS.items())
+        self.extra = {}             # keys of other plugin versions, written back untouched
+        self.written = None         # serialize() of the settings as last read or written
+        self.observers = []
+
+        self.timer = eTimer()
+        self.timer.callback.append(self.flush)
+        self.load()
+
+    def get(self, name, default=None):
+        value = self.values.get(name)
+        return default if value is None else value
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def set(self, name, value):
+        return self.update({name: value})
+
+    def update(self, values):
+        """Change several settings at once; returns the names that changed."""
+        coerced = dict((name, coerceSetting(name, value)) for name, value in values.items())
+        changed = [name for name, value in coerced.items() if self.values.get(name) != value]
+        if not changed:
+            return changed
+        for name in changed:
+            self.values[name] = coerced[name]
+        self.timer.start(self.delay, True)
+        self.notify(changed)
+        return changed
+
+    # --- observers ---
+    def addObserver(self, callback):
+        """callback(names) after every change, with the list of changed names."""
+        if callback not in self.observers:
+            self.observers.append(callback)
+
+    def removeObserver(self, callback):
+        if callback in self.observers:
+            self.observers.remove(callback)
+
+    def notify(self, changed):
+        for callback in list(self.observers):
+            try:
+                callback(changed)
+            except Exception as e:
+                print("[FootScores] settings observer failed: %s" % e)
+
+    # --- persistence ---
+    def load(self):
+        self.written = self.serialize()     # no file yet: nothing to write until a change
+        try:
+            with open(self.path, "r") as f:
+                text = f.read()
+        except (IOError, OSError):
+            return      # first start: defaults
+        try:
+            saved = json.loads(text)
+        except ValueError as e:
+            print("[FootScores] config unreadable, using defaults: %s" % e)
+            return
+        if not isinstance(saved, dict):
+            return
+        for name, value in saved.items():
+            if name not in SETTINGS:
+                self.extra[name] = value
+                continue
+            try:
+                self.values[name] = coerceSetting(name, value)
+            except ValueError as e:
+                print("[FootScores] config: %s" % e)
+        self.normalize()
+        # What the file holds, in the form flush() compares against
+        self.written = self.serialize()
+
+    def normalize(self):
+        values = self.values
+        # Revert any saved "GLOBAL" setting to default
+        revert = values["filter_league"] in ("ALL", "GLOBAL")
+        # Multi-league mode needs at least one competition
+        revert = revert or (values["filter_league"] == MULTI_LEAGUE and not values["filter_leagues"])
+        # Team mode needs a resolved favourite team
+        revert = revert or (values["filter_league"] == TEAM_MODE and values["favorite_team_id"] is None)
+        if revert:
+            values["filter_league"] = "PL"
+            values["league_name"] = "Premier League"
+
+    def serialize(self):
+        record = dict(self.extra)
+        record.update(self.values)
+        return json.dumps(record, sort_keys=True)
+
+    def flush(self):
+        """Write pending changes now (the timer, quitting, a GUI restart)."""
+        self.timer.stop()
+        text = self.serialize()
+        if text == self.written:
+            return True     # toggled back, or nothing changed: no flash write
+        try:
+            writeAtomic(self.path, text)
+        except (IOError, OSError) as e:
+            print("[FootScores] config write failed: %s" % e)
+            return False
+        self.written = text
+        return True
+
+
+_settings = None
+
+def getSettings():
+    """The process-wide Settings, loaded from CONFIG_FILE on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# EVENT TYPES
+MATCH_ADDED = "added"
+MATCH_REMOVED = "removed"
+SCORE_CHANGED = "score"
+STATUS_CHANGED = "status"
+MINUTE_TICK = "minute"
+
+# GOAL EVENTS (derived from SCORE_CHANGED)
+GOAL_HOME = "home"
+GOAL_AWAY = "away"
+GOAL_DISALLOWED = "disallowed"
+
+
+class MatchEvent(object):
+    """One change of one match between two consecutive payloads."""
+    __slots__ = ("kind", "match_id", "match", "old", "new")
+
+    def __init__(self, kind, match_id, match, old=None, new=None):
+        self.kind = kind
+        self.match_id = match_id
+        self.match = match
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return "MatchEvent(%s, %s, %r -> %r)" % (self.kind, self.match_id, self.old, self.new)
+
+
+def diffPayloads(old_matches, new_matches):
+    """Compare two MatchRecord lists by id and return the list of MatchEvents."""
+    old_by_id = {}
+    for match in old_matches or []:
+        old_by_id[match.id] = match
+
+    events = []
+    seen = set()
+    for match in new_matches or []:
+        match_id = match.id
+        seen.add(match_id)
+        prev = old_by_id.get(match_id)
+        if prev is None:
+            events.append(MatchEvent(MATCH_ADDED, match_id, match))
+            continue
+
+        if prev.status != match.status:
+            events.append(MatchEvent(STATUS_CHANGED, match_id, match, prev.status, match.status))
+
+        if prev.home_score != match.home_score or prev.away_score != match.away_score:
+            events.append(MatchEvent(SCORE_CHANGED, match_id, match, prev.score, match.score))
+
+        if prev.minute != match.minute:
+            events.append(MatchEvent(MINUTE_TICK, match_id, match, prev.minute, match.minute))
+
+    for match_id, match in old_by_id.items():
+        if match_id not in seen:
+            events.append(MatchEvent(MATCH_REMOVED, match_id, match))
+
+    return events
+
+def classifyGoal(old_score, new_score):
+    """Compare two (home, away) scores: home/away goal, disallowed goal or None."""
+    old_h, old_a = old_score
+    h_int, a_int = new_score
+    if h_int > old_h:
+        return GOAL_HOME
+    elif a_int > old_a:
+        return GOAL_AWAY
+    elif (h_int + a_int) < (old_h + old_a):
+        return GOAL_DISALLOWED
+    return None
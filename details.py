@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import time
+
+from .records import parseMatch, FINISHED, AWARDED, CANCELLED, LIVE_STATUSES, UPCOMING_STATUSES
+
+DETAIL_TTL_LIVE = 60            # in play: minute, goals and cards move
+DETAIL_TTL_UPCOMING = 30 * 60   # lineups appear about an hour before kickoff
+DETAIL_TTL_OTHER = 6 * 3600     # postponed, suspended
+DETAIL_CACHE_SIZE = 60          # matches kept; finished ones are never refetched while kept
+FINAL_STATUSES = (FINISHED, AWARDED, CANCELLED)
+
+
+def minuteText(event):
+    minute = event.get("minute")
+    if minute is None:
+        return ""
+    if event.get("injuryTime"):
+        return "%d+%d'" % (minute, event["injuryTime"])
+    return "%d'" % minute
+
+def personName(person):
+    return (person or {}).get("name") or "?"
+
+
+class MatchDetail(object):
+    """The parts of a /matches/{id} payload the detail view shows.
+
+    Event lists are None when the payload has no such section at all
+    (the free tier leaves out lineups, for example), [] when it is empty.
+    Events are (minute text, side, text) with side "home" or "away".
+    """
+    __slots__ = ("match", "venue", "referee", "half_time", "goals", "cards",
+                 "substitutions", "lineups", "fetched")
+
+    def __init__(self, match, venue, referee, half_time, goals, cards, substitutions, lineups, fetched):
+        self.match = match
+        self.venue = venue
+        self.referee = referee
+        self.half_time = half_time
+        self.goals = goals
+        self.cards = cards
+        self.substitutions = substitutions
+        self.lineups = lineups      # [(side, team, formation, coach, players, bench)] or None
+        self.fetched = fetched
+
+    def ttl(self):
+        """How long this copy is good for, by match status (None: for good)."""
+        status = self.match.status
+        if status in FINAL_STATUSES:
+            return None
+        if status in LIVE_STATUSES:
+            return DETAIL_TTL_LIVE
+        if status in UPCOMING_STATUSES:
+            return DETAIL_TTL_UPCOMING
+        return DETAIL_TTL_OTHER
+
+    def isFresh(self, now=None):
+        ttl = self.ttl()
+        return ttl is None or (now or time.time()) - self.fetched < ttl
+
+
+def parseDetail(data, fetched=None):
+    match_data = data.get("match", data)    # v4 returns the match itself
+    match = parseMatch(match_data)
+    sides = {}
+    for side in ("home", "away"):
+        team = match_data.get(side + "Team") or {}
+        if team.get("id") is not None:
+            sides[team["id"]] = side
+
+    def side(event):
+        return sides.get((event.get("team") or {}).get("id"), "")
+
+    def events(key, describe):
+        if key not in match_data:
+            return None
+        return [(minuteText(event), side(event), describe(event)) for event in match_data.get(key) or []]
+
+    def goal(event):
+        text = personName(event.get("scorer"))
+        if event.get("assist"):
+            text += " (" + personName(event["assist"]) + ")"
+        if event.get("type") in ("OWN", "PENALTY"):
+            text += " [" + event["type"].lower() + "]"
+        score = event.get("score") or {}
+        if score.get("home") is not None and score.get("away") is not None:
+            text += "  %d-%d" % (score["home"], score["away"])
+        return text
+
+    def card(event):
+        return personName(event.get("player")) + " - " + (event.get("card") or "").replace("_", "/").lower()
+
+    def substitution(event):
+        return personName(event.get("playerIn")) + " for " + personName(event.get("playerOut"))
+
+    half = ((match_data.get("score") or {}).get("halfTime")) or {}
+    half_time = None
+    if half.get("home") is not None and half.get("away") is not None:
+        half_time = (half["home"], half["away"])
+
+    referee = None
+    for person in match_data.get("referees") or []:
+        if person.get("type", "REFEREE") == "REFEREE":
+            referee = person.get("name")
+            break
+
+    lineups = []
+    for side_name, name in (("home", match.home), ("away", match.away)):
+        team = match_data.get(side_name + "Team") or {}
+        if not team.get("lineup"):
+            continue
+        coach = team.get("coach")
+        lineups.append((side_name, name, team.get("formation"), personName(coach) if coach else None,
+                        ["%2s %s" % (p.get("shirtNumber") or "", personName(p)) for p in team["lineup"]],
+                        [personName(p) for p in team.get("bench") or []]))
+
+    return MatchDetail(
+        match, match_data.get("venue"), referee, half_time,
+        events("goals", goal), events("bookings", card), events("substitutions", substitution),
+        lineups or None, fetched or time.time())
+
+
+class DetailCache(object):
+    """Match details fetched on demand, kept per match by status.
+
+    A finished match's details never change, so they are kept for good
+    (until DETAIL_CACHE_SIZE newer matches push them out); a live match's
+    go stale after DETAIL_TTL_LIVE, or at once when the live poll sees its
+    score or status change (invalidate()). Memory only: a detail view is
+    opened for a handful of matches, and most of them are still running.
+    """
+
+    def __init__(self, size=DETAIL_CACHE_SIZE):
+        self.size = size
+        self.details = {}
+
+    def get(self, match_id):
+        return self.details.get(match_id)
+
+    def isFresh(self, match_id, now=None):
+        detail = self.details.get(match_id)
+        return detail is not None and detail.isFresh(now)
+
+    def invalidate(self, match_id):
+        detail = self.details.get(match_id)
+        if detail is not None:
+            detail.fetched = 0
+
+    def store(self, match_id, data, fetched=None):
+        detail = parseDetail(data, fetched)
+        self.details[match_id] = detail
+        if len(self.details) > self.size:
+            oldest = min(self.details, key=lambda k: self.details[k].fetched)
+            del self.details[oldest]
+        return detail
+
+    def touch(self, match_id, fetched=None):
+        """304: the cached details are confirmed current."""
+        detail = self.details.get(match_id)
+        if detail is not None:
+            detail.fetched = fetched or time.time()
+        return detail
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+from collections import deque
+
+from .snapshot import SNAPSHOT_DIR
+
+DIAG_HISTORY = 60                   # poll cycles kept in memory
+DIAG_LOG_FILE = os.path.join(SNAPSHOT_DIR, "diagnostics.log")
+DIAG_LOG_MAX_BYTES = 128 * 1024     # rotated to .1 beyond this; two files at most
+
+
+class PollCycle(object):
+    """Metrics of one poll, from submitting the request to scheduling the next.
+
+    The worker thread fills in the network part (addTiming, decode) before
+    the result is queued; everything else is set on the main loop after.
+    Times are in seconds.
+    """
+    __slots__ = ("started", "result", "dns", "connect", "tls", "transfer", "bytes", "reused",
+                 "decode", "process", "render", "widgets", "quota", "interval")
+
+    def __init__(self):
+        self.started = time.time()
+        self.result = ""
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+        self.transfer = 0.0
+        self.bytes = 0
+        self.reused = False
+        self.decode = 0.0
+        self.process = 0.0
+        self.render = 0.0
+        self.widgets = 0
+        self.quota = None
+        self.interval = None
+
+    def addTiming(self, timing):
+        if timing is None:
+            return
+        self.dns = timing.dns
+        self.connect = timing.connect
+        self.tls = timing.tls
+        self.transfer = timing.transfer
+        self.bytes = timing.bytes
+        self.reused = timing.reused
+        self.decode += timing.inflate
+
+    def network(self):
+        return self.dns + self.connect + self.tls + self.transfer
+
+    def logLine(self):
+        return "%s %s net=%.1f dns=%.1f connect=%.1f tls=%.1f transfer=%.1f bytes=%d reused=%d decode=%.1f process=%.1f render=%.1f widgets=%d quota=%s interval=%s" % (
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)), self.result,
+            ms(self.network()), ms(self.dns), ms(self.connect), ms(self.tls), ms(self.transfer),
+            self.bytes, self.reused, ms(self.decode), ms(self.process), ms(self.render),
+            self.widgets, self.quota, self.interval)
+
+
+def ms(seconds):
+    return seconds * 1000.0
+
+
+class Diagnostics(object):
+    """Ring buffer of the last DIAG_HISTORY poll cycles, optionally logged.
+
+    Recording is a deque append, so it stays on all the time; the log
+    file is opened per line only when logging is enabled.
+    """
+
+    def __init__(self, log_enabled=False, history=DIAG_HISTORY, log_path=DIAG_LOG_FILE):
+        self.cycles = deque(maxlen=history)
+        self.total = 0
+        self.log_enabled = log_enabled
+        self.log_path = log_path
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def record(self, cycle):
+        self.cycles.append(cycle)
+        self.total += 1
+        if self.log_enabled:
+            self.writeLog(cycle.logLine())
+
+    def writeLog(self, line):
+        try:
+            directory = os.path.dirname(self.log_path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(self.log_path, "a") as f:
+                f.write(line + "\n")
+                size = f.tell()
+            if size > DIAG_LOG_MAX_BYTES:
+                os.rename(self.log_path, self.log_path + ".1")
+        except Exception as e:
+            print("[FootScores] diagnostics log failed: %s" % e)
+            self.log_enabled = False
+
+    def summary(self):
+        """Multi-line report for the diagnostics screen, newest cycle first."""
+        cycles = list(self.cycles)
+        lines = ["Poll cycles: %d recorded, last %d kept | Log: %s" % (
+            self.total, len(cycles), self.log_path if self.log_enabled else "off")]
+        if not cycles:
+            lines.append("No poll finished yet.")
+            return "\n".join(lines)
+
+        count = float(len(cycles))
+        fetched = [c for c in cycles if c.bytes]
+        lines.append("Avg ms: network %.0f | decode %.1f | processing %.1f | render %.1f" % (
+            sum(ms(c.network()) for c in cycles) / count,
+            sum(ms(c.decode) for c in cycles) / count,
+            sum(ms(c.process) for c in cycles) / count,
+            sum(ms(c.render) for c in cycles) / count))
+        lines.append("Avg KB per 200: %.1f | reused connections: %d/%d" % (
+            sum(c.bytes for c in fetched) / 1024.0 / max(1, len(fetched)),
+            sum(1 for c in cycles if c.reused), len(cycles)))
+        lines.append("")
+        lines.append("Time      Result  DNS Conn  TLS  Xfer    KB  Dec Proc Rend W Quota Next")
+        for c in reversed(cycles):
+            lines.append("%s %-6s %4.0f %4.0f %4.0f %5.0f %5.1f %4.1f %4.1f %4.1f %d %5s %4s" % (
+                time.strftime("%H:%M:%S", time.localtime(c.started)), c.result[:6],
+                ms(c.dns), ms(c.connect), ms(c.tls), ms(c.transfer), c.bytes / 1024.0,
+                ms(c.decode), ms(c.process), ms(c.render), c.widgets,
+                "-" if c.quota is None else c.quota,
+                "-" if c.interval is None else "%ds" % c.interval))
+        return "\n".join(lines)
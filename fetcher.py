@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from enigma import eTimer
+import json
+import threading
+
+try:
+    from Queue import Queue, Empty
+except ImportError:
+    from queue import Queue, Empty
+
+from .httpclient import http_client, clock
+from .records import parseMatchStream
+
+
+def fetchJson(url, headers=None, timeout=10, conditional=False, cycle=None, client=None):
+    """Blocking GET + JSON decode. Only ever call this from a worker thread.
+
+    Returns (data, response_headers); data is None when a conditional
+    request came back 304 Not Modified. A diagnostics cycle, if given,
+    receives the request timing and the decode time. `client` replaces
+    the shared http_client (the LAN leader's SharedClient).
+    """
+    try:
+        response = (client or http_client).get(url, headers, timeout=timeout, conditional=conditional)
+    except Exception as e:
+        if cycle is not None:
+            cycle.addTiming(getattr(e, "timing", None))
+        raise
+    if cycle is not None:
+        cycle.addTiming(response.timing)
+    if response.not_modified:
+        return None, response.headers
+    start = clock()
+    data = json.loads(response.text())
+    if cycle is not None:
+        cycle.decode += clock() - start
+    return data, response.headers
+
+def fetchRecords(url, headers=None, timeout=10, cycle=None, client=None):
+    """Blocking GET decoded match by match into MatchRecords (worker thread only).
+
+    For large multi-day payloads: returns (records, response_headers)
+    without ever holding the decoded JSON tree. Not conditional.
+    """
+    try:
+        response = (client or http_client).get(url, headers, timeout=timeout, conditional=False)
+    except Exception as e:
+        if cycle is not None:
+            cycle.addTiming(getattr(e, "timing", None))
+        raise
+    if cycle is not None:
+        cycle.addTiming(response.timing)
+    start = clock()
+    records = parseMatchStream(response.text())
+    if cycle is not None:
+        cycle.decode += clock() - start
+    return records, response.headers
+
+def errorHeaders(error):
+    """Response headers of a failed request (HTTPError), or None."""
+    try:
+        return error.info()
+    except:
+        return None
+
+
+class FetchEngine(object):
+    """Runs blocking network jobs on one background thread.
+
+    The GUI thread never waits on a socket: jobs are queued to the worker,
+    and only the finished result (or the exception) is handed back to the
+    Enigma2 main loop, where a short eTimer invokes the callback.
+
+    Each worker gets its own job and result queues: after stop(), a job
+    the old worker is still running finishes into a queue nobody reads,
+    instead of being delivered (and counted) as a result of the next one.
+    """
+
+    DELIVER_INTERVAL = 50  # ms, only ticking while jobs are outstanding
+
+    def __init__(self):
+        self.jobs = Queue()
+        self.results = Queue()
+        self.pending = 0
+        self.worker = None
+
+        self.deliver_timer = eTimer()
+        self.deliver_timer.callback.append(self.deliverResults)
+
+    def submit(self, job, callback, errback=None):
+        if self.worker is None:
+            self.jobs = Queue()
+            self.results = Queue()
+            self.worker = threading.Thread(target=self.runJobs, args=(self.jobs, self.results), name="FootScoresFetch")
+            self.worker.daemon = True
+            self.worker.start()
+
+        self.pending += 1
+        self.jobs.put((job, callback, errback))
+        if not self.deliver_timer.isActive():
+            self.deliver_timer.start(self.DELIVER_INTERVAL, False)
+
+    def stop(self):
+        self.deliver_timer.stop()
+        if self.worker is not None:
+            self.jobs.put(None)
+            self.worker = None
+        self.pending = 0
+
+    # --- worker thread ---
+    def runJobs(self, jobs, results):
+        while True:
+            item = jobs.get()
+            if item is None:
+                return
+            job, callback, errback = item
+            try:
+                results.put((callback, job(), None))
+            except Exception as e:
+                results.put((errback, None, e))
+
+    # --- main loop ---
+    def deliverResults(self):
+        while True:
+            try:
+                callback, result, error = self.results.get_nowait()
+            except Empty:
+                break
+
+            self.pending -= 1
+            try:
+                if error is None:
+                    callback(result)
+                elif callback:
+                    callback(error)
+            except Exception as e:
+                print("[FootScores] fetch callback failed: %s" % e)
+
+        if self.pending <= 0:
+            self.pending = 0
+            self.deliver_timer.stop()
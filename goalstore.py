@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+
+from .records import FINISHED, LIVE_STATUSES
+from .delta import classifyGoal
+from .snapshot import SNAPSHOT_DIR
+from .atomicfile import writeAtomic
+
+GOAL_STATE_FILE = os.path.join(SNAPSHOT_DIR, "goals.json")
+GOAL_STATE_MAX_AGE = 6 * 3600   # forget matches not seen for this long
+GOAL_STATE_MAX_ENTRIES = 300    # cap on matches no longer in the payload, oldest go first
+
+
+class GoalStore(object):
+    """Last known score of every tracked match, for goal detection.
+
+    Entries are [home, away, status, last_seen] keyed by match id. Finished
+    matches are dropped as soon as they leave the payload, anything unseen
+    for GOAL_STATE_MAX_AGE is dropped too, and the whole table is written
+    compactly so the first poll after a GUI restart still sees the goal
+    that was scored in between.
+    """
+
+    def __init__(self, path=GOAL_STATE_FILE, max_age=GOAL_STATE_MAX_AGE, max_entries=GOAL_STATE_MAX_ENTRIES):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.scores = {}
+        self.changed = False
+        self.load()
+
+    def __len__(self):
+        return len(self.scores)
+
+    def wasLive(self, match_id):
+        entry = self.scores.get(match_id)
+        return entry is not None and entry[2] in LIVE_STATUSES
+
+    def observe(self, match, now=None):
+        """Record the match's score; returns the goal event it implies, if any."""
+        now = now or time.time()
+        entry = self.scores.get(match.id)
+        new_score = match.score
+        goal_event = None
+        if entry is None:
+            self.scores[match.id] = [new_score[0], new_score[1], match.status, now]
+            self.changed = True
+            return None
+
+        if (entry[0], entry[1]) != new_score:
+            goal_event = classifyGoal((entry[0], entry[1]), new_score)
+            entry[0], entry[1] = new_score
+            self.changed = True
+        if entry[2] != match.status:
+            entry[2] = match.status
+            self.changed = True
+        entry[3] = now
+        return goal_event
+
+    def sync(self, matches, now=None):
+        """Track every match of the current payload and evict the rest."""
+        now = now or time.time()
+        current_ids = set()
+        for match in matches:
+            current_ids.add(match.id)
+            if match.id not in self.scores:
+                self.scores[match.id] = [match.home_score, match.away_score, match.status, now]
+                self.changed = True
+
+        for match_id in list(self.scores):
+            entry = self.scores[match_id]
+            if match_id in current_ids:
+                entry[3] = now
+            elif entry[2] == FINISHED or now - entry[3] > self.max_age:
+                del self.scores[match_id]
+                self.changed = True
+
+        # The cap only pushes out matches that left the payload: evicting a
+        # current one would report its score as a goal at the next poll
+        overflow = len(self.scores) - self.max_entries
+        if overflow > 0:
+            gone = [match_id for match_id in self.scores if match_id not in current_ids]
+            gone.sort(key=lambda match_id: self.scores[match_id][3])
+            for match_id in gone[:overflow]:
+                del self.scores[match_id]
+            if gone:
+                self.changed = True
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                rows = json.load(f)
+            now = time.time()
+            for match_id, home, away, status, last_seen in rows:
+                if now - last_seen <= self.max_age:
+                    self.scores[match_id] = [home, away, status, last_seen]
+        except:
+            self.scores = {}
+
+    def save(self):
+        """Write the table if it changed since the last save."""
+        if not self.changed:
+            return True
+        rows = [[match_id] + entry for match_id, entry in self.scores.items()]
+        try:
+            directory = os.path.dirname(self.path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            writeAtomic(self.path, json.dumps(rows, separators=(",", ":")))
+            self.changed = False
+            return True
+        except Exception as e:
+            print("[FootScores] goal state write failed: %s" % e)
+            return False
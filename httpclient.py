@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+import time
+import zlib
+
+try:
+    import httplib
+    from urlparse import urlsplit, urljoin
+except ImportError:
+    import http.client as httplib
+    from urllib.parse import urlsplit, urljoin
+
+try:
+    import ssl
+except ImportError:
+    ssl = None
+
+USER_AGENT = "FootScores-Enigma2"
+MAX_IDLE_PER_HOST = 2
+MAX_REDIRECTS = 3
+
+clock = getattr(time, "perf_counter", time.time)
+
+
+class HttpError(Exception):
+    """Non-2xx answer. str() matches urllib's "HTTP Error 403: Forbidden"."""
+
+    def __init__(self, code, reason, headers=None):
+        Exception.__init__(self, "HTTP Error %d: %s" % (code, reason))
+        self.code = code
+        self.reason = reason
+        self.headers = headers
+        self.timing = None
+
+    def info(self):
+        return self.headers
+
+
+class RequestTiming(object):
+    """Where the time of one request went, in seconds.
+
+    dns/connect/tls stay 0 when a pooled connection was reused; transfer
+    runs from sending the request to the last body byte; bytes is the
+    size on the wire (before gunzip).
+    """
+    __slots__ = ("dns", "connect", "tls", "transfer", "inflate", "bytes", "reused")
+
+    def __init__(self):
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+        self.transfer = 0.0
+        self.inflate = 0.0
+        self.bytes = 0
+        self.reused = False
+
+
+class HttpResponse(object):
+    __slots__ = ("status", "headers", "body", "not_modified", "timing")
+
+    def __init__(self, status, headers, body, timing=None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.not_modified = status == 304
+        self.timing = timing
+
+    def text(self):
+        try:
+            return self.body.decode('utf-8')
+        except:
+            return self.body
+
+
+class HttpClient(object):
+    """Small keep-alive HTTP(S) client shared by every network call.
+
+    Connections are pooled per host so repeated polls skip the TCP and TLS
+    handshakes, responses are requested gzip-compressed, and the ETag /
+    Last-Modified validators of each URL are replayed so an unchanged
+    resource comes back as a body-less 304.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = {}          # (scheme, host, port) -> [connection, ...]
+        self.validators = {}    # url -> (etag, last_modified)
+
+    def get(self, url, headers=None, timeout=10, conditional=True):
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self.request(url, headers, timeout, conditional)
+            location = response.headers.get("Location") if response.status in (301, 302, 303, 307, 308) else None
+            if not location:
+                return response
+            url = urljoin(url, location)
+        raise HttpError(response.status, "Too many redirects", response.headers)
+
+    def request(self, url, headers, timeout, conditional):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        send_headers = {"Accept-Encoding": "gzip", "User-Agent": USER_AGENT}
+        send_headers.update(headers or {})
+        validator = self.validators.get(url) if conditional else None
+        if validator:
+            if validator[0]:
+                send_headers["If-None-Match"] = validator[0]
+            if validator[1]:
+                send_headers["If-Modified-Since"] = validator[1]
+
+        timing = RequestTiming()
+        conn, reused = self.acquire(key, timeout, timing)
+        try:
+            sent = clock()
+            conn.request("GET", path, headers=send_headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (httplib.HTTPException, socket.error):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once fresh
+            conn, reused = self.acquire(key, timeout, timing, fresh=True)
+            try:
+                sent = clock()
+                conn.request("GET", path, headers=send_headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except:
+                conn.close()
+                raise
+        received = clock()
+        timing.transfer = received - sent
+        timing.bytes = len(body)
+        timing.reused = reused
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self.release(key, conn)
+
+        if resp.msg.get("Content-Encoding", "") == "gzip" and body:
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+            timing.inflate = clock() - received
+
+        status = resp.status
+        if status >= 400:
+            error = HttpError(status, resp.reason, resp.msg)
+            error.timing = timing
+            raise error
+        if status == 200 and conditional:
+            etag = resp.msg.get("ETag")
+            last_modified = resp.msg.get("Last-Modified")
+            if etag or last_modified:
+                self.validators[url] = (etag, last_modified)
+        return HttpResponse(status, resp.msg, body, timing)
+
+    def acquire(self, key, timeout, timing, fresh=False):
+        if not fresh:
+            with self.lock:
+                pool = self.idle.get(key)
+                conn = pool.pop() if pool else None
+            if conn is not None:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+
+        scheme, host, port = key
+        if scheme == "https":
+            conn = httplib.HTTPSConnection(host, port, timeout=timeout)
+        else:
+            conn = httplib.HTTPConnection(host, port, timeout=timeout)
+        self.connect(conn, scheme, host, port, timeout, timing)
+        return conn, False
+
+    def connect(self, conn, scheme, host, port, timeout, timing):
+        """Open the socket by hand so DNS, TCP connect and TLS are timed apart.
+
+        httplib uses a socket that is already set instead of connecting itself.
+        """
+        port = port or (443 if scheme == "https" else 80)
+        start = clock()
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        resolved = clock()
+        timing.dns = resolved - start
+
+        sock = None
+        error = socket.error("getaddrinfo returned no addresses for %s" % host)
+        for family, socktype, proto, _, address in addresses:
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.settimeout(timeout)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.connect(address)
+                break
+            except socket.error as e:
+                sock.close()
+                sock = None
+                error = e
+        if sock is None:
+            raise error
+        connected = clock()
+        timing.connect = connected - resolved
+
+        if scheme == "https":
+            try:
+                context = getattr(conn, "_context", None)
+                if context is not None:
+                    sock = context.wrap_socket(sock, server_hostname=host)
+                else:
+                    sock = ssl.wrap_socket(sock)
+            except:
+                sock.close()
+                raise
+            timing.tls = clock() - connected
+        conn.sock = sock
+
+    def release(self, key, conn):
+        with self.lock:
+            pool = self.idle.setdefault(key, [])
+            if len(pool) < MAX_IDLE_PER_HOST:
+                pool.append(conn)
+                return
+        conn.close()
+
+    def forget(self, url):
+        self.validators.pop(url, None)
+
+    def closeAll(self):
+        with self.lock:
+            pools = list(self.idle.values())
+            self.idle = {}
+        for pool in pools:
+            for conn in pool:
+                conn.close()
+
+
+# One client per process so every caller shares the same warm connections
+http_client = HttpClient()
@@ -1,677 +1,20 @@
 # -*- coding: utf-8 -*-
+# Enigma2 imports every plugin.py at GUI startup just to call Plugins(),
+# so this module stays tiny: the screens, networking and parsing live in
+# ui.py and its imports, which load the first time FootScores is opened.
 from Plugins.Plugin import PluginDescriptor
-from Screens.Screen import Screen
-from Screens.MessageBox import MessageBox
-from Screens.ChoiceBox import ChoiceBox
-from Screens.VirtualKeyBoard import VirtualKeyBoard
-from Components.ActionMap import ActionMap
-from Components.Label import Label
-from Components.ScrollLabel import ScrollLabel
-from Components.Pixmap import Pixmap
-from Screens.Standby import TryQuitMainloop 
-from enigma import eTimer
-import os
-import json
-import time
-import calendar
-from datetime import datetime, timedelta
 
-# Networking imports
-try:
-    from urllib2 import Request, urlopen
-except ImportError:
-    from urllib.request import Request, urlopen
-
-# --- CONFIGURATION & CONSTANTS ---
-CONFIG_FILE = "/etc/enigma2/footscores_config.json"
-PLUGIN_VERSION = "1.3" # Removed "All Competitions" (Unstable on Free Tier)
-
-# PATHS
-PLUGIN_PATH = os.path.dirname(os.path.abspath(__file__))
-SOUND_FILENAME = "goal.mp3" 
-ICON_FILENAME = "plugin.png"
-
-# GITHUB REPO BASE URL
-REPO_BASE = "https://raw.githubusercontent.com/Ahmed-Mohammed-Abbas/FootScores/main/"
-VERSION_URL = REPO_BASE + "version.txt"
-
-# GLOBAL INSTANCE HOLDER
-footscores_instance = None
-
-def loadConfig():
-    default = {
-        "filter_league": "PL", 
-        "league_name": "Premier League",
-        "api_key": "",
-        "favorite_team": "" 
-    }
-    try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                saved = json.load(f)
-                default.update(saved)
-            # Revert any saved "GLOBAL" setting to default
-            if default.get("filter_league") in ["ALL", "GLOBAL"]:
-                default["filter_league"] = "PL"
-                default["league_name"] = "Premier League"
-    except:
-        pass
-    return default
-
-def saveConfig(config):
-    try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f)
-        return True
-    except:
-        return False
-
-# --- GOAL NOTIFICATION POPUP ---
-class GoalPopup(Screen):
-    skin = """
-        <screen position="center,950" size="1200,100" flags="wfNoBorder" backgroundColor="#41000000" title="Goal Notification">
-            <widget name="goal_text" position="10,10" size="1180,80" font="Regular;32" foregroundColor="#00ff00" valign="center" halign="center" transparent="1" />
-        </screen>
-    """
-    def __init__(self, session, message, main_instance):
-        Screen.__init__(self, session)
-        self.main = main_instance
-        self["goal_text"] = Label(message)
-        
-        self["actions"] = ActionMap(["OkCancelActions", "ColorActions"], 
-        {
-            "ok": self.restoreMain,
-            "blue": self.restoreMain,
-            "cancel": self.close
-        }, -1)
-        
-        self.timer = eTimer()
-        self.timer.callback.append(self.close)
-        self.timer.start(10000, True)
-
-    def restoreMain(self):
-        self.close()
-        self.main.showFromBackground()
-
-# --- SCREEN 2: MINI BAR ---
-class FootballScoresBar(Screen):
-    skin = """
-        <screen position="center,930" size="1200,150" flags="wfNoBorder" backgroundColor="#40000000" title="FootScores Bar">
-            <widget name="scores" position="10,10" size="1180,100" font="Regular;24" foregroundColor="#ffffff" transparent="1" />
-            <widget name="status" position="10,110" size="1180,30" font="Regular;20" foregroundColor="#dddddd" transparent="1" />
-            
-            <widget name="league_info" position="3000,3000" size="10,10" />
-            <widget name="credit" position="3000,3000" size="10,10" />
-            <widget name="key_green" position="3000,3000" size="10,10" />
-            <widget name="key_yellow" position="3000,3000" size="10,10" />
-            <widget name="key_blue" position="3000,3000" size="10,10" />
-        </screen>
-    """
-
-    def __init__(self, session, main_instance):
-        Screen.__init__(self, session)
-        self.main = main_instance 
-        
-        self.timer = eTimer()
-        self.timer.callback.append(self.updateDisplay)
-        
-        self["scores"] = ScrollLabel("")
-        self["status"] = Label("")
-        self["league_info"] = Label("")
-        self["credit"] = Label("")
-        self["key_green"] = Label("")
-        self["key_yellow"] = Label("")
-        self["key_blue"] = Label("")
-
-        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions"],
-        {
-            "ok": self.closeBar,         
-            "cancel": self.closeBar,     
-            "up": self.pageUp,
-            "down": self.pageDown,
-            "green": self.closeBar,      
-            "blue": self.goToBackground, 
-            "yellow": self.main.toggleLiveMode,
-        }, -1)
-        
-        self.updateDisplay()
-
-    def closeBar(self):
-        self.close()
-        self.main.show()
-
-    def goToBackground(self):
-        self.close()
-        self.bg_timer = eTimer()
-        self.bg_timer.callback.append(self.triggerMainHide)
-        self.bg_timer.start(100, True)
-
-    def triggerMainHide(self):
-        self.main.hideToBackground()
-
-    def pageUp(self):
-        self["scores"].pageUp()
-    
-    def pageDown(self):
-        self["scores"].pageDown()
-
-    def updateDisplay(self):
-        if not hasattr(self.main, 'last_data') or not self.main.last_data:
-            self["scores"].setText("Loading...")
-            self.timer.start(1000, True)
-            return
-
-        try:
-            data = self.main.last_data
-            matches = data.get("matches", [])
-            display_matches = []
-            
-            if self.main.live_only:
-                for m in matches:
-                    if m.get("status") in ["IN_PLAY", "PAUSED"]:
-                        display_matches.append(m)
-            else:
-                display_matches = matches
-
-            match_strings = []
-            count = 0
-            
-            for match in display_matches:
-                line = self.main.formatMatchLine(match, is_bar_mode=True)
-                match_strings.append(line)
-                count += 1
-            
-            output = ""
-            for i in range(0, len(match_strings), 3):
-                chunk = match_strings[i:i+3]
-                row_string = "   |   ".join(chunk)
-                output += row_string + "\n"
-
-            current_time = time.strftime("%H:%M:%S")
-            self["scores"].setText(output)
-            self["status"].setText("Mode: Bar | Found: " + str(count) + " | Upd: " + current_time)
-            
-        except:
-            pass
-        
-        self.timer.start(2000, True)
-
-# --- SCREEN 1: MAIN WINDOW ---
-class FootballScoresScreen(Screen):
-    skin = """
-        <screen position="center,center" size="700,520" title="Live Football Scores">
-            <widget name="cover_bg" position="0,0" size="700,520" zPosition="10" backgroundColor="#000000" />
-            <widget name="cover_img" position="150,60" size="400,400" zPosition="11" alphatest="blend" scale="1" />
-            
-            <widget name="scores" position="10,10" size="680,350" font="Regular;26" zPosition="1" />
-            <widget name="league_info" position="10,365" size="680,40" font="Regular;23" halign="center" foregroundColor="#ff0000" zPosition="1" />
-            <widget name="status" position="10,410" size="680,50" font="Regular;20" halign="center" zPosition="1" />
-            <widget name="credit" position="10,475" size="200,40" font="Regular;20" halign="left" foregroundColor="#ffcc00" zPosition="1" />
-            
-            <widget name="key_green" position="220,475" size="150,40" font="Regular;20" halign="center" foregroundColor="#00ff00" zPosition="1" />
-            <widget name="key_yellow" position="380,475" size="150,40" font="Regular;20" halign="center" foregroundColor="#ffff00" zPosition="1" />
-            <widget name="key_blue" position="540,475" size="150,40" font="Regular;20" halign="right" foregroundColor="#00aaff" zPosition="1" />
-        </screen>
-    """
-    
-    def __init__(self, session, shared_data=None, live_only_mode=False):
-        Screen.__init__(self, session)
-        self.session = session
-        self.config = loadConfig()
-        
-        self.last_data = shared_data 
-        self.live_only = live_only_mode
-        self.score_history = {} 
-        self.is_hidden = False 
-        
-        global footscores_instance
-        footscores_instance = self
-        
-        self["cover_bg"] = Label("")
-        self["cover_img"] = Pixmap()
-        
-        self["scores"] = ScrollLabel("")
-        self["league_info"] = Label("")
-        self["status"] = Label("Initializing...")
-        self["credit"] = Label("Ver: " + PLUGIN_VERSION + " | By Reali22")
-        
-        self["key_green"] = Label("Mini Bar")
-        self["key_yellow"] = Label("Live Only")
-        self["key_blue"] = Label("Background")
-        
-        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions", "MenuActions"],
-        {
-            "ok": self.doNothing, 
-            "cancel": self.quitPlugin,   
-            "menu": self.openMenu, 
-            "up": self.pageUp,
-            "down": self.pageDown,
-            "red": self.selectLeague,
-            "green": self.openBar,       
-            "yellow": self.toggleLiveMode,
-            "blue": self.hideToBackground, 
-        }, -1)
-        
-        self.timer = eTimer()
-        self.timer.callback.append(self.fetchScores)
-        
-        self.sound_timer = eTimer()
-        self.sound_timer.callback.append(self.playGoalSound)
-        
-        self.cover_timer = eTimer()
-        self.cover_timer.callback.append(self.hideCover)
-        
-        self.onLayoutFinish.append(self.startPlugin)
-    
-    def startPlugin(self):
-        self.updateLeagueInfo()
-        self.updateYellowButtonLabel()
-        
-        try:
-            icon_path = os.path.join(PLUGIN_PATH, ICON_FILENAME)
-            if os.path.exists(icon_path):
-                self["cover_img"].instance.setPixmapFromFile(icon_path)
-        except:
-            self.hideCover()
-        
-        self.sound_timer.start(1000, True) 
-        self.cover_timer.start(3000, True) 
-        
-        self.update_timer = eTimer()
-        self.update_timer.callback.append(self.checkUpdates)
-        self.update_timer.start(3000, True) 
-        
-        api_key = self.config.get("api_key", "")
-        
-        if not api_key or len(api_key) < 5:
-            self.displayApiKeyPrompt()
-        else:
-            if self.last_data:
-                self.displayScores(self.last_data)
-                self.timer.start(15000, True) 
-            else:
-                self.fetchScores()
-
-    def hideCover(self):
-        try:
-            self["cover_bg"].hide()
-            self["cover_img"].hide()
-        except:
-            pass
-
-    def doNothing(self):
-        pass
-
-    def hideToBackground(self):
-        self.is_hidden = True
-        self.hide()
-        self.session.open(MessageBox, "FootScores in Background.\nNotifications Active.\nPress MENU to quit.", MessageBox.TYPE_INFO, timeout=2)
-
-    def showFromBackground(self):
-        self.is_hidden = False
-        self.show()
-        if self.last_data:
-            self.displayScores(self.last_data)
-
-    def openBar(self):
-        self.hide() 
-        try:
-            self.session.open(FootballScoresBar, self)
-        except Exception as e:
-            self.show()
-            self["scores"].setText("Error opening Bar: " + str(e))
-
-    def openMenu(self):
-        options = [
-            ("Change API Key", "apikey"),
-            ("Quit Plugin Completely", "quit")
-        ]
-        self.session.openWithCallback(self.menuCallback, ChoiceBox, title="Menu", list=options)
-
-    def menuCallback(self, choice):
-        if choice:
-            if choice[1] == "quit":
-                self.quitPlugin()
-            elif choice[1] == "apikey":
-                self.changeApiKey()
-
-    def quitPlugin(self):
-        global footscores_instance
-        footscores_instance = None
-        self.timer.stop()
-        self.close()
-
-    def playGoalSound(self):
-        path1 = os.path.join(PLUGIN_PATH, SOUND_FILENAME)
-        path2 = "/etc/enigma2/" + SOUND_FILENAME
-        path3 = "/usr/share/enigma2/" + SOUND_FILENAME
-        
-        final_path = None
-        
-        if os.path.exists(path1):
-            final_path = path1
-        elif os.path.exists(path2):
-            final_path = path2
-        elif os.path.exists(path3):
-            final_path = path3
-            
-        if final_path:
-            cmd = "gst-launch-1.0 playbin uri=file://%s audio-sink='alsasink' volume=0.4 > /dev/null 2>&1 &" % final_path
-            os.system(cmd)
-
-    def checkGoals(self, match):
-        home = match.get("homeTeam", {}).get("name", "Unknown")
-        away = match.get("awayTeam", {}).get("name", "Unknown")
-        score = match.get("score", {}).get("fullTime", {})
-        
-        h_int = score.get("home") if score.get("home") is not None else 0
-        a_int = score.get("away") if score.get("away") is not None else 0
-        match_id = match.get("id", 0)
-        
-        current_score_str = "%s-%s" % (h_int, a_int)
-        
-        goal_event = None
-        
-        if match_id in self.score_history:
-            old_str = self.score_history[match_id]
-            if old_str != current_score_str:
-                try:
-                    old_h, old_a = map(int, old_str.split('-'))
-                    if h_int > old_h:
-                        goal_event = 'home'
-                    elif a_int > old_a:
-                        goal_event = 'away'
-                    elif (h_int + a_int) < (old_h + old_a):
-                        goal_event = 'disallowed'
-                except:
-                    pass
-        
-        self.score_history[match_id] = current_score_str
-        
-        if goal_event:
-            if goal_event != 'disallowed':
-                self.playGoalSound()
-
-            if self.is_hidden:
-                fav_team = self.config.get("favorite_team", "").lower()
-                if fav_team and len(fav_team) > 2:
-                    if fav_team not in home.lower() and fav_team not in away.lower():
-                        return 
-                
-                if goal_event == 'disallowed':
-                    msg = "VAR: GOAL DISALLOWED!\n%s %d-%d %s" % (home, h_int, a_int, away)
-                else:
-                    scorer = home if goal_event == 'home' else away
-                    msg = "GOAL for %s!\n%s %d-%d %s" % (scorer, home, h_int, a_int, away)
-                
-                self.session.open(GoalPopup, msg, self)
-            
-        return goal_event
-
-    def formatMatchLine(self, match, is_bar_mode=False):
-        goal_event = self.checkGoals(match)
-        
-        home = match.get("homeTeam", {}).get("name", "Unknown")
-        away = match.get("awayTeam", {}).get("name", "Unknown")
-        status = match.get("status", "SCHEDULED")
-        score = match.get("score", {}).get("fullTime", {})
-        
-        h_sc = str(score.get("home")) if score.get("home") is not None else "0"
-        a_sc = str(score.get("away")) if score.get("away") is not None else "0"
-        
-        if is_bar_mode:
-            home = home[:10]
-            away = away[:10]
-
-        if goal_event == 'home':
-            home = home + " (GOAL!)"
-        elif goal_event == 'away':
-            away = "(GOAL!) " + away
-        
-        if status == "FINISHED":
-            line = "%s %s-%s %s (FT)" % (home, h_sc, a_sc, away)
-        elif status in ["IN_PLAY", "PAUSED"]:
-            minute = str(match.get("minute", ""))
-            line = "%s %s-%s %s (%s')" % (home, h_sc, a_sc, away, minute)
-            
-            if goal_event == 'disallowed':
-                line = ">>> VAR DISALLOWED <<< " + line
-        else:
-            utc_date_str = match.get("utcDate", "")
-            try:
-                dt_utc = datetime.strptime(utc_date_str.replace("Z", ""), "%Y-%m-%dT%H:%M:%S")
-                timestamp = calendar.timegm(dt_utc.timetuple())
-                local_struct = time.localtime(timestamp)
-                time_str = time.strftime("%H:%M", local_struct)
-            except:
-                time_str = utc_date_str[11:16] if len(utc_date_str) > 16 else "TBD"
-            line = "%s vs %s (%s)" % (home, away, time_str)
-            
-        return line
-
-    def checkUpdates(self):
-        try:
-            no_cache_url = VERSION_URL + "?t=" + str(int(time.time()))
-            req = Request(no_cache_url)
-            response = urlopen(req, timeout=10)
-            remote_version = response.read().decode('utf-8').strip()
-            
-            if float(remote_version) > float(PLUGIN_VERSION):
-                self.session.openWithCallback(
-                    self.askUpdate, 
-                    MessageBox, 
-                    "New Update Available!\n\nLocal Ver: " + PLUGIN_VERSION + "\nOnline Ver: " + remote_version + "\n\nDo you want to update and restart now?", 
-                    MessageBox.TYPE_YESNO
-                )
-        except:
-            pass
-
-    def askUpdate(self, result):
-        if result:
-            self.performUpdate()
-
-    def performUpdate(self):
-        try:
-            self["status"].setText("Updating... Please wait.")
-            files_to_download = ["plugin.py", "goal.mp3", "plugin.png"]
-            for filename in files_to_download:
-                url = REPO_BASE + filename + "?t=" + str(int(time.time()))
-                local_path = os.path.join(PLUGIN_PATH, filename)
-                req = Request(url)
-                response = urlopen(req, timeout=15)
-                data = response.read()
-                with open(local_path, "wb") as f:
-                    f.write(data)
-            self.session.open(MessageBox, "Update Successful!\nGUI will restart now...", MessageBox.TYPE_INFO, timeout=3)
-            self.restart_timer = eTimer()
-            self.restart_timer.callback.append(self.doRestart)
-            self.restart_timer.start(3000, True)
-        except Exception as e:
-            self.session.open(MessageBox, "Update Failed:\n" + str(e), MessageBox.TYPE_ERROR)
-
-    def doRestart(self):
-        self.session.open(TryQuitMainloop, 3)
-
-    def toggleLiveMode(self):
-        self.live_only = not self.live_only
-        self.updateYellowButtonLabel()
-        if self.last_data:
-            self.displayScores(self.last_data)
-
-    def updateYellowButtonLabel(self):
-        if self.live_only:
-            self["key_yellow"].setText("Show All")
-        else:
-            self["key_yellow"].setText("Live Only")
-
-    def displayApiKeyPrompt(self):
-        try:
-            self.session.openWithCallback(
-                self.apiKeyEntered, 
-                VirtualKeyBoard, 
-                title="Enter Football-Data.org API Key:", 
-                text=self.config.get("api_key", "")
-            )
-        except Exception as e:
-            self["scores"].setText("Error opening keyboard: " + str(e))
-
-    def apiKeyEntered(self, result):
-        if result:
-            self.config["api_key"] = result.strip()
-            saveConfig(self.config)
-            self["status"].setText("Key saved. Loading matches...")
-            self.fetchScores()
-        else:
-            if not self.config.get("api_key"):
-                self["scores"].setText("API Key is required.\n\nPress BLUE button to enter key.")
-                self["status"].setText("Missing API Key")
-
-    def changeApiKey(self):
-        self.displayApiKeyPrompt()
-    
-    def switchToBar(self):
-        self.session.open(FootballScoresBar, self.last_data, self.live_only, self.score_history)
-        self.close() 
-
-    def updateLeagueInfo(self):
-        league_name = self.config.get("league_name", "Premier League")
-        self["league_info"].setText("Filter: " + league_name)
-    
-    def pageUp(self):
-        self["scores"].pageUp()
-    
-    def pageDown(self):
-        self["scores"].pageDown()
-    
-    def selectLeague(self):
-        leagues = [
-            ("Premier League", "PL"),
-            ("Champions League", "CL"),
-            ("Primera Division", "PD"),
-            ("Serie A", "SA"),
-            ("Bundesliga", "BL1"),
-            ("Ligue 1", "FL1"),
-            ("Eredivisie", "DED"),
-            ("Campeonato Brasileiro", "BSA"),
-            ("Championship", "ELC"),
-            ("Primeira Liga", "PPL"),
-            ("FIFA World Cup", "WC"),
-            ("European Championship", "EC"),
-        ]
-        self.session.openWithCallback(self.leagueSelected, ChoiceBox, title="Select League Filter", list=leagues)
-    
-    def leagueSelected(self, choice):
-        if choice is None: return
-        self.config["filter_league"] = choice[1]
-        self.config["league_name"] = choice[0]
-        saveConfig(self.config)
-        self.updateLeagueInfo()
-        self.fetchScores()
-
-    def fetchScores(self):
-        try:
-            api_key = self.config.get("api_key", "")
-            if not api_key:
-                self["status"].setText("Error: No API Key")
-                return
-
-            try:
-                now = datetime.now()
-            except:
-                now = datetime.fromtimestamp(time.time())
-
-            today_str = now.strftime("%Y-%m-%d")
-            
-            if now.hour < 6:
-                yesterday = now - timedelta(days=1)
-                date_from_str = yesterday.strftime("%Y-%m-%d")
-                date_to_str = today_str
-            else:
-                date_from_str = today_str
-                date_to_str = today_str
-
-            filter_code = self.config.get("filter_league", "PL")
-            base_url = "https://api.football-data.org/v4/"
-            
-            url = base_url + "competitions/" + filter_code + "/matches?dateFrom=" + date_from_str + "&dateTo=" + date_to_str
-            
-            req = Request(url)
-            req.add_header('X-Auth-Token', api_key)
-            
-            response = urlopen(req, timeout=10)
-            data_string = response.read()
-            
-            try: data_string = data_string.decode('utf-8')
-            except: pass
-            
-            data = json.loads(data_string)
-            self.last_data = data 
-            self.displayScores(data)
-            
-            self.timer.start(15000, True)
-            
-        except Exception as e:
-            err_msg = str(e)
-            if "403" in err_msg:
-                 self["status"].setText("Error: Invalid API Key")
-                 self["scores"].setText("Your API key was rejected.")
-            elif "429" in err_msg:
-                 self["status"].setText("Error: Too Many Requests")
-                 self["scores"].setText("API Limit Reached. Slowing down...")
-                 self.timer.start(120000, True)
-            else:
-                self["status"].setText("Error: " + err_msg[:40])
-                self["scores"].setText("Connection error: " + err_msg + "\n\nRetrying in 15s...")
-                self.timer.start(15000, True)
-
-    def displayScores(self, data):
-        try:
-            matches = data.get("matches", [])
-            display_matches = []
-            
-            if self.live_only:
-                for m in matches:
-                    if m.get("status") in ["IN_PLAY", "PAUSED"]:
-                        display_matches.append(m)
-                mode_text = "LIVE ONLY"
-            else:
-                display_matches = matches
-                mode_text = "ALL MATCHES"
-            
-            output = ""
-            count = 0
-            
-            for match in display_matches:
-                line = self.formatMatchLine(match, is_bar_mode=False)
-                output += line + "\n"
-                count += 1
-            
-            if not self.is_hidden:
-                if not display_matches:
-                    if self.live_only:
-                        self["scores"].setText("No LIVE matches right now.\n\nPress YELLOW to see Scheduled/Finished matches.")
-                    else:
-                        self["scores"].setText("No matches found.\nLeague: " + self.config.get("league_name", "Unknown"))
-                    self["status"].setText("Mode: " + mode_text + " | 0 Matches")
-                    return
-
-                current_time = time.strftime("%H:%M:%S")
-                self["scores"].setText(output)
-                self["status"].setText("Mode: " + mode_text + " | Found: " + str(count) + " | Last Upd: " + current_time)
-            
-        except Exception as e:
-            if not self.is_hidden:
-                self["scores"].setText("Display Error: " + str(e))
 
 def main(session, **kwargs):
-    global footscores_instance
-    if footscores_instance:
-        if footscores_instance.is_hidden:
-            footscores_instance.showFromBackground()
-        else:
-            footscores_instance.show()
-    else:
-        session.open(FootballScoresScreen)
+    try:
+        from . import ui
+    except ImportError as e:
+        # plugin.py without the modules it loads, e.g. copied over an old single-file install
+        print("[FootScores] incomplete install: %s" % e)
+        from Screens.MessageBox import MessageBox
+        session.open(MessageBox, "FootScores is not completely installed:\n%s\n\nPlease reinstall all plugin files." % e, MessageBox.TYPE_ERROR)
+        return
+    ui.main(session, **kwargs)
 
 def Plugins(**kwargs):
     return [
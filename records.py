@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import re
+import json
+import time
+import calendar
+from datetime import datetime
+
+# STATUS ENUM
+SCHEDULED = 0
+TIMED = 1
+IN_PLAY = 2
+PAUSED = 3
+FINISHED = 4
+POSTPONED = 5
+SUSPENDED = 6
+CANCELLED = 7
+AWARDED = 8
+
+STATUS_CODES = {
+    "SCHEDULED": SCHEDULED,
+    "TIMED": TIMED,
+    "IN_PLAY": IN_PLAY,
+    "PAUSED": PAUSED,
+    "FINISHED": FINISHED,
+    "POSTPONED": POSTPONED,
+    "SUSPENDED": SUSPENDED,
+    "CANCELLED": CANCELLED,
+    "AWARDED": AWARDED,
+}
+STATUS_NAMES = dict((code, name) for name, code in STATUS_CODES.items())
+
+LIVE_STATUSES = (IN_PLAY, PAUSED)
+UPCOMING_STATUSES = (SCHEDULED, TIMED)
+
+BAR_NAME_LENGTH = 10
+
+# utcDate -> (epoch, local "HH:MM"); a matchday has only a handful of kickoff times
+_kickoff_cache = {}
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def parseUtcDate(utc_date_str):
+    try:
+        dt_utc = datetime.strptime(utc_date_str.replace("Z", ""), "%Y-%m-%dT%H:%M:%S")
+        return calendar.timegm(dt_utc.timetuple())
+    except:
+        return None
+
+def parseKickoff(utc_date_str):
+    kickoff = _kickoff_cache.get(utc_date_str)
+    if kickoff is None:
+        timestamp = parseUtcDate(utc_date_str)
+        if timestamp is not None:
+            time_str = time.strftime("%H:%M", time.localtime(timestamp))
+        else:
+            time_str = utc_date_str[11:16] if len(utc_date_str) > 16 else "TBD"
+        if len(_kickoff_cache) > 256:
+            _kickoff_cache.clear()
+        kickoff = _kickoff_cache[utc_date_str] = (timestamp, time_str)
+    return kickoff
+
+
+class MatchRecord(object):
+    """One match, parsed once per payload into plain attributes.
+
+    Rendering, diffing and scheduling read these fields directly instead
+    of walking the API's nested dicts on every redraw.
+    """
+    __slots__ = (
+        "id", "competition_code", "competition_name",
+        "home_id", "home", "home_bar", "away_id", "away", "away_bar",
+        "home_score", "away_score", "status", "minute",
+        "utc_date", "kickoff", "kickoff_str",
+    )
+
+    def __init__(self, match_id, competition_code, competition_name,
+                 home_id, home, away_id, away,
+                 home_score, away_score, status, minute, utc_date):
+        self.id = match_id
+        self.competition_code = competition_code
+        self.competition_name = competition_name
+        self.home_id = home_id
+        self.home = home
+        self.home_bar = home[:BAR_NAME_LENGTH]
+        self.away_id = away_id
+        self.away = away
+        self.away_bar = away[:BAR_NAME_LENGTH]
+        self.home_score = home_score
+        self.away_score = away_score
+        self.status = status
+        self.minute = minute
+        self.utc_date = utc_date
+        self.kickoff, self.kickoff_str = parseKickoff(utc_date)
+
+    @property
+    def score(self):
+        return (self.home_score, self.away_score)
+
+    def isLive(self):
+        return self.status in LIVE_STATUSES
+
+    def toRow(self):
+        """Flat list for compact persistence; inverse of fromRow()."""
+        return [self.id, self.competition_code, self.competition_name,
+                self.home_id, self.home, self.away_id, self.away,
+                self.home_score, self.away_score, self.status, self.minute, self.utc_date]
+
+    @classmethod
+    def fromRow(cls, row):
+        return cls(*row)
+
+
+def parseMatch(match):
+    comp = match.get("competition") or {}
+    home = match.get("homeTeam") or {}
+    away = match.get("awayTeam") or {}
+    score = (match.get("score") or {}).get("fullTime") or {}
+    return MatchRecord(
+        match.get("id", 0),
+        comp.get("code", ""),
+        comp.get("name", comp.get("code", "")),
+        home.get("id"),
+        home.get("name") or "Unknown",
+        away.get("id"),
+        away.get("name") or "Unknown",
+        score.get("home") if score.get("home") is not None else 0,
+        score.get("away") if score.get("away") is not None else 0,
+        STATUS_CODES.get(match.get("status"), SCHEDULED),
+        match.get("minute"),
+        match.get("utcDate", ""),
+    )
+
+def parseMatches(data):
+    """Decoded API payload -> list of MatchRecords (the JSON tree can then go)."""
+    return [parseMatch(m) for m in data.get("matches", [])]
+
+def iterMatchObjects(text):
+    """Yield the objects of the payload's top-level "matches" array one at a time.
+
+    The other top-level values (filters, resultSet, competition) are small
+    and skipped; each match is decoded on its own with raw_decode, so at
+    most one match dict exists at a time instead of the whole JSON tree.
+    """
+    skip = _whitespace.match
+    idx = skip(text, 0).end()
+    if text[idx:idx + 1] != "{":
+        raise ValueError("payload is not a JSON object")
+    idx = skip(text, idx + 1).end()
+    while text[idx:idx + 1] not in ("}", ""):
+        key, idx = _decoder.raw_decode(text, idx)
+        idx = skip(text, idx).end()
+        if text[idx:idx + 1] != ":":
+            raise ValueError("expected ':' at %d" % idx)
+        idx = skip(text, idx + 1).end()
+        if key == "matches" and text[idx:idx + 1] == "[":
+            idx = skip(text, idx + 1).end()
+            while text[idx:idx + 1] != "]":
+                match, idx = _decoder.raw_decode(text, idx)
+                yield match
+                idx = skip(text, idx).end()
+                if text[idx:idx + 1] == ",":
+                    idx = skip(text, idx + 1).end()
+                elif text[idx:idx + 1] != "]":
+                    raise ValueError("expected ',' or ']' at %d" % idx)
+            idx += 1
+        else:
+            _, idx = _decoder.raw_decode(text, idx)
+        idx = skip(text, idx).end()
+        if text[idx:idx + 1] == ",":
+            idx = skip(text, idx + 1).end()
+
+def parseMatchStream(text):
+    """Raw payload text -> list of MatchRecords, without building the JSON tree."""
+    return [parseMatch(m) for m in iterMatchObjects(text)]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import time
+
+from .records import IN_PLAY, PAUSED, UPCOMING_STATUSES
+
+# POLL INTERVALS (seconds)
+LIVE_INTERVAL = 15          # a match is IN_PLAY
+PAUSED_INTERVAL = 60        # only half-time breaks
+IDLE_INTERVAL = 30 * 60     # nothing live or close to kickoff
+ERROR_INTERVAL = 15         # connection problems
+RATE_LIMIT_INTERVAL = 120   # 429 without a usable reset header
+
+PRE_KICKOFF = 60            # wake up this long before the earliest kickoff
+KICKOFF_GRACE = 30 * 60     # keep polling fast while a started match is still TIMED
+QUOTA_RESERVE = 1           # requests left for user actions (league switch, key entry)
+
+
+def headerInt(headers, name):
+    try:
+        return int(headers.get(name))
+    except:
+        return None
+
+
+class PollScheduler(object):
+    """Chooses the delay before the next poll.
+
+    The match states in the last payload decide how urgent the next poll is,
+    and the X-Requests-Available-Minute / X-RequestCounter-Reset headers of
+    the last response cap it so the free-tier quota is never exhausted.
+    """
+
+    def __init__(self):
+        self.available = None   # requests left in the current window
+        self.reset_at = None    # epoch when the request counter resets
+        self.interval = LIVE_INTERVAL
+
+    def updateQuota(self, headers, now=None):
+        if not headers:
+            return
+        now = now or time.time()
+        available = headerInt(headers, "X-Requests-Available-Minute")
+        reset = headerInt(headers, "X-RequestCounter-Reset")
+        if available is not None:
+            self.available = available
+        if reset is not None:
+            self.reset_at = now + reset
+
+    def nextInterval(self, matches, now=None):
+        now = now or time.time()
+        return self.applyQuota(self.matchInterval(matches, now), now)
+
+    def errorInterval(self, now=None):
+        now = now or time.time()
+        return self.applyQuota(ERROR_INTERVAL, now)
+
+    def rateLimitedInterval(self, headers, now=None):
+        now = now or time.time()
+        self.available = 0
+        reset = headerInt(headers or {}, "X-RequestCounter-Reset")
+        if reset is not None:
+            self.reset_at = now + reset
+            self.interval = max(reset + 1, LIVE_INTERVAL)
+        else:
+            self.interval = RATE_LIMIT_INTERVAL
+        return self.interval
+
+    def matchInterval(self, matches, now):
+        statuses = set(m.status for m in matches)
+        if IN_PLAY in statuses:
+            return LIVE_INTERVAL
+        if PAUSED in statuses:
+            return PAUSED_INTERVAL
+
+        next_kickoff = None
+        for match in matches:
+            if match.status not in UPCOMING_STATUSES:
+                continue
+            kickoff = match.kickoff
+            if kickoff is None:
+                continue
+            if kickoff <= now:
+                # Kicked off but the API has not flipped it to IN_PLAY yet
+                if now - kickoff < KICKOFF_GRACE:
+                    return LIVE_INTERVAL
+                continue
+            if next_kickoff is None or kickoff < next_kickoff:
+                next_kickoff = kickoff
+
+        if next_kickoff is None:
+            return IDLE_INTERVAL
+        wait = next_kickoff - PRE_KICKOFF - now
+        return max(LIVE_INTERVAL, min(IDLE_INTERVAL, wait))
+
+    def applyQuota(self, interval, now):
+        if self.available is not None and self.reset_at is not None and self.reset_at > now:
+            to_reset = self.reset_at - now
+            usable = self.available - QUOTA_RESERVE
+            if usable <= 0:
+                # Nothing left to spend: sleep through the rest of the window
+                interval = max(interval, to_reset + 1)
+            else:
+                # Spread what is left over the remainder of the window
+                interval = max(interval, to_reset / float(usable))
+        self.interval = int(interval)
+        return self.interval
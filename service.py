@@ -0,0 +1,709 @@
+# -*- coding: utf-8 -*-
+from enigma import eTimer
+import time
+from datetime import datetime, timedelta
+
+from .config import getSettings, API_BASE, MULTI_LEAGUE, TEAM_MODE
+from .fetcher import FetchEngine, fetchJson, errorHeaders
+from .scheduler import PollScheduler
+from .snapshot import loadSnapshot, saveSnapshot, SNAPSHOT_REFRESH
+from .records import parseMatch, parseMatches, STATUS_CODES, LIVE_STATUSES, FINISHED
+from .delta import diffPayloads, MATCH_ADDED, SCORE_CHANGED, STATUS_CHANGED
+from .goalstore import GoalStore
+from .teams import TeamIndex
+from .standings import StandingsCache
+from .details import DetailCache
+from .diagnostics import Diagnostics, PollCycle
+from .budget import (RequestBudget, PRIORITY_LIVE, PRIORITY_LOW, PRIORITY_PREFETCH,
+                     REQUEST_SCORES, REQUEST_STANDINGS, REQUEST_DETAIL, REQUEST_PREFETCH)
+from .share import SharedClient, ShareServer, LeaderLink, SHARE_OFF, SHARE_LEADER, SHARE_FOLLOWER
+from .httpclient import http_client, clock
+
+# Update kinds pushed to subscribers: callback(kind, value)
+UPDATE_DATA = "data"        # matches or goal marks changed; value None
+UPDATE_STATUS = "status"    # only the fetch time or staleness changed; value None
+UPDATE_GOALS = "goals"      # value: [(match, goal event), ...] of one poll
+UPDATE_ERROR = "error"      # value: (error kind, message, retry seconds or None)
+
+ERROR_NO_KEY = "no_key"
+ERROR_AUTH = "auth"
+ERROR_RATE_LIMIT = "rate_limit"
+ERROR_CONNECTION = "connection"
+
+
+class LiveDataService(object):
+    """Owns polling, the current matches and the goal state; one per GUI.
+
+    Screens subscribe for push updates instead of reaching into each other,
+    and polling does not depend on any of them: with no viewer subscribed
+    (main screen closed to the background, only the goal notifier left),
+    polls take the goal-check-only path and the raw payload is kept until
+    a viewer subscribes again.
+    """
+
+    def __init__(self):
+        self.config = getSettings()
+        self.listeners = []         # [[callback, viewer], ...]
+        self.running = False
+
+        self.matches = None         # MatchRecords of the current filter, None until known
+        self.goal_marks = {}        # match id -> goal event, for one poll
+        self.generation = 0
+        self.changed_ids = None     # lines changed by the last generation bump, None: all
+        self.dirty = True
+        self.fetched_at = None
+        self.snapshot_saved_at = 0
+        self.stale = False
+        self.data_url = None
+        self.background_payload = None
+        self.poll_matches = []
+
+        self.goal_store = GoalStore()
+        self.team_index = TeamIndex()
+        self.standings = StandingsCache()
+        self.standings_waiting = {}     # code -> callbacks of the fetch in flight
+        self.details = DetailCache()
+        self.details_waiting = {}       # match id -> callbacks of the fetch in flight
+        self.scheduler = PollScheduler()
+        self.budget = RequestBudget()
+        self.diagnostics = Diagnostics(self.config.get("diagnostics_log", False))
+        self.render_time = 0.0
+        self.widget_updates = 0
+
+        self.fetch_engine = FetchEngine()
+        self.fetch_serial = 0
+        self.timer = eTimer()
+        self.timer.callback.append(self.fetchScores)
+
+        # LAN sharing: a leader's cache and endpoint, or a follower's link to one
+        self.shared_client = None
+        self.share_server = None
+        self.leader = None
+
+    # --- subscriptions ---
+    def subscribe(self, callback, viewer=True):
+        """Push updates to callback(kind, value).
+
+        Viewers display the matches and get the full update path; other
+        subscribers (the goal notifier) only need UPDATE_GOALS.
+        """
+        self.listeners.append([callback, viewer])
+        if viewer and self.background_payload is not None:
+            # Full parse, diff and render were skipped without viewers; catch up once
+            data = self.background_payload
+            self.background_payload = None
+            interval = self.applyPayload(data)
+            # The background poll may have waited for the favourite alone
+            # (IDLE_INTERVAL); what is on screen now sets the pace
+            if self.running and self.timer.isActive():
+                self.scheduleNextPoll(max(0, interval - (time.time() - self.fetched_at)))
+
+    def unsubscribe(self, callback):
+        self.listeners = [entry for entry in self.listeners if entry[0] != callback]
+
+    def hasViewers(self):
+        for callback, viewer in self.listeners:
+            if viewer:
+                return True
+        return False
+
+    def notify(self, kind, value=None):
+        for callback, viewer in list(self.listeners):
+            try:
+                callback(kind, value)
+            except Exception as e:
+                print("[FootScores] subscriber failed on %s: %s" % (kind, e))
+
+    # --- lifecycle ---
+    def start(self):
+        """Paint the last known scores at once, then revalidate and keep polling."""
+        if self.running:
+            return
+        self.running = True
+        self.applyShareMode()
+        if self.matches is None:
+            self.paintSnapshot()
+        self.fetchScores()
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+        self.fetch_serial += 1
+        self.fetch_engine.stop()
+        self.budget.clear()
+        self.standings_waiting = {}
+        self.details_waiting = {}
+        self.stopSharing()
+        self.config.flush()
+
+    # --- LAN sharing ---
+    def applyShareMode(self):
+        """Start serving or following as configured; see share.py."""
+        self.stopSharing()
+        mode = self.config.get("share_mode", SHARE_OFF)
+        if mode == SHARE_LEADER:
+            self.shared_client = SharedClient(http_client)
+            self.share_server = ShareServer(self, self.shared_client, self.config.get("share_port") or 8765)
+            if not self.share_server.start():
+                self.share_server = None
+        elif mode == SHARE_FOLLOWER and self.config.get("share_leader"):
+            self.leader = LeaderLink(self.config["share_leader"])
+
+    def stopSharing(self):
+        if self.share_server is not None:
+            self.share_server.stop()
+        self.share_server = None
+        self.shared_client = None
+        self.leader = None
+
+    def shareStatus(self):
+        if self.share_server is not None:
+            return "Leader on port %d" % self.share_server.port
+        if self.leader is not None:
+            if time.time() < self.leader.retry_at:
+                return "Follower: leader unavailable, fetching directly"
+            return "Follower of " + self.leader.base
+        if self.config.get("share_mode") == SHARE_LEADER:
+            return "Leader: port unavailable"
+        return "Off"
+
+    def route(self, url):
+        """Where to send an API request: the leader while following, else the API."""
+        if self.leader is None:
+            return url
+        return self.leader.route(url, self.apiBase())
+
+    def routeFailed(self, url, error):
+        """True if `url` went to a leader that is now gone (retry directly)."""
+        return self.leader is not None and self.leader.isLeaderUrl(url) and self.leader.failed(error)
+
+    def setShareMode(self, mode, leader=None):
+        values = {"share_mode": mode}
+        if leader is not None:
+            values["share_leader"] = leader
+        self.config.update(values)
+        if self.running:
+            self.applyShareMode()
+            self.fetchScores()
+
+    # --- settings ---
+    def setApiKey(self, api_key):
+        self.config.set("api_key", api_key)
+        if self.running:
+            self.fetchScores()
+        else:
+            self.start()
+
+    def setApiBase(self, base_url):
+        self.config.set("api_base", base_url or API_BASE)
+        self.dirty = True
+        self.fetchScores()
+
+    def setFilter(self, code, name, leagues=None):
+        self.config.update({"filter_league": code, "league_name": name, "filter_leagues": leagues or []})
+        self.refilter()
+
+    def setFavourite(self, name):
+        """Store the typed favourite; returns its team id once it is known."""
+        team_mode = self.config.get("filter_league") == TEAM_MODE
+        old_id = self.config.get("favorite_team_id")
+        self.config.update({"favorite_team": name, "favorite_team_id": None})
+        team_id = self.favouriteTeamId()
+        if team_mode:
+            if team_id is None:
+                # Team mode cannot fetch without an id: back to a real league
+                self.setFilter("PL", "Premier League")
+            elif team_id != old_id:
+                self.setFilter(TEAM_MODE, self.favouriteLabel())
+        return team_id
+
+    def favouriteName(self):
+        """Display name of the favourite: the team index's, else what was typed."""
+        team_id = self.favouriteTeamId()
+        name = self.team_index.name(team_id) if team_id is not None else None
+        return name or self.config.get("favorite_team", "")
+
+    def favouriteLabel(self):
+        return "My Team: " + self.favouriteName()
+
+    def setDiagnosticsLog(self, enabled):
+        self.diagnostics.log_enabled = enabled
+        self.config.set("diagnostics_log", enabled)
+
+    def refilter(self):
+        self.dirty = True
+        if not self.paintSnapshot():
+            # Nothing stored for the new filter: the old filter's matches must
+            # not stand in for it, not even as offline "Cached" data
+            self.clearMatches()
+        if self.running:
+            self.fetchScores()
+
+    def clearMatches(self):
+        self.matches = None
+        self.poll_matches = []
+        self.background_payload = None
+        self.data_url = None
+        self.fetched_at = None
+        self.stale = False
+        self.goal_marks = {}
+        self.bumpGeneration()
+        self.notify(UPDATE_DATA)
+
+    def apiBase(self):
+        base_url = self.config.get("api_base") or API_BASE
+        if not base_url.endswith("/"):
+            base_url += "/"
+        return base_url
+
+    def isMultiLeague(self):
+        return self.config.get("filter_league") == MULTI_LEAGUE and bool(self.config.get("filter_leagues"))
+
+    def isTeamMode(self):
+        return self.config.get("filter_league") == TEAM_MODE and self.config.get("favorite_team_id") is not None
+
+    def groupsByCompetition(self):
+        return self.isMultiLeague() or self.isTeamMode()
+
+    def favouriteTeamId(self):
+        """Resolve the typed favourite to a team id once, via the team index."""
+        team_id = self.config.get("favorite_team_id")
+        if team_id is None and len(self.config.get("favorite_team", "")) > 2:
+            team_id = self.team_index.resolve(self.config["favorite_team"])
+            if team_id is not None:
+                self.config.set("favorite_team_id", team_id)
+        return team_id
+
+    def isFavouriteMatch(self, home_id, away_id, home, away):
+        team_id = self.favouriteTeamId()
+        if team_id is not None:
+            return team_id == home_id or team_id == away_id
+        # Not in the team index yet: fall back to the name test
+        fav_team = self.config.get("favorite_team", "").lower()
+        if fav_team and len(fav_team) > 2:
+            return fav_team in home.lower() or fav_team in away.lower()
+        return True
+
+    # --- polling ---
+    def fetchScores(self):
+        api_key = self.config.get("api_key", "")
+        if not api_key:
+            self.notify(UPDATE_ERROR, (ERROR_NO_KEY, "No API Key", None))
+            return
+
+        # A newer request (league switch, key entry) supersedes any in flight
+        # or waiting for the budget
+        self.timer.stop()
+        self.fetch_serial += 1
+        serial = self.fetch_serial
+        self.budget.submit(REQUEST_SCORES, PRIORITY_LIVE, lambda: self.sendScores(serial))
+
+    def sendScores(self, serial):
+        """The scores request itself, once the budget lets it go out."""
+        try:
+            now = datetime.now()
+        except:
+            now = datetime.fromtimestamp(time.time())
+
+        today_str = now.strftime("%Y-%m-%d")
+
+        if now.hour < 6:
+            yesterday = now - timedelta(days=1)
+            date_from_str = yesterday.strftime("%Y-%m-%d")
+            date_to_str = today_str
+        else:
+            date_from_str = today_str
+            date_to_str = today_str
+
+        url = self.route(self.matchesUrl("dateFrom=" + date_from_str + "&dateTo=" + date_to_str))
+        headers = {'X-Auth-Token': self.config.get("api_key", "")}
+        # Only revalidate the URL whose payload is the one we are holding
+        conditional = self.matches is not None and url == self.data_url
+        client = self.shared_client
+
+        cycle = PollCycle()
+        self.fetch_engine.submit(
+            lambda: fetchJson(url, headers, timeout=10, conditional=conditional, cycle=cycle, client=client),
+            lambda result: self.scoresReceived(serial, url, result[0], result[1], cycle),
+            lambda error: self.scoresFailed(serial, url, error, cycle)
+        )
+
+    def matchesUrl(self, query):
+        """Matches endpoint of the current filter (league, leagues or team) with `query`."""
+        base_url = self.apiBase()
+        if self.isTeamMode():
+            return base_url + "teams/" + str(self.config["favorite_team_id"]) + "/matches?" + query
+        if self.isMultiLeague():
+            # One batched call for all selected competitions keeps quota use flat
+            codes = ",".join(self.config.get("filter_leagues", []))
+            return base_url + "matches?competitions=" + codes + "&" + query
+        return base_url + "competitions/" + self.config.get("filter_league", "PL") + "/matches?" + query
+
+    def scoresReceived(self, serial, url, data, headers, cycle):
+        if serial != self.fetch_serial:
+            return
+        started = self.startCycle()
+        self.updateQuota(headers)
+
+        # L: served by the LAN leader
+        source = "L" if self.leader is not None and self.leader.isLeaderUrl(url) else ""
+        if data is None:
+            # 304 Not Modified: nothing to parse or redraw
+            cycle.result = source + "304"
+            self.fetched_at = time.time()
+            self.stale = False
+            self.notify(UPDATE_STATUS)
+            self.finishCycle(cycle, started, self.scheduler.nextInterval(self.poll_matches))
+            return
+        cycle.result = source + "200"
+        self.data_url = url
+        self.fetched_at = time.time()
+
+        if self.hasViewers():
+            self.finishCycle(cycle, started, self.applyPayload(data))
+        else:
+            self.finishCycle(cycle, started, self.trackInBackground(data))
+
+    def updateQuota(self, headers):
+        """Quota headers of any API response: the poll interval and the budget follow them."""
+        self.scheduler.updateQuota(headers)
+        self.budget.updateQuota(headers)
+
+    def requestFailed(self, error):
+        """Any API request failed; a 429 stops the budget until the counter resets."""
+        if getattr(error, "code", None) == 429:
+            self.budget.rateLimited(errorHeaders(error))
+
+    def startCycle(self):
+        """Reset the per-poll render counters; returns the start time."""
+        self.render_time = 0.0
+        self.widget_updates = 0
+        return clock()
+
+    def addRenderCost(self, seconds, widgets):
+        """Subscribers report what displaying an update cost, for the diagnostics."""
+        self.render_time += seconds
+        self.widget_updates += widgets
+
+    def finishCycle(self, cycle, started, interval):
+        """Record the poll in the diagnostics and schedule the next one (None: don't)."""
+        cycle.process = clock() - started
+        cycle.render = self.render_time
+        cycle.widgets = self.widget_updates
+        cycle.quota = self.scheduler.available
+        cycle.interval = interval
+        self.diagnostics.record(cycle)
+        if interval is not None and self.running:
+            self.scheduleNextPoll(interval)
+
+    def applyPayload(self, data):
+        """Full update: parse, diff, notify, snapshot. Returns the next poll interval."""
+        self.team_index.addPayload(data)
+        self.team_index.save()
+
+        # Parse once into compact records; the JSON tree is dropped here
+        matches = parseMatches(data)
+        events = diffPayloads(self.matches, matches)
+        self.matches = matches
+
+        changed = self.applyEvents(events)
+        if self.dirty and not changed:
+            # League filter changed; grouping may differ even for the same matches
+            self.bumpGeneration()
+        was_stale = self.stale
+        self.stale = False
+        if changed or self.dirty or was_stale:
+            self.dirty = False
+            self.notify(UPDATE_DATA)
+        else:
+            self.notify(UPDATE_STATUS)
+
+        self.poll_matches = matches
+        interval = self.scheduler.nextInterval(matches)
+        if changed or self.fetched_at - self.snapshot_saved_at > SNAPSHOT_REFRESH:
+            if saveSnapshot(self.snapshotKey(), matches, interval, self.fetched_at):
+                self.snapshot_saved_at = self.fetched_at
+        return interval
+
+    def applyEvents(self, events):
+        """Update the goal state from one poll's events; returns the ids whose lines changed."""
+        # GOAL! marks only last for one poll cycle
+        changed = set(self.goal_marks)
+        self.goal_marks = {}
+        goals = []
+
+        for event in events:
+            changed.add(event.match_id)
+            if event.kind in (SCORE_CHANGED, STATUS_CHANGED):
+                self.details.invalidate(event.match_id)
+            if event.kind == SCORE_CHANGED or (event.kind == STATUS_CHANGED and event.new == FINISHED):
+                self.standings.invalidate(event.match.competition_code)
+            if event.kind not in (SCORE_CHANGED, MATCH_ADDED):
+                continue
+            # The goal store, not the previous payload, is the reference score:
+            # it survives league switches and GUI restarts
+            goal_event = self.goal_store.observe(event.match)
+            if goal_event:
+                self.goal_marks[event.match_id] = goal_event
+                goals.append((event.match, goal_event))
+
+        if goals:
+            self.notify(UPDATE_GOALS, goals)
+        self.goal_store.sync(self.matches or [])
+        self.goal_store.save()
+
+        if changed:
+            self.bumpGeneration(changed)
+        return changed
+
+    def bumpGeneration(self, changed_ids=None):
+        """Visible data changed: renderings of an older generation are outdated.
+
+        `changed_ids` names the matches whose lines changed; None means all.
+        """
+        self.generation += 1
+        self.changed_ids = changed_ids
+
+    def trackInBackground(self, data):
+        """Poll without viewers: goal checks only, no full parse, diff or formatting.
+
+        Only matches that are live (or were live at the last poll, to catch a
+        final-whistle goal) or involve the favourite team are parsed. Goals
+        are announced for the favourite's matches (all live ones without a
+        favourite); the scores of the other live matches are still recorded,
+        so the catch-up when a viewer subscribes does not announce them late.
+        The payload is kept raw until then. Returns the next poll interval.
+        """
+        self.background_payload = data
+        has_favourite = len(self.config.get("favorite_team", "")) > 2
+        raw_matches = data.get("matches", [])
+
+        watched = []
+        tracked = []
+        for match in raw_matches:
+            live = STATUS_CODES.get(match.get("status")) in LIVE_STATUSES or self.goal_store.wasLive(match.get("id"))
+            favourite = not has_favourite
+            if has_favourite:
+                home = match.get("homeTeam") or {}
+                away = match.get("awayTeam") or {}
+                favourite = self.isFavouriteMatch(home.get("id"), away.get("id"), home.get("name") or "", away.get("name") or "")
+            if not live and not favourite:
+                continue
+            record = parseMatch(match)
+            if favourite:
+                watched.append(record)
+            if live:
+                tracked.append((record, favourite))
+
+        goals = []
+        for match, favourite in tracked:
+            was_live = self.goal_store.wasLive(match.id)
+            goal_event = self.goal_store.observe(match)
+            if goal_event and favourite:
+                goals.append((match, goal_event))
+            if goal_event or (was_live and match.status == FINISHED):
+                self.standings.invalidate(match.competition_code)
+        if goals:
+            self.notify(UPDATE_GOALS, goals)
+        self.goal_store.sync(watched + [match for match, favourite in tracked if not favourite])
+        self.goal_store.save()
+
+        # With no favourite and nothing live, the kickoff times of all matches matter
+        if not watched and not has_favourite:
+            watched = parseMatches(data)
+        self.poll_matches = watched
+        return self.scheduler.nextInterval(watched)
+
+    def requestStandings(self, code, callback):
+        """callback(table, error) with the standings of `code`.
+
+        A cached table that needs no refresh is passed on at once without a
+        request. Concurrent requests for one competition share one fetch; on
+        failure the cached table, if any, comes with the error.
+        """
+        if not self.standings.needsRefresh(code):
+            callback(self.standings.get(code), None)
+            return
+        if code in self.standings_waiting:
+            self.standings_waiting[code].append(callback)
+            return
+        if not self.config.get("api_key", ""):
+            callback(self.standings.get(code), "No API Key")
+            return
+
+        # Low priority: waits while the budget is short, and only the table
+        # asked for last waits
+        self.standings_waiting[code] = [callback]
+        self.budget.submit(REQUEST_STANDINGS, PRIORITY_LOW,
+                           lambda: self.sendStandings(code), lambda: self.standingsDropped(code))
+
+    def sendStandings(self, code):
+        url = self.route(self.apiBase() + "competitions/" + code + "/standings")
+        headers = {'X-Auth-Token': self.config.get("api_key", "")}
+        conditional = self.standings.get(code) is not None
+        client = self.shared_client
+        self.fetch_engine.submit(
+            lambda: fetchJson(url, headers, timeout=15, conditional=conditional, client=client),
+            lambda result: self.standingsReceived(code, result[0], result[1]),
+            lambda error: self.standingsFailed(code, url, error)
+        )
+
+    def standingsReceived(self, code, data, headers):
+        self.updateQuota(headers)
+        if data is None:
+            table = self.standings.touch(code)
+        else:
+            table = self.standings.store(code, data)
+        for callback in self.standings_waiting.pop(code, []):
+            callback(table, None)
+
+    def standingsFailed(self, code, url, error):
+        print("[FootScores] standings %s failed: %s" % (code, error))
+        self.requestFailed(error)
+        self.routeFailed(url, error)
+        for callback in self.standings_waiting.pop(code, []):
+            callback(self.standings.get(code), error)
+
+    def standingsDropped(self, code):
+        """Another table was asked for (or the screen closed) before this one went out."""
+        for callback in self.standings_waiting.pop(code, []):
+            callback(self.standings.get(code), "Cancelled")
+
+    def cancelStandings(self):
+        self.budget.cancel(REQUEST_STANDINGS)
+
+    def requestDetail(self, match_id, callback):
+        """callback(detail, error) with the MatchDetail of one match.
+
+        Fetched only when asked for, and not again while the cached copy is
+        fresh for its status (see details.py). Waits behind the live poll
+        like the standings; a newer request replaces one still waiting.
+        """
+        if self.details.isFresh(match_id):
+            callback(self.details.get(match_id), None)
+            return
+        if match_id in self.details_waiting:
+            self.details_waiting[match_id].append(callback)
+            return
+        if not self.config.get("api_key", ""):
+            callback(self.details.get(match_id), "No API Key")
+            return
+        self.details_waiting[match_id] = [callback]
+        self.budget.submit(REQUEST_DETAIL, PRIORITY_LOW,
+                           lambda: self.sendDetail(match_id), lambda: self.detailDropped(match_id))
+
+    def prefetchDetail(self, match_id):
+        """Fetch a match's details ahead of time, but only from a mostly unused budget."""
+        if self.details.isFresh(match_id) or match_id in self.details_waiting:
+            return False
+        if not self.config.get("api_key", "") or not self.budget.canSend(PRIORITY_PREFETCH):
+            return False
+        self.details_waiting[match_id] = []
+        self.budget.submit(REQUEST_PREFETCH, PRIORITY_PREFETCH,
+                           lambda: self.sendDetail(match_id), lambda: self.detailDropped(match_id))
+        return True
+
+    def sendDetail(self, match_id):
+        url = self.route(self.apiBase() + "matches/" + str(match_id))
+        headers = {'X-Auth-Token': self.config.get("api_key", "")}
+        conditional = self.details.get(match_id) is not None
+        client = self.shared_client
+        self.fetch_engine.submit(
+            lambda: fetchJson(url, headers, timeout=10, conditional=conditional, client=client),
+            lambda result: self.detailReceived(match_id, result[0], result[1]),
+            lambda error: self.detailFailed(match_id, url, error)
+        )
+
+    def detailReceived(self, match_id, data, headers):
+        self.updateQuota(headers)
+        if data is None:
+            detail = self.details.touch(match_id)
+        else:
+            detail = self.details.store(match_id, data)
+        for callback in self.details_waiting.pop(match_id, []):
+            callback(detail, None)
+
+    def detailFailed(self, match_id, url, error):
+        print("[FootScores] match %s details failed: %s" % (match_id, error))
+        self.requestFailed(error)
+        self.routeFailed(url, error)
+        for callback in self.details_waiting.pop(match_id, []):
+            callback(self.details.get(match_id), error)
+
+    def detailDropped(self, match_id):
+        for callback in self.details_waiting.pop(match_id, []):
+            callback(self.details.get(match_id), "Cancelled")
+
+    def cancelDetail(self):
+        self.budget.cancel(REQUEST_DETAIL)
+
+    def snapshotKey(self):
+        if self.isTeamMode():
+            return TEAM_MODE + str(self.config["favorite_team_id"])
+        if self.isMultiLeague():
+            return "+".join(self.config.get("filter_leagues", []))
+        return self.config.get("filter_league", "PL")
+
+    def paintSnapshot(self):
+        snapshot = loadSnapshot(self.snapshotKey())
+        if snapshot is None:
+            return False
+        self.matches = snapshot.matches
+        self.poll_matches = snapshot.matches
+        self.background_payload = None
+        self.data_url = None
+        self.fetched_at = snapshot.fetched
+        self.snapshot_saved_at = snapshot.fetched
+        self.stale = snapshot.isStale()
+        self.goal_marks = {}
+        self.bumpGeneration()
+        self.dirty = False
+        self.notify(UPDATE_DATA)
+        return True
+
+    def scheduleNextPoll(self, seconds):
+        self.timer.start(int(seconds * 1000), True)
+
+    def scoresFailed(self, serial, url, error, cycle):
+        if serial != self.fetch_serial:
+            return
+        started = self.startCycle()
+        cycle.result = "ERR" + str(getattr(error, "code", ""))
+        if self.routeFailed(url, error):
+            # The leader is gone: fetch directly right away
+            cycle.result = "L" + cycle.result
+            self.finishCycle(cycle, started, None)
+            self.fetchScores()
+            return
+        err_msg = str(error)
+        if "403" in err_msg:
+            self.notify(UPDATE_ERROR, (ERROR_AUTH, err_msg, None))
+            self.finishCycle(cycle, started, None)
+        elif "429" in err_msg:
+            self.requestFailed(error)
+            wait = self.scheduler.rateLimitedInterval(errorHeaders(error))
+            self.notify(UPDATE_ERROR, (ERROR_RATE_LIMIT, err_msg, wait))
+            self.finishCycle(cycle, started, wait)
+        else:
+            wait = self.scheduler.errorInterval()
+            if self.matches is not None and self.fetched_at:
+                # Offline: keep the last scores on screen, marked as cached
+                self.stale = True
+                if self.dirty:
+                    self.dirty = False
+                    self.notify(UPDATE_DATA)
+                else:
+                    self.notify(UPDATE_STATUS)
+            else:
+                self.notify(UPDATE_ERROR, (ERROR_CONNECTION, err_msg, wait))
+            self.finishCycle(cycle, started, wait)
+
+
+_service = None
+
+def getService():
+    """The GUI-wide LiveDataService, created on first use."""
+    global _service
+    if _service is None:
+        _service = LiveDataService()
+    return _service
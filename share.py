@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+import time
+import zlib
+import threading
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+from .httpclient import HttpError, HttpResponse
+from .scheduler import LIVE_INTERVAL
+
+SHARE_OFF = "off"
+SHARE_LEADER = "leader"
+SHARE_FOLLOWER = "follower"
+
+SHARE_PORT = 8765
+# Seconds a payload is served again without asking the API; below the live
+# poll interval, or every other live poll would be answered from the cache
+SHARE_MAX_AGE = LIVE_INTERVAL - 5
+SHARE_KEEP = 600            # entries unused for this long are dropped
+SHARE_RETRY = 120           # seconds a follower fetches directly after its leader failed
+QUOTA_HEADERS = ("X-Requests-Available-Minute", "X-RequestCounter-Reset")
+
+
+class SharedClient(object):
+    """HttpClient.get() with a short-lived, coalescing cache in front.
+
+    On the leader, its own polls and every follower's requests go through
+    one of these: a URL fetched within SHARE_MAX_AGE is answered from the
+    cache, and concurrent misses for one URL wait for a single upstream
+    request. API errors are cached too, so a 429 is not retried by every
+    box at once. Thread-safe; the HTTP handler threads share it.
+    """
+
+    def __init__(self, client, max_age=SHARE_MAX_AGE):
+        self.client = client
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.entries = {}       # url -> (fetched, response or None, etag or error)
+        self.inflight = {}      # url -> threading.Event
+        self.delivered = {}     # url -> etag last handed to the local poller
+
+    def get(self, url, headers=None, timeout=10, conditional=True):
+        response, etag = self.cached(url, headers, timeout)
+        if conditional:
+            # Same payload as the local poller already has: answer like the API would
+            if self.delivered.get(url) == etag:
+                return HttpResponse(304, response.headers, b"", response.timing)
+            self.delivered[url] = etag
+        return response
+
+    def cached(self, url, headers, timeout):
+        """(response, etag) of `url`, at most max_age old; raises the cached error."""
+        deadline = time.time() + timeout
+        while True:
+            with self.lock:
+                entry = self.entries.get(url)
+                if entry is not None and time.time() - entry[0] < self.max_age:
+                    if entry[1] is None:
+                        raise entry[2]
+                    return entry[1], entry[2]
+                event = self.inflight.get(url)
+                owner = event is None
+                if owner:
+                    event = self.inflight[url] = threading.Event()
+            if owner:
+                # An expired payload can still be revalidated upstream
+                previous = entry if entry is not None and entry[1] is not None else None
+                break
+            if not event.wait(max(0.1, deadline - time.time())):
+                raise HttpError(504, "Shared fetch timed out")
+
+        try:
+            try:
+                response = self.client.get(url, headers, timeout=timeout, conditional=previous is not None)
+                if response.not_modified:
+                    # Upstream unchanged: keep the body, take the new quota headers
+                    response = HttpResponse(200, response.headers, previous[1].body, response.timing)
+                result = (time.time(), response, '"%x"' % (zlib.crc32(response.body) & 0xffffffff))
+            except HttpError as e:
+                result = (time.time(), None, e)
+            with self.lock:
+                self.entries[url] = result
+                self.prune(result[0])
+        finally:
+            with self.lock:
+                del self.inflight[url]
+            event.set()
+        if result[1] is None:
+            raise result[2]
+        return result[1], result[2]
+
+    def prune(self, now):
+        for url in [u for u, entry in self.entries.items() if now - entry[0] > SHARE_KEEP]:
+            del self.entries[url]
+            self.delivered.pop(url, None)
+
+
+class ShareHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # followers keep their connection open
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        share = self.server.share
+        if share.httpd is not self.server:
+            # Stopped: keep-alive connections from before must not go on serving
+            self.close_connection = True
+            return self.reply(503, b'{"message": "FootScores leader stopped."}')
+        api_key = share.service.config.get("api_key", "")
+        if not api_key or self.headers.get("X-Auth-Token") != api_key:
+            return self.reply(403, b'{"message": "Wrong API key for this FootScores leader."}')
+
+        url = share.service.apiBase() + self.path.lstrip("/")
+        try:
+            response, etag = share.client.cached(url, {"X-Auth-Token": api_key}, 15)
+        except HttpError as e:
+            return self.reply(e.code, b'{"message": "Upstream: ' + str(e).encode("utf-8") + b'"}', e.headers)
+        except Exception as e:
+            print("[FootScores] share upstream failed: %s" % e)
+            return self.reply(502, b'{"message": "Leader could not reach the API."}')
+
+        headers = {"ETag": etag}
+        if self.headers.get("If-None-Match") == etag:
+            return self.reply(304, b"", response.headers, headers)
+        self.reply(200, response.body, response.headers, headers)
+
+    def reply(self, code, body, upstream_headers=None, headers=None):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        # Pass the quota on, so followers' schedulers slow down with the leader
+        for name in QUOTA_HEADERS:
+            value = upstream_headers.get(name) if upstream_headers is not None else None
+            if value is not None:
+                self.send_header(name, value)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ShareServer(object):
+    """Leader side: serves the API to the other boxes through one SharedClient.
+
+    Followers send exactly the request they would send to the API, to
+    http://<leader>:<port>/ instead of the API base, with the same key.
+    """
+
+    def __init__(self, service, client, port=SHARE_PORT):
+        self.service = service
+        self.client = client
+        self.port = port
+        self.httpd = None
+
+    def start(self):
+        if self.httpd is not None:
+            return True
+        try:
+            self.httpd = ThreadingHTTPServer(("", self.port), ShareHandler)
+        except Exception as e:
+            print("[FootScores] share server on port %d failed: %s" % (self.port, e))
+            return False
+        self.httpd.share = self
+        self.port = self.httpd.server_port
+        thread = threading.Thread(target=self.httpd.serve_forever, name="FootScoresShare")
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+class LeaderLink(object):
+    """Follower side: routes API URLs to the leader while it answers.
+
+    A leader that cannot be reached (or fails with a 5xx) is skipped for
+    SHARE_RETRY seconds; meanwhile the follower fetches directly.
+    """
+
+    def __init__(self, leader, retry=SHARE_RETRY):
+        if ":" not in leader:
+            leader += ":" + str(SHARE_PORT)
+        self.base = "http://" + leader + "/"
+        self.retry = retry
+        self.retry_at = 0
+
+    def route(self, url, api_base):
+        if time.time() < self.retry_at or not url.startswith(api_base):
+            return url
+        return self.base + url[len(api_base):]
+
+    def isLeaderUrl(self, url):
+        return url.startswith(self.base)
+
+    def failed(self, error):
+        """True if `error` means the leader is gone; then go direct for a while."""
+        if isinstance(error, HttpError) and error.code < 500:
+            return False
+        print("[FootScores] leader %s unavailable, fetching directly: %s" % (self.base, error))
+        self.retry_at = time.time() + self.retry
+        return True
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+
+from .records import MatchRecord
+from .atomicfile import writeAtomic
+
+# tmpfs survives GUI restarts (including the one after an update)
+# without wearing the receiver's flash on every poll.
+SNAPSHOT_DIR = "/tmp/footscores"
+SNAPSHOT_MAX_AGE = 6 * 3600     # older snapshots are not worth painting
+SNAPSHOT_REFRESH = 5 * 60       # rewrite unchanged data this often
+
+SNAPSHOT_FORMAT = 2           # matches stored as MatchRecord rows
+
+
+class Snapshot(object):
+    __slots__ = ("matches", "fetched", "ttl")
+
+    def __init__(self, matches, fetched, ttl):
+        self.matches = matches
+        self.fetched = fetched
+        self.ttl = ttl
+
+    def age(self, now=None):
+        return (now or time.time()) - self.fetched
+
+    def isStale(self, now=None):
+        return self.age(now) > self.ttl
+
+
+def snapshotPath(key):
+    safe_key = "".join(c for c in key if c.isalnum() or c in "+-_")
+    return os.path.join(SNAPSHOT_DIR, "snapshot_" + safe_key + ".json")
+
+def saveSnapshot(key, matches, ttl, fetched=None):
+    """Persist the MatchRecords as flat rows; returns True on success."""
+    record = {
+        "format": SNAPSHOT_FORMAT,
+        "fetched": fetched or time.time(),
+        "ttl": ttl,
+        "rows": [m.toRow() for m in matches],
+    }
+    path = snapshotPath(key)
+    try:
+        if not os.path.isdir(SNAPSHOT_DIR):
+            os.makedirs(SNAPSHOT_DIR)
+        writeAtomic(path, json.dumps(record, separators=(",", ":")))
+        return True
+    except Exception as e:
+        print("[FootScores] snapshot write failed: %s" % e)
+        return False
+
+def loadSnapshot(key, max_age=SNAPSHOT_MAX_AGE):
+    try:
+        with open(snapshotPath(key), "r") as f:
+            record = json.load(f)
+        if record.get("format") != SNAPSHOT_FORMAT:
+            return None
+        matches = [MatchRecord.fromRow(row) for row in record["rows"]]
+        snapshot = Snapshot(matches, record["fetched"], record.get("ttl", 0))
+    except:
+        return None
+    if snapshot.age() > max_age:
+        return None
+    return snapshot
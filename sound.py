@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+from enigma import eTimer
+import os
+import subprocess
+
+SOUND_FILENAME = "goal.mp3"
+SOUND_VOLUME = 0.4
+SOUND_BUS_POLL = 500        # ms between bus checks while the goal sound plays
+
+
+def findSoundFile(plugin_path):
+    for directory in (plugin_path, "/etc/enigma2", "/usr/share/enigma2"):
+        path = os.path.join(directory, SOUND_FILENAME)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class NullBackend(object):
+    """Plays nothing; counts calls. For tests and boxes without audio."""
+    name = "null"
+
+    def __init__(self):
+        self.path = None
+        self.plays = 0
+
+    def load(self, path):
+        self.path = path
+
+    def play(self):
+        self.plays += 1
+
+    def close(self):
+        pass
+
+
+class GstBackend(object):
+    """In-process GStreamer playbin, built once and restarted for every goal.
+
+    Enigma2 runs no GLib main loop, so nothing dispatches the playbin's bus:
+    while a clip plays, a timer drains it, and at EOS (or an error) the
+    playbin goes back to NULL. That empties the bus and closes the audio
+    device between goals; alsasink already holds it open in READY.
+    """
+    name = "gstreamer"
+
+    def __init__(self):
+        import gi
+        gi.require_version("Gst", "1.0")
+        from gi.repository import Gst
+        if not Gst.is_initialized():
+            Gst.init(None)
+        self.Gst = Gst
+        self.playbin = None
+        self.timer = eTimer()
+        self.timer.callback.append(self.pollBus)
+
+    def load(self, path):
+        Gst = self.Gst
+        self.playbin = Gst.ElementFactory.make("playbin", "footscores_goal")
+        self.playbin.set_property("uri", "file://" + path)
+        self.playbin.set_property("volume", SOUND_VOLUME)
+        sink = Gst.ElementFactory.make("alsasink", None)
+        if sink is not None:
+            self.playbin.set_property("audio-sink", sink)
+
+    def play(self):
+        Gst = self.Gst
+        # Through NULL, so a clip that is still playing restarts from the top
+        self.playbin.set_state(Gst.State.NULL)
+        self.playbin.set_state(Gst.State.PLAYING)
+        self.timer.start(SOUND_BUS_POLL, False)
+
+    def pollBus(self):
+        """Drop the bus messages; release the pipeline once the clip is over."""
+        if self.playbin is None:
+            self.timer.stop()
+            return
+        Gst = self.Gst
+        bus = self.playbin.get_bus()
+        finished = False
+        message = bus.pop()
+        while message is not None:
+            if message.type in (Gst.MessageType.EOS, Gst.MessageType.ERROR):
+                finished = True
+            message = bus.pop()
+        if finished:
+            self.timer.stop()
+            self.playbin.set_state(Gst.State.NULL)
+
+    def close(self):
+        self.timer.stop()
+        if self.playbin is not None:
+            self.playbin.set_state(self.Gst.State.NULL)
+            self.playbin = None
+
+
+class ProcessBackend(object):
+    """gst-launch fallback when the Python GStreamer bindings are missing.
+
+    Spawned without a shell, and any still-running previous clip is
+    stopped first so goals in quick succession never leave orphans.
+    """
+    name = "gst-launch"
+
+    def __init__(self):
+        self.path = None
+        self.proc = None
+
+    def load(self, path):
+        self.path = path
+
+    def play(self):
+        self.close()
+        devnull = open(os.devnull, "w")
+        try:
+            self.proc = subprocess.Popen(
+                ["gst-launch-1.0", "playbin", "uri=file://" + self.path,
+                 "audio-sink=alsasink", "volume=%s" % SOUND_VOLUME],
+                stdout=devnull, stderr=devnull, close_fds=True)
+        finally:
+            devnull.close()
+
+    def close(self):
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.terminate()
+            self.proc = None
+
+
+def defaultBackend():
+    try:
+        return GstBackend()
+    except Exception:
+        return ProcessBackend()
+
+
+class GoalSound(object):
+    """The goal sound: file resolved once, player loaded once.
+
+    Plays on every call; how often goals may sound is GoalNotifier's call.
+    """
+
+    def __init__(self, plugin_path, backend=None):
+        self.plugin_path = plugin_path
+        self.backend = backend
+        self.path = None
+        self.loaded = False
+
+    def preload(self):
+        """Resolve the file and get the player ready; safe to call repeatedly."""
+        if self.loaded:
+            return self.path is not None
+        self.loaded = True
+        self.path = findSoundFile(self.plugin_path)
+        if self.path is None:
+            return False
+        try:
+            if self.backend is None:
+                self.backend = defaultBackend()
+            self.backend.load(self.path)
+        except Exception as e:
+            print("[FootScores] goal sound unavailable: %s" % e)
+            self.path = None
+            return False
+        return True
+
+    def play(self):
+        if not self.preload():
+            return False
+        try:
+            self.backend.play()
+        except Exception as e:
+            print("[FootScores] goal sound failed: %s" % e)
+            return False
+        return True
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+
+from .snapshot import SNAPSHOT_DIR
+from .atomicfile import writeAtomic
+
+STANDINGS_TTL = 12 * 3600       # tables only move when a match ends
+STANDINGS_MIN_REFRESH = 60      # seconds between two fetches of an outdated table
+STANDINGS_FORMAT = 1
+
+
+class StandingRow(object):
+    __slots__ = ("position", "team_id", "team", "played", "won", "draw", "lost",
+                 "goals_for", "goals_against", "points")
+
+    def __init__(self, position, team_id, team, played, won, draw, lost, goals_for, goals_against, points):
+        self.position = position
+        self.team_id = team_id
+        self.team = team
+        self.played = played
+        self.won = won
+        self.draw = draw
+        self.lost = lost
+        self.goals_for = goals_for
+        self.goals_against = goals_against
+        self.points = points
+
+    @property
+    def goal_difference(self):
+        return self.goals_for - self.goals_against
+
+    def toRow(self):
+        return [self.position, self.team_id, self.team, self.played, self.won, self.draw,
+                self.lost, self.goals_for, self.goals_against, self.points]
+
+    @classmethod
+    def fromRow(cls, row):
+        return cls(*row)
+
+
+class Table(object):
+    """One competition's standings: [(group, rows), ...], group "" for a league."""
+    __slots__ = ("code", "groups", "fetched", "outdated")
+
+    def __init__(self, code, groups, fetched, outdated=False):
+        self.code = code
+        self.groups = groups
+        self.fetched = fetched
+        self.outdated = outdated
+
+    def age(self, now=None):
+        return (now or time.time()) - self.fetched
+
+
+def parseStandings(code, data, fetched=None):
+    """The TOTAL tables of a /competitions/{code}/standings payload as a Table."""
+    groups = []
+    for standing in data.get("standings") or []:
+        if standing.get("type", "TOTAL") != "TOTAL":
+            continue
+        rows = []
+        for entry in standing.get("table") or []:
+            team = entry.get("team") or {}
+            rows.append(StandingRow(
+                entry.get("position") or len(rows) + 1,
+                team.get("id"),
+                team.get("shortName") or team.get("name") or "Unknown",
+                entry.get("playedGames") or 0,
+                entry.get("won") or 0,
+                entry.get("draw") or 0,
+                entry.get("lost") or 0,
+                entry.get("goalsFor") or 0,
+                entry.get("goalsAgainst") or 0,
+                entry.get("points") or 0,
+            ))
+        group = (standing.get("group") or "").replace("_", " ").title()
+        groups.append((group, rows))
+    return Table(code, groups, fetched or time.time())
+
+
+class StandingsCache(object):
+    """Standings per competition, kept for STANDINGS_TTL.
+
+    Tables are not polled: they are fetched when someone looks at them and
+    the cached copy is missing, expired or marked outdated. The live poll
+    marks a competition outdated when one of its matches changes score or
+    finishes (invalidate()), and even then it is fetched again at most every
+    STANDINGS_MIN_REFRESH. Copies live in tmpfs next to the snapshots, so a
+    GUI restart does not cost a request per table.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR, ttl=STANDINGS_TTL, min_refresh=STANDINGS_MIN_REFRESH):
+        self.directory = directory
+        self.ttl = ttl
+        self.min_refresh = min_refresh
+        self.tables = {}
+        self.outdated = set()      # codes invalidated before their table was loaded
+
+    def path(self, code):
+        safe_code = "".join(c for c in code if c.isalnum())
+        return os.path.join(self.directory, "standings_" + safe_code + ".json")
+
+    def get(self, code):
+        """The cached Table of `code`, however old (None if never fetched)."""
+        table = self.tables.get(code)
+        if table is None:
+            table = self.load(code)
+            if table is not None:
+                if code in self.outdated:
+                    self.outdated.discard(code)
+                    table.outdated = True
+                self.tables[code] = table
+        return table
+
+    def needsRefresh(self, code, now=None):
+        table = self.get(code)
+        if table is None:
+            return True
+        age = table.age(now)
+        if age > self.ttl:
+            return True
+        return table.outdated and age >= self.min_refresh
+
+    def invalidate(self, code):
+        """A match of `code` changed score or finished: its table is outdated."""
+        table = self.tables.get(code)
+        if table is None:
+            self.outdated.add(code)
+        elif not table.outdated:
+            table.outdated = True
+            self.save(table)
+
+    def store(self, code, data, fetched=None):
+        table = parseStandings(code, data, fetched)
+        self.tables[code] = table
+        self.outdated.discard(code)
+        self.save(table)
+        return table
+
+    def touch(self, code, fetched=None):
+        """304: the cached table is confirmed current."""
+        table = self.get(code)
+        if table is not None:
+            table.fetched = fetched or time.time()
+            table.outdated = False
+            self.save(table)
+        return table
+
+    def load(self, code):
+        try:
+            with open(self.path(code), "r") as f:
+                record = json.load(f)
+            if record.get("format") != STANDINGS_FORMAT:
+                return None
+            groups = [(group, [StandingRow.fromRow(row) for row in rows]) for group, rows in record["groups"]]
+            return Table(code, groups, record["fetched"], record.get("outdated", False))
+        except:
+            return None
+
+    def save(self, table):
+        record = {
+            "format": STANDINGS_FORMAT,
+            "fetched": table.fetched,
+            "outdated": table.outdated,
+            "groups": [[group, [row.toRow() for row in rows]] for group, rows in table.groups],
+        }
+        path = self.path(table.code)
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            writeAtomic(path, json.dumps(record, separators=(",", ":")))
+            return True
+        except Exception as e:
+            print("[FootScores] standings write failed: %s" % e)
+            return False
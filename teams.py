@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import re
+import json
+import unicodedata
+
+from .atomicfile import writeAtomic
+
+# Team names barely change, so the index lives next to the config and is
+# only rewritten when a payload brings in a team it has not seen before.
+TEAM_INDEX_FILE = "/etc/enigma2/footscores_teams.json"
+
+# Club-form noise that users leave out when typing a team name
+NAME_NOISE = set(["fc", "cf", "afc", "sc", "ac", "club", "de", "the"])
+
+_non_alnum = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalizeName(name):
+    """'Atlético de Madrid' / 'ATLETICO MADRID' -> 'atletico madrid'."""
+    if not name:
+        return ""
+    try:
+        if not isinstance(name, type(u"")):
+            name = name.decode("utf-8")
+        name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    except:
+        pass
+    words = _non_alnum.sub(" ", name.lower()).split()
+    return " ".join(w for w in words if w not in NAME_NOISE)
+
+
+class TeamIndex(object):
+    """Team id <-> names lookup built from the match payloads.
+
+    Each team is stored once as id -> [name, shortName, tla]; the normalized
+    forms of all three point back to the id, so resolving the favourite
+    team is a dict lookup instead of a substring scan per goal.
+    """
+
+    def __init__(self, path=TEAM_INDEX_FILE):
+        self.path = path
+        self.teams = {}
+        self.keys = {}
+        self.changed = False
+        self.load()
+
+    def __len__(self):
+        return len(self.teams)
+
+    def addTeam(self, team):
+        team_id = team.get("id")
+        if team_id is None or team_id in self.teams:
+            return
+        entry = [team.get("name") or "", team.get("shortName") or "", team.get("tla") or ""]
+        self.teams[team_id] = entry
+        self.indexTeam(team_id, entry)
+        self.changed = True
+
+    def indexTeam(self, team_id, entry):
+        for value in entry:
+            key = normalizeName(value)
+            if key:
+                self.keys.setdefault(key, team_id)
+
+    def addPayload(self, data):
+        for match in data.get("matches", []):
+            self.addTeam(match.get("homeTeam") or {})
+            self.addTeam(match.get("awayTeam") or {})
+
+    def resolve(self, query):
+        """Team id for a typed name, short name or TLA; None if unknown or ambiguous."""
+        key = normalizeName(query)
+        if not key:
+            return None
+        team_id = self.keys.get(key)
+        if team_id is not None:
+            return team_id
+
+        candidates = set()
+        for name_key, team_id in self.keys.items():
+            if key in name_key:
+                candidates.add(team_id)
+        if len(candidates) == 1:
+            return candidates.pop()
+        return None
+
+    def name(self, team_id):
+        entry = self.teams.get(team_id)
+        if entry is None:
+            return None
+        return entry[1] or entry[0]
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                rows = json.load(f)
+            for team_id, name, short_name, tla in rows:
+                self.teams[team_id] = [name, short_name, tla]
+                self.indexTeam(team_id, self.teams[team_id])
+        except:
+            self.teams = {}
+            self.keys = {}
+
+    def save(self):
+        if not self.changed:
+            return True
+        rows = [[team_id] + entry for team_id, entry in self.teams.items()]
+        try:
+            writeAtomic(self.path, json.dumps(rows, separators=(",", ":")))
+            self.changed = False
+            return True
+        except Exception as e:
+            print("[FootScores] team index write failed: %s" % e)
+            return False
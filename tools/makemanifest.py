@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Write manifest.json for the self-updater.
+
+Run before every release, from anywhere:
+
+    python tools/makemanifest.py
+
+Lists every file the receiver needs -- the top-level *.py modules plus
+goal.mp3 and plugin.png -- with its SHA-256 and size, under the version
+found in ui.py. Installed copies that already match a hash are not
+downloaded again, and every download is checked against it.
+
+version.txt is deliberately left alone: the updater of 1.3 and older
+reads it and then fetches only plugin.py, goal.mp3 and plugin.png, which
+cannot make a working multi-module install. It stays at 1.3 so those
+installs are never offered an update they would break.
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS = ["goal.mp3", "plugin.png"]
+
+
+def pluginVersion():
+    with open(os.path.join(ROOT, "ui.py"), "r") as f:
+        match = re.search(r'^PLUGIN_VERSION = "([^"]+)"', f.read(), re.M)
+    if match is None:
+        raise SystemExit("PLUGIN_VERSION not found in ui.py")
+    return match.group(1)
+
+def runtimeFiles():
+    modules = [name for name in os.listdir(ROOT) if name.endswith(".py")]
+    return sorted(modules) + [name for name in ASSETS if os.path.exists(os.path.join(ROOT, name))]
+
+def describe(name):
+    with open(os.path.join(ROOT, name), "rb") as f:
+        data = f.read()
+    return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+def main():
+    version = pluginVersion()
+    manifest = {
+        "version": version,
+        "files": dict((name, describe(name)) for name in runtimeFiles()),
+    }
+    with open(os.path.join(ROOT, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print("manifest.json: version %s, %d files" % (version, len(manifest["files"])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in for the football-data.org v4 endpoints FootScores uses.
+
+Replays a match-day timeline at accelerated speed so polling, goal
+detection and the 403/429 paths can be exercised offline and repeatably.
+Point the plugin at it with the "api_base" config key, e.g.
+
+    python tools/mockserver.py --timeline tools/timelines/sample_matchday.json --speed 60
+    # footscores_config.json: "api_base": "http://<pc>:8080/v4/"
+
+Timelines come in two forms:
+
+* scripted: {"matches": [...], "events": [...]} -- match states are derived
+  from each match's "kickoff" offset (virtual minutes) plus scripted goal,
+  VAR, status and rate-limit events. See tools/timelines/sample_matchday.json.
+* recorded: {"frames": [{"t": seconds, "payload": {...}}, ...]} -- as written
+  by the "record" sub-command from the real API; replayed frame by frame.
+
+"--synthetic N" generates a scripted timeline with N matches instead.
+
+Sub-commands:
+    serve  (default)  run the mock server
+    record            poll the real API and write a recorded timeline
+"""
+import sys
+import json
+import time
+import gzip
+import random
+import argparse
+import threading
+from io import BytesIO
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit, parse_qs
+    from urllib2 import Request, urlopen
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit, parse_qs
+    from urllib.request import Request, urlopen
+
+REAL_API = "https://api.football-data.org/v4/"
+DEFAULT_KEY = "mock-api-key"
+FREE_TIER_PER_MINUTE = 10
+
+HALF_LENGTH = 45
+BREAK_LENGTH = 15
+COMPETITIONS = [
+    ("PL", "Premier League"), ("PD", "Primera Division"), ("SA", "Serie A"),
+    ("BL1", "Bundesliga"), ("FL1", "Ligue 1"), ("CL", "UEFA Champions League"),
+]
+
+
+def isoDate(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+# --- TIMELINES ---
+class ScriptedTimeline(object):
+    """Match states as a pure function of the virtual minute."""
+
+    def __init__(self, spec, start_epoch):
+        self.start_epoch = start_epoch
+        self.matches = spec.get("matches", [])
+        self.events = sorted(spec.get("events", []), key=lambda e: e.get("at", 0))
+
+    def status(self, match, minute):
+        kickoff = match.get("kickoff", 0)
+        played = minute - kickoff
+        if played < 0:
+            return "TIMED", None
+        if played < HALF_LENGTH:
+            return "IN_PLAY", int(played) + 1
+        if played < HALF_LENGTH + BREAK_LENGTH:
+            return "PAUSED", HALF_LENGTH
+        if played < 2 * HALF_LENGTH + BREAK_LENGTH:
+            return "IN_PLAY", int(played) - BREAK_LENGTH + 1
+        return "FINISHED", None
+
+    def payload(self, minute):
+        states = {}
+        for match in self.matches:
+            status, played = self.status(match, minute)
+            states[match["id"]] = {"status": status, "minute": played, "home": None, "away": None}
+            if status != "TIMED":
+                states[match["id"]]["home"] = 0
+                states[match["id"]]["away"] = 0
+
+        for event in self.events:
+            if event.get("at", 0) > minute:
+                break
+            state = states.get(event.get("match"))
+            if state is None:
+                continue
+            kind = event.get("type")
+            side = event.get("team", "home")
+            if kind == "goal":
+                state[side] = (state[side] or 0) + 1
+            elif kind == "var":
+                state[side] = max(0, (state[side] or 0) - 1)
+            elif kind == "status":
+                state["status"] = event["status"]
+
+        matches = []
+        for match in self.matches:
+            state = states[match["id"]]
+            code, name = match.get("competition", ["PL", "Premier League"])
+            matches.append({
+                "id": match["id"],
+                "utcDate": isoDate(self.start_epoch + match.get("kickoff", 0) * 60),
+                "status": state["status"],
+                "minute": state["minute"],
+                "competition": {"code": code, "name": name},
+                "homeTeam": match["homeTeam"],
+                "awayTeam": match["awayTeam"],
+                "score": {"fullTime": {"home": state["home"], "away": state["away"]}},
+            })
+        return matches
+
+    def detail(self, match_id, minute):
+        """/matches/{id}: the match plus its goals so far, halftime score and officials."""
+        match = None
+        for candidate in self.payload(minute):
+            if candidate["id"] == match_id:
+                match = candidate
+        if match is None:
+            return None
+        kickoff = 0
+        for spec in self.matches:
+            if spec["id"] == match_id:
+                kickoff = spec.get("kickoff", 0)
+        goals = []
+        score = {"home": 0, "away": 0}
+        half_time = None
+        for event in self.events:
+            if event.get("at", 0) > minute or event.get("match") != match_id:
+                continue
+            played = event["at"] - kickoff
+            if played >= HALF_LENGTH and half_time is None:
+                half_time = dict(score)
+            side = event.get("team", "home")
+            if event.get("type") == "goal":
+                score[side] += 1
+                if played >= HALF_LENGTH + BREAK_LENGTH:
+                    played -= BREAK_LENGTH
+                goals.append({"minute": int(played) + 1, "injuryTime": None, "type": "REGULAR",
+                              "team": match[side + "Team"], "scorer": {"name": event.get("scorer") or "Player %d" % (len(goals) + 1)},
+                              "assist": None, "score": dict(score)})
+            elif event.get("type") == "var":
+                for index in range(len(goals) - 1, -1, -1):
+                    if goals[index]["team"].get("id") == match[side + "Team"].get("id"):
+                        del goals[index]
+                        break
+                score[side] = max(0, score[side] - 1)
+        if half_time is None and minute - kickoff >= HALF_LENGTH:
+            half_time = dict(score)
+        match = dict(match, goals=goals, bookings=[], substitutions=[], venue="Mock Stadium",
+                     referees=[{"name": "Mock Referee", "type": "REFEREE"}])
+        match["score"] = dict(match["score"], halfTime=half_time or {"home": None, "away": None})
+        return match
+
+    def rateLimited(self, minute):
+        for event in self.events:
+            if event.get("type") != "rate_limit":
+                continue
+            if event["at"] <= minute < event["at"] + event.get("duration", 1):
+                return True
+        return False
+
+    def firedEvents(self, minute):
+        return [e for e in self.events if e.get("at", 0) <= minute]
+
+
+class RecordedTimeline(object):
+    """Replays captured payloads: the last frame at or before the virtual time."""
+
+    def __init__(self, spec):
+        self.frames = sorted(spec.get("frames", []), key=lambda f: f["t"])
+
+    def payload(self, minute):
+        seconds = minute * 60
+        current = self.frames[0]["payload"] if self.frames else {"matches": []}
+        for frame in self.frames:
+            if frame["t"] > seconds:
+                break
+            current = frame["payload"]
+        return current.get("matches", [])
+
+    def detail(self, match_id, minute):
+        for match in self.payload(minute):
+            if match.get("id") == match_id:
+                return match
+        return None
+
+    def rateLimited(self, minute):
+        return False
+
+    def firedEvents(self, minute):
+        return []
+
+
+def syntheticTimeline(count, seed=1, goals_per_match=2.7):
+    """Scripted timeline with `count` matches spread over the competitions."""
+    rng = random.Random(seed)
+    matches = []
+    events = []
+    for index in range(count):
+        match_id = 500000 + index
+        code, name = COMPETITIONS[index % len(COMPETITIONS)]
+        kickoff = rng.choice([0, 0, 15, 30, 120])
+        matches.append({
+            "id": match_id,
+            "kickoff": kickoff,
+            "competition": [code, name],
+            "homeTeam": {"id": 2 * index + 1, "name": "Home Team %d FC" % index, "shortName": "Home %d" % index, "tla": "H%02d" % (index % 100)},
+            "awayTeam": {"id": 2 * index + 2, "name": "Away Team %d FC" % index, "shortName": "Away %d" % index, "tla": "A%02d" % (index % 100)},
+        })
+        for _ in range(int(rng.expovariate(1.0 / goals_per_match))):
+            minute = kickoff + rng.randint(1, 2 * HALF_LENGTH + BREAK_LENGTH - 1)
+            events.append({"at": minute, "match": match_id, "type": "goal", "team": rng.choice(["home", "away"])})
+        if rng.random() < 0.1 and events:
+            goal = events[-1]
+            if goal["match"] == match_id:
+                events.append({"at": goal["at"] + 2, "match": match_id, "type": "var", "team": goal["team"]})
+    return {"matches": matches, "events": events}
+
+
+# --- SERVER ---
+class MockState(object):
+    def __init__(self, timeline, speed, api_key, per_minute, latency, log_file):
+        self.timeline = timeline
+        self.speed = float(speed)
+        self.api_key = api_key
+        self.per_minute = per_minute
+        self.latency = latency / 1000.0
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.window_start = self.started
+        self.window_count = 0
+        self.log_file = log_file
+
+    def virtualMinute(self):
+        return (time.time() - self.started) * self.speed / 60.0
+
+    def takeRequest(self):
+        """Free-tier style counter: (allowed, remaining, seconds_to_reset)."""
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= 60:
+                self.window_start = now
+                self.window_count = 0
+            reset = int(60 - (now - self.window_start)) + 1
+            if self.window_count >= self.per_minute:
+                return False, 0, reset
+            self.window_count += 1
+            return True, self.per_minute - self.window_count, reset
+
+    def log(self, entry):
+        if self.log_file is None:
+            return
+        with self.lock:
+            self.log_file.write(json.dumps(entry) + "\n")
+            self.log_file.flush()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    state = None
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        state = self.state
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        path = parts.path.rstrip("/")
+        minute = state.virtualMinute()
+        if state.latency:
+            time.sleep(state.latency)
+
+        if path == "/mock/state":
+            return self.sendJson(200, {
+                "minute": minute,
+                "events": state.timeline.firedEvents(minute),
+            })
+
+        if self.headers.get("X-Auth-Token") != state.api_key:
+            return self.sendJson(403, {"message": "The resource you are looking for is restricted."}, path)
+
+        allowed, remaining, reset = state.takeRequest()
+        if not allowed or state.timeline.rateLimited(minute):
+            return self.sendJson(429, {"message": "You reached your request limit."}, path,
+                                 {"X-Requests-Available-Minute": "0", "X-RequestCounter-Reset": str(reset)})
+        quota = {"X-Requests-Available-Minute": str(remaining), "X-RequestCounter-Reset": str(reset)}
+
+        matches = state.timeline.payload(minute)
+        segments = path.split("/")
+        if path.startswith("/v4/competitions/") and path.endswith("/matches"):
+            code = segments[3]
+            matches = [m for m in matches if m["competition"]["code"] == code]
+        elif path == "/v4/matches":
+            codes = query.get("competitions", [""])[0].split(",")
+            if codes != [""]:
+                matches = [m for m in matches if m["competition"]["code"] in codes]
+        elif path.startswith("/v4/teams/") and path.endswith("/matches"):
+            team_id = int(segments[3])
+            matches = [m for m in matches if team_id in (m["homeTeam"].get("id"), m["awayTeam"].get("id"))]
+        elif path.startswith("/v4/competitions/") and path.endswith("/standings"):
+            return self.sendJson(200, standingsPayload(segments[3], matches), path, quota)
+        elif path.startswith("/v4/matches/") and len(segments) == 4 and segments[3].isdigit():
+            match = state.timeline.detail(int(segments[3]), minute)
+            if match is None:
+                return self.sendJson(404, {"message": "No match " + segments[3]}, path, quota)
+            return self.sendJson(200, match, path, quota)
+        else:
+            return self.sendJson(404, {"message": "Not mocked: " + path}, path, quota)
+
+        body = {"filters": dict((k, v[0]) for k, v in query.items()), "resultSet": {"count": len(matches)}, "matches": matches}
+        self.sendJson(200, body, path, quota)
+
+    def sendJson(self, code, body, path=None, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        etag = '"%x"' % (hash(data) & 0xffffffff)
+        if code == 200 and self.headers.get("If-None-Match") == etag:
+            code, data = 304, b""
+        elif "gzip" in self.headers.get("Accept-Encoding", "") and data:
+            buf = BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb") as f:
+                f.write(data)
+            data = buf.getvalue()
+            headers = dict(headers or {}, **{"Content-Encoding": "gzip"})
+
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if code in (200, 304):
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+        if path is not None:
+            self.state.log({"t": time.time(), "minute": round(self.state.virtualMinute(), 2),
+                            "path": self.path, "status": code, "bytes": len(data)})
+
+
+def standingsPayload(code, matches):
+    """A TOTAL table of `code` from the timeline's finished matches."""
+    rows = {}
+    for match in matches:
+        if match["competition"]["code"] != code:
+            continue
+        for side in ("homeTeam", "awayTeam"):
+            team = match[side]
+            rows.setdefault(team.get("id"), {"team": team, "playedGames": 0, "won": 0, "draw": 0, "lost": 0,
+                                             "points": 0, "goalsFor": 0, "goalsAgainst": 0})
+        if match["status"] != "FINISHED":
+            continue
+        score = match["score"]["fullTime"]
+        for side, goals_for, goals_against in (("homeTeam", score["home"], score["away"]),
+                                               ("awayTeam", score["away"], score["home"])):
+            row = rows[match[side].get("id")]
+            row["playedGames"] += 1
+            row["goalsFor"] += goals_for
+            row["goalsAgainst"] += goals_against
+            if goals_for > goals_against:
+                row["won"] += 1
+                row["points"] += 3
+            elif goals_for == goals_against:
+                row["draw"] += 1
+                row["points"] += 1
+            else:
+                row["lost"] += 1
+    table = sorted(rows.values(), key=lambda r: (-r["points"], r["goalsAgainst"] - r["goalsFor"], -r["goalsFor"]))
+    for position, row in enumerate(table):
+        row["position"] = position + 1
+        row["goalDifference"] = row["goalsFor"] - row["goalsAgainst"]
+    return {"competition": {"code": code}, "standings": [{"stage": "REGULAR_SEASON", "type": "TOTAL", "group": None, "table": table}]}
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def startServer(timeline, port=0, speed=60, api_key=DEFAULT_KEY, per_minute=FREE_TIER_PER_MINUTE, latency=0, log_file=None):
+    """Start the mock in a background thread; returns the server (server_port is set)."""
+    handler = type("BoundMockHandler", (MockHandler,), {})
+    handler.state = MockState(timeline, speed, api_key, per_minute, latency, log_file)
+    server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="FootScoresMock")
+    thread.daemon = True
+    thread.start()
+    return server
+
+def loadTimeline(path, synthetic, seed):
+    if synthetic:
+        return ScriptedTimeline(syntheticTimeline(synthetic, seed), time.time())
+    with open(path, "r") as f:
+        spec = json.load(f)
+    if "frames" in spec:
+        return RecordedTimeline(spec)
+    return ScriptedTimeline(spec, time.time())
+
+
+# --- RECORDING ---
+def record(args):
+    frames = []
+    started = time.time()
+    url = REAL_API + "competitions/" + args.competition + "/matches"
+    if args.date:
+        url += "?dateFrom=" + args.date + "&dateTo=" + args.date
+    try:
+        while args.duration <= 0 or time.time() - started < args.duration * 60:
+            req = Request(url)
+            req.add_header("X-Auth-Token", args.key)
+            try:
+                payload = json.loads(urlopen(req, timeout=15).read().decode("utf-8"))
+                frames.append({"t": round(time.time() - started, 1), "payload": payload})
+                print("frame %d: %d matches" % (len(frames), len(payload.get("matches", []))))
+            except Exception as e:
+                print("poll failed: %s" % e)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    with open(args.out, "w") as f:
+        json.dump({"frames": frames}, f, separators=(",", ":"))
+    print("wrote %d frames to %s" % (len(frames), args.out))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="football-data.org v4 stand-in for FootScores")
+    sub = parser.add_subparsers(dest="command")
+
+    serve = sub.add_parser("serve", help="run the mock server (default)")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--timeline", help="scripted or recorded timeline JSON")
+    serve.add_argument("--synthetic", type=int, default=0, help="generate N matches instead of --timeline")
+    serve.add_argument("--seed", type=int, default=1)
+    serve.add_argument("--speed", type=float, default=60, help="virtual seconds per real second")
+    serve.add_argument("--key", default=DEFAULT_KEY, help="accepted X-Auth-Token")
+    serve.add_argument("--per-minute", type=int, default=FREE_TIER_PER_MINUTE, help="requests allowed per minute")
+    serve.add_argument("--latency", type=int, default=0, help="artificial response delay in ms")
+    serve.add_argument("--log", help="append one JSON line per API request")
+
+    rec = sub.add_parser("record", help="capture a real match day")
+    rec.add_argument("--key", required=True)
+    rec.add_argument("--competition", default="PL")
+    rec.add_argument("--date", help="YYYY-MM-DD, default: the API's default window")
+    rec.add_argument("--interval", type=int, default=30, help="seconds between polls")
+    rec.add_argument("--duration", type=int, default=0, help="minutes, 0 = until Ctrl+C")
+    rec.add_argument("--out", required=True)
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in ("serve", "record", "-h", "--help"):
+        argv.insert(0, "serve")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        return record(args)
+
+    if not args.timeline and not args.synthetic:
+        parser.error("serve needs --timeline or --synthetic")
+    log_file = open(args.log, "a") if args.log else None
+    server = startServer(loadTimeline(args.timeline, args.synthetic, args.seed), args.port, args.speed,
+                         args.key, args.per_minute, args.latency, log_file)
+    print("FootScores mock API on http://0.0.0.0:%d/v4/ (key %s, speed x%g)" % (server.server_port, args.key, args.speed))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
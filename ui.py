@@ -0,0 +1,1442 @@
+# -*- coding: utf-8 -*-
+from Screens.Screen import Screen
+from Screens.MessageBox import MessageBox
+from Screens.ChoiceBox import ChoiceBox
+from Screens.VirtualKeyBoard import VirtualKeyBoard
+from Components.ActionMap import ActionMap
+from Components.Label import Label
+from Components.ScrollLabel import ScrollLabel
+from Components.Pixmap import Pixmap
+from Screens.Standby import TryQuitMainloop 
+from enigma import eTimer
+import os
+import time
+from datetime import datetime, timedelta
+from .config import MULTI_LEAGUE, TEAM_MODE
+from .fetcher import fetchRecords
+from .records import FINISHED, IN_PLAY, PAUSED
+from .delta import GOAL_HOME, GOAL_AWAY, GOAL_DISALLOWED
+from .budget import PRIORITY_LOW, REQUEST_SCORES, REQUEST_STANDINGS, REQUEST_FIXTURES, REQUEST_DETAIL
+from .share import SHARE_OFF, SHARE_LEADER, SHARE_FOLLOWER
+from .service import (getService, UPDATE_DATA, UPDATE_STATUS, UPDATE_GOALS, UPDATE_ERROR,
+                      ERROR_NO_KEY, ERROR_AUTH, ERROR_RATE_LIMIT)
+from .sound import GoalSound
+from .updater import Updater
+from .httpclient import clock
+
+# --- CONFIGURATION & CONSTANTS ---
+PLUGIN_VERSION = "1.3" # Removed "All Competitions" (Unstable on Free Tier)
+
+# PATHS
+PLUGIN_PATH = os.path.dirname(os.path.abspath(__file__))
+ICON_FILENAME = "plugin.png"
+
+# GITHUB REPO BASE URL
+REPO_BASE = "https://raw.githubusercontent.com/Ahmed-Mohammed-Abbas/FootScores/main/"
+
+# FREE TIER COMPETITIONS (name, code)
+LEAGUES = [
+    ("Premier League", "PL"),
+    ("Champions League", "CL"),
+    ("Primera Division", "PD"),
+    ("Serie A", "SA"),
+    ("Bundesliga", "BL1"),
+    ("Ligue 1", "FL1"),
+    ("Eredivisie", "DED"),
+    ("Campeonato Brasileiro", "BSA"),
+    ("Championship", "ELC"),
+    ("Primeira Liga", "PPL"),
+    ("FIFA World Cup", "WC"),
+    ("European Championship", "EC"),
+]
+
+# RENDER LAYOUTS
+LAYOUT_MAIN = "main"
+LAYOUT_BAR = "bar"
+
+# Shared by every screen and outliving them, like the service (see setup())
+renderer = None
+notifier = None
+
+def groupByCompetition(matches, order):
+    """Split matches into (code, name, matches) groups, in the user's league order."""
+    groups = {}
+    for match in matches:
+        code = match.competition_code
+        if code not in groups:
+            groups[code] = (match.competition_name, [])
+        groups[code][1].append(match)
+
+    codes = [code for code in order if code in groups]
+    codes += sorted(code for code in groups if code not in codes)
+    return [(code, groups[code][0], groups[code][1]) for code in codes]
+
+# --- RENDERING ---
+class ScoreRenderer(object):
+    """Score texts of the service's current matches, shared by all views.
+
+    Texts are cached per (generation, live_only, layout) and match lines
+    per match; when the service moves on by one generation only the lines
+    it names as changed are dropped, otherwise all of them.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.live_only = False
+        self.generation = service.generation
+        self.line_cache = {}
+        self.render_cache = {}
+
+    def sync(self):
+        service = self.service
+        if service.generation == self.generation:
+            return
+        if service.generation == self.generation + 1 and service.changed_ids is not None:
+            for match_id in service.changed_ids:
+                self.line_cache.pop((match_id, False), None)
+                self.line_cache.pop((match_id, True), None)
+        else:
+            self.line_cache = {}
+        self.render_cache = {}
+        self.generation = service.generation
+
+    def renderKey(self):
+        """Changes whenever renderText would return something else."""
+        return (self.service.generation, self.live_only)
+
+    def renderText(self, layout):
+        """(text, match count) for the current data, cached per generation."""
+        self.sync()
+        key = (self.generation, self.live_only, layout)
+        rendered = self.render_cache.get(key)
+        if rendered is None:
+            rendered = self.render_cache[key] = self.buildText(layout)
+        return rendered
+
+    def displayGroups(self):
+        """The (code, name, matches) groups on screen, in display order."""
+        matches = self.service.matches or []
+        if self.live_only:
+            display_matches = [m for m in matches if m.isLive()]
+        else:
+            display_matches = matches
+        
+        if self.service.groupsByCompetition():
+            return groupByCompetition(display_matches, self.service.config.get("filter_leagues", []))
+        return [("", "", display_matches)]
+
+    def displayMatches(self):
+        return [match for code, name, group_matches in self.displayGroups() for match in group_matches]
+
+    def buildText(self, layout):
+        groups = self.displayGroups()
+        
+        is_bar_mode = layout == LAYOUT_BAR
+        lines = []
+        for code, name, group_matches in groups:
+            match_strings = [self.matchLine(match, is_bar_mode) for match in group_matches]
+            if is_bar_mode:
+                prefix = "[" + code + "] " if code else ""
+                for i in range(0, len(match_strings), 3):
+                    lines.append(prefix + "   |   ".join(match_strings[i:i+3]))
+            else:
+                if code:
+                    lines.append("--- " + name + " ---")
+                lines.extend(match_strings)
+        
+        text = "\n".join(lines) + "\n" if lines else ""
+        return text, sum(len(group_matches) for code, name, group_matches in groups)
+
+    def matchLine(self, match, is_bar_mode=False):
+        key = (match.id, is_bar_mode)
+        line = self.line_cache.get(key)
+        if line is None:
+            line = self.formatMatchLine(match, is_bar_mode)
+            self.line_cache[key] = line
+        return line
+
+    def formatMatchLine(self, match, is_bar_mode=False):
+        goal_event = self.service.goal_marks.get(match.id)
+        
+        if is_bar_mode:
+            home = match.home_bar
+            away = match.away_bar
+        else:
+            home = match.home
+            away = match.away
+        status = match.status
+
+        if goal_event == GOAL_HOME:
+            home = home + " (GOAL!)"
+        elif goal_event == GOAL_AWAY:
+            away = "(GOAL!) " + away
+        
+        if status == FINISHED:
+            line = "%s %d-%d %s (FT)" % (home, match.home_score, match.away_score, away)
+        elif status in (IN_PLAY, PAUSED):
+            minute = str(match.minute) if match.minute is not None else ""
+            line = "%s %d-%d %s (%s')" % (home, match.home_score, match.away_score, away, minute)
+            
+            if goal_event == GOAL_DISALLOWED:
+                line = ">>> VAR DISALLOWED <<< " + line
+        else:
+            line = "%s vs %s (%s)" % (home, away, match.kickoff_str)
+            
+        return line
+
+    def modeText(self):
+        return "LIVE ONLY" if self.live_only else "ALL MATCHES"
+
+# --- GOAL NOTIFICATION POPUP ---
+POPUP_CYCLE_MS = 3500       # time each goal stays on screen when several are queued
+POPUP_MIN_MS = 10000        # popup lifetime after the last added goal
+SOUND_MIN_INTERVAL = 10     # seconds between two goal sounds
+
+def goalMessage(match, goal_event):
+    h_int, a_int = match.score
+    if goal_event == GOAL_DISALLOWED:
+        return "VAR: GOAL DISALLOWED!\n%s %d-%d %s" % (match.home, h_int, a_int, match.away)
+    scorer = match.home if goal_event == GOAL_HOME else match.away
+    return "GOAL for %s!\n%s %d-%d %s" % (scorer, match.home, h_int, a_int, match.away)
+
+class GoalPopup(Screen):
+    skin = """
+        <screen position="center,950" size="1200,100" flags="wfNoBorder" backgroundColor="#41000000" title="Goal Notification">
+            <widget name="goal_text" position="10,10" size="1180,80" font="Regular;32" foregroundColor="#00ff00" valign="center" halign="center" transparent="1" />
+        </screen>
+    """
+    def __init__(self, session, messages):
+        Screen.__init__(self, session)
+        self.messages = []
+        self.index = 0
+        self["goal_text"] = Label("")
+        
+        self["actions"] = ActionMap(["OkCancelActions", "ColorActions", "DirectionActions"], 
+        {
+            "ok": self.restoreMain,
+            "blue": self.restoreMain,
+            "left": self.previousMessage,
+            "right": self.nextMessage,
+            "cancel": self.close
+        }, -1)
+        
+        self.timer = eTimer()
+        self.timer.callback.append(self.close)
+        
+        self.cycle_timer = eTimer()
+        self.cycle_timer.callback.append(self.nextMessage)
+        self.onClose.append(self.timer.stop)
+        self.onClose.append(self.cycle_timer.stop)
+        
+        self.addMessages(messages)
+
+    def addMessages(self, messages):
+        """Queue more goals on the already visible popup instead of stacking a new one."""
+        self.messages.extend(messages)
+        self.showMessage()
+        self.timer.start(max(POPUP_MIN_MS, POPUP_CYCLE_MS * len(self.messages)), True)
+        if len(self.messages) > 1:
+            self.cycle_timer.start(POPUP_CYCLE_MS, False)
+
+    def showMessage(self):
+        message = self.messages[self.index]
+        if len(self.messages) > 1:
+            message = "(%d/%d) %s" % (self.index + 1, len(self.messages), message)
+        self["goal_text"].setText(message)
+
+    def nextMessage(self):
+        self.index = (self.index + 1) % len(self.messages)
+        self.showMessage()
+
+    def previousMessage(self):
+        self.index = (self.index - 1) % len(self.messages)
+        self.showMessage()
+
+    def restoreMain(self):
+        self.close()
+        main(self.session)
+
+class GoalNotifier(object):
+    """Turns the service's goal updates into sounds and popups.
+
+    At most one goal sound plays per poll and per SOUND_MIN_INTERVAL,
+    however many matches scored. Popups are only shown with no viewer
+    open (the viewers mark GOAL! in the match lines instead); all goals of
+    a poll go into a single GoalPopup, or onto the one still visible.
+    """
+
+    def __init__(self, session, service):
+        self.session = session
+        self.service = service
+        self.popup = None
+        self.last_sound = 0
+        
+        # Loaded shortly after start-up, so the first goal plays instantly
+        self.sound = GoalSound(PLUGIN_PATH)
+        self.sound_timer = eTimer()
+        self.sound_timer.callback.append(self.sound.preload)
+        self.sound_timer.start(1000, True)
+        
+        service.subscribe(self.serviceUpdated, viewer=False)
+
+    def close(self):
+        self.service.unsubscribe(self.serviceUpdated)
+        self.sound_timer.stop()
+        self.sound.close()
+
+    def serviceUpdated(self, kind, goals):
+        if kind != UPDATE_GOALS:
+            return
+        background = not self.service.hasViewers()
+        sound = False
+        messages = []
+        for match, goal_event in goals:
+            sound = sound or goal_event != GOAL_DISALLOWED
+            if background and self.service.isFavouriteMatch(match.home_id, match.away_id, match.home, match.away):
+                messages.append(goalMessage(match, goal_event))
+        if sound:
+            self.playSound()
+        if messages:
+            self.showMessages(messages)
+
+    def playSound(self):
+        now = time.time()
+        if now - self.last_sound >= SOUND_MIN_INTERVAL:
+            self.last_sound = now
+            self.sound.play()
+
+    def showMessages(self, messages):
+        if self.popup is not None:
+            self.popup.addMessages(messages)
+        else:
+            self.popup = self.session.open(GoalPopup, messages)
+            self.popup.onClose.append(self.popupClosed)
+
+    def popupClosed(self):
+        self.popup = None
+
+# --- SCREEN 2: MINI BAR ---
+class FootballScoresBar(Screen):
+    skin = """
+        <screen position="center,930" size="1200,150" flags="wfNoBorder" backgroundColor="#40000000" title="FootScores Bar">
+            <widget name="scores" position="10,10" size="1180,100" font="Regular;24" foregroundColor="#ffffff" transparent="1" />
+            <widget name="status" position="10,110" size="1180,30" font="Regular;20" foregroundColor="#dddddd" transparent="1" />
+            
+            <widget name="league_info" position="3000,3000" size="10,10" />
+            <widget name="credit" position="3000,3000" size="10,10" />
+            <widget name="key_green" position="3000,3000" size="10,10" />
+            <widget name="key_yellow" position="3000,3000" size="10,10" />
+            <widget name="key_blue" position="3000,3000" size="10,10" />
+        </screen>
+    """
+
+    def __init__(self, session):
+        Screen.__init__(self, session)
+        self.service = getService()
+        self.renderer = renderer
+        
+        self["scores"] = ScrollLabel("")
+        self["status"] = Label("")
+        self["league_info"] = Label("")
+        self["credit"] = Label("")
+        self["key_green"] = Label("")
+        self["key_yellow"] = Label("")
+        self["key_blue"] = Label("")
+        
+        self.rendered_key = None
+        self.rendered_count = 0
+        self.status_key = None
+
+        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions"],
+        {
+            "ok": self.closeBar,         
+            "cancel": self.closeBar,     
+            "up": self.pageUp,
+            "down": self.pageDown,
+            "green": self.closeBar,      
+            "blue": self.goToBackground, 
+            "yellow": self.toggleLiveMode,
+        }, -1)
+        
+        # Pushed by the service; nothing to poll
+        self.service.subscribe(self.serviceUpdated)
+        self.onClose.append(self.detach)
+        self.updateDisplay()
+
+    def detach(self):
+        self.service.unsubscribe(self.serviceUpdated)
+
+    def serviceUpdated(self, kind, value):
+        if kind in (UPDATE_DATA, UPDATE_STATUS):
+            self.updateDisplay()
+
+    def closeBar(self):
+        self.close()
+
+    def goToBackground(self):
+        # The main screen below closes too; the service keeps polling
+        self.close(True)
+
+    def toggleLiveMode(self):
+        self.renderer.live_only = not self.renderer.live_only
+        self.updateDisplay()
+
+    def pageUp(self):
+        self["scores"].pageUp()
+    
+    def pageDown(self):
+        self["scores"].pageDown()
+
+    def updateDisplay(self):
+        if self.service.matches is None:
+            self["scores"].setText("Loading...")
+            return
+
+        started = clock()
+        widgets = 0
+        try:
+            # Only touch the widgets when the rendered data or its age changed
+            render_key = self.renderer.renderKey()
+            if render_key != self.rendered_key:
+                output, count = self.renderer.renderText(LAYOUT_BAR)
+                self["scores"].setText(output)
+                widgets += 1
+                self.rendered_key = render_key
+                self.rendered_count = count
+
+            status_key = (self.service.fetched_at, self.rendered_count)
+            if status_key != self.status_key:
+                self.status_key = status_key
+                updated = time.strftime("%H:%M:%S", time.localtime(self.service.fetched_at or time.time()))
+                self["status"].setText("Mode: Bar | Found: " + str(self.rendered_count) + " | Upd: " + updated)
+                widgets += 1
+            
+        except:
+            pass
+        self.service.addRenderCost(clock() - started, widgets)
+
+# --- FIXTURE BROWSER ---
+FIXTURE_DAYS = 7            # one page of the browser's date range
+FIXTURE_PAGE_LINES = 13     # lines that fit the scores widget
+
+class FixtureBrowser(Screen):
+    """Fixtures and results beyond today: a week at a time, or a matchday.
+
+    The payload is decoded match by match into MatchRecords on the worker
+    thread (fetchRecords), and only the visible page is formatted and put
+    into the ScrollLabel; the page index is built from the records without
+    formatting anything.
+    """
+    skin = """
+        <screen position="center,center" size="700,520" title="FootScores Fixtures">
+            <widget name="scores" position="10,10" size="680,350" font="Regular;24" />
+            <widget name="league_info" position="10,365" size="680,40" font="Regular;23" halign="center" foregroundColor="#ff0000" />
+            <widget name="status" position="10,410" size="680,50" font="Regular;20" halign="center" />
+            <widget name="key_red" position="10,475" size="160,40" font="Regular;20" halign="left" foregroundColor="#ff0000" />
+            <widget name="key_green" position="180,475" size="160,40" font="Regular;20" halign="center" foregroundColor="#00ff00" />
+            <widget name="key_yellow" position="350,475" size="160,40" font="Regular;20" halign="center" foregroundColor="#ffff00" />
+            <widget name="key_blue" position="520,475" size="170,40" font="Regular;20" halign="right" foregroundColor="#00aaff" />
+        </screen>
+    """
+
+    def __init__(self, session):
+        Screen.__init__(self, session)
+        self.service = getService()
+        self.renderer = renderer
+        self.start_day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.matchday = None
+        self.records = []
+        self.pages = []         # [(first record index, last record index), ...]
+        self.page = 0
+        self.serial = 0
+
+        self["scores"] = ScrollLabel("")
+        self["league_info"] = Label("")
+        self["status"] = Label("")
+        self["key_red"] = Label("< Week")
+        self["key_green"] = Label("Week >")
+        self["key_yellow"] = Label("Matchday" if self.canUseMatchday() else "")
+        self["key_blue"] = Label("Today")
+
+        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions"],
+        {
+            "ok": self.close,
+            "cancel": self.close,
+            "up": self.previousPage,
+            "down": self.nextPage,
+            "left": self.previousWeek,
+            "right": self.nextWeek,
+            "red": self.previousWeek,
+            "green": self.nextWeek,
+            "yellow": self.askMatchday,
+            "blue": self.thisWeek,
+        }, -1)
+
+        self.onClose.append(self.cancelFetch)
+        self.onLayoutFinish.append(self.load)
+
+    def canUseMatchday(self):
+        # ?matchday= only exists on the single-competition endpoint
+        return not self.service.isMultiLeague() and not self.service.isTeamMode()
+
+    def previousWeek(self):
+        self.shiftWeek(-FIXTURE_DAYS)
+
+    def nextWeek(self):
+        self.shiftWeek(FIXTURE_DAYS)
+
+    def thisWeek(self):
+        self.start_day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.matchday = None
+        self.load()
+
+    def shiftWeek(self, days):
+        self.start_day += timedelta(days=days)
+        self.matchday = None
+        self.load()
+
+    def askMatchday(self):
+        if not self.canUseMatchday():
+            return
+        self.session.openWithCallback(
+            self.matchdayEntered,
+            VirtualKeyBoard,
+            title="Matchday number:",
+            text=str(self.matchday or "")
+        )
+
+    def matchdayEntered(self, result):
+        if result is None: return
+        try:
+            matchday = int(result.strip())
+        except ValueError:
+            self["status"].setText("Not a matchday number: " + result)
+            return
+        if matchday > 0:
+            self.matchday = matchday
+            self.load()
+
+    def rangeText(self):
+        if self.matchday is not None:
+            return "Matchday " + str(self.matchday)
+        end_day = self.start_day + timedelta(days=FIXTURE_DAYS - 1)
+        return self.start_day.strftime("%d.%m.") + " - " + end_day.strftime("%d.%m.%Y")
+
+    def load(self):
+        api_key = self.service.config.get("api_key", "")
+        if not api_key:
+            self["status"].setText("Error: No API Key")
+            return
+        if self.matchday is not None:
+            query = "matchday=" + str(self.matchday)
+        else:
+            end_day = self.start_day + timedelta(days=FIXTURE_DAYS - 1)
+            query = "dateFrom=" + self.start_day.strftime("%Y-%m-%d") + "&dateTo=" + end_day.strftime("%Y-%m-%d")
+
+        self["league_info"].setText(self.service.config.get("league_name", "") + " | " + self.rangeText())
+        self["status"].setText("Loading...")
+        self.serial += 1
+        serial = self.serial
+        # Low priority, and paging quickly only fetches the page landed on
+        budget = self.service.budget
+        budget.submit(REQUEST_FIXTURES, PRIORITY_LOW, lambda: self.send(serial, query))
+        if budget.isQueued(REQUEST_FIXTURES):
+            self["status"].setText("Waiting for the request budget...")
+
+    def send(self, serial, query):
+        url = self.service.route(self.service.matchesUrl(query))
+        headers = {'X-Auth-Token': self.service.config.get("api_key", "")}
+        client = self.service.shared_client
+        self.service.fetch_engine.submit(
+            lambda: fetchRecords(url, headers, timeout=15, client=client),
+            lambda result: self.recordsReceived(serial, result[0], result[1]),
+            lambda error: self.recordsFailed(serial, url, error)
+        )
+
+    def cancelFetch(self):
+        self.serial += 1
+        self.service.budget.cancel(REQUEST_FIXTURES)
+
+    def recordsReceived(self, serial, records, headers):
+        if serial != self.serial:
+            return
+        self.service.updateQuota(headers)
+        records.sort(key=lambda m: (m.kickoff or 0, m.competition_code))
+        self.records = records
+        self.pages = self.paginate(records)
+        self.page = 0
+        self.showPage()
+
+    def recordsFailed(self, serial, url, error):
+        if serial != self.serial:
+            return
+        self.service.requestFailed(error)
+        if self.service.routeFailed(url, error):
+            # The LAN leader is gone; the service now routes directly
+            self.load()
+            return
+        self.records = []
+        self.pages = []
+        self["scores"].setText("Could not load fixtures:\n" + str(error))
+        self["status"].setText("Error")
+
+    def dayKey(self, match):
+        if match.kickoff is None:
+            return None
+        return time.localtime(match.kickoff)[:3]
+
+    def paginate(self, records):
+        """Split into pages of FIXTURE_PAGE_LINES, counting one line per day header."""
+        pages = []
+        first = 0
+        lines = 0
+        day = ()
+        for index, match in enumerate(records):
+            key = self.dayKey(match)
+            needed = 2 if key != day else 1
+            if lines + needed > FIXTURE_PAGE_LINES and index > first:
+                pages.append((first, index))
+                first = index
+                lines = 0
+                needed = 2      # a page always starts with its day header
+            lines += needed
+            day = key
+        if records:
+            pages.append((first, len(records)))
+        return pages
+
+    def showPage(self):
+        if not self.pages:
+            self["scores"].setText("No fixtures in this range.")
+            self["status"].setText(self.rangeText() + " | 0 Matches")
+            return
+        first, last = self.pages[self.page]
+        prefix = self.service.groupsByCompetition()
+        lines = []
+        day = ()
+        for match in self.records[first:last]:
+            key = self.dayKey(match)
+            if key != day:
+                day = key
+                if key is None:
+                    lines.append("--- Date TBD ---")
+                else:
+                    lines.append("--- " + time.strftime("%a %d %b", time.localtime(match.kickoff)) + " ---")
+            line = self.renderer.formatMatchLine(match)
+            if prefix:
+                line = "[" + match.competition_code + "] " + line
+            lines.append(line)
+        self["scores"].setText("\n".join(lines))
+        self["status"].setText("Page %d/%d | %d Matches" % (self.page + 1, len(self.pages), len(self.records)))
+
+    def previousPage(self):
+        if self.page > 0:
+            self.page -= 1
+            self.showPage()
+
+    def nextPage(self):
+        if self.page + 1 < len(self.pages):
+            self.page += 1
+            self.showPage()
+
+# --- STANDINGS ---
+class StandingsScreen(Screen):
+    """League table of one competition from the service's standings cache.
+
+    Opening it costs no request while the cached table is current. The
+    live poll marks a table outdated when one of its matches scores or
+    finishes; an open table then refreshes itself on the next data update.
+    """
+    skin = """
+        <screen position="center,center" size="700,520" title="FootScores Standings">
+            <widget name="scores" position="10,10" size="680,350" font="Console;20" />
+            <widget name="league_info" position="10,365" size="680,40" font="Regular;23" halign="center" foregroundColor="#ff0000" />
+            <widget name="status" position="10,410" size="680,50" font="Regular;20" halign="center" />
+            <widget name="key_red" position="10,475" size="200,40" font="Regular;20" halign="left" foregroundColor="#ff0000" />
+            <widget name="key_green" position="490,475" size="200,40" font="Regular;20" halign="right" foregroundColor="#00ff00" />
+        </screen>
+    """
+
+    def __init__(self, session, code):
+        Screen.__init__(self, session)
+        self.service = getService()
+        self.code = code
+        self.serial = 0
+
+        self["scores"] = ScrollLabel("")
+        self["league_info"] = Label("")
+        self["status"] = Label("")
+        self["key_red"] = Label("< League")
+        self["key_green"] = Label("League >")
+
+        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions"],
+        {
+            "ok": self.close,
+            "cancel": self.close,
+            "up": self.pageUp,
+            "down": self.pageDown,
+            "left": self.previousLeague,
+            "right": self.nextLeague,
+            "red": self.previousLeague,
+            "green": self.nextLeague,
+        }, -1)
+
+        self.service.subscribe(self.serviceUpdated, viewer=False)
+        self.onClose.append(self.detach)
+        self.onLayoutFinish.append(self.load)
+
+    def detach(self):
+        self.serial += 1
+        self.service.cancelStandings()
+        self.service.unsubscribe(self.serviceUpdated)
+
+    def serviceUpdated(self, kind, value):
+        if kind == UPDATE_DATA and self.service.standings.needsRefresh(self.code):
+            self.load()
+
+    def leagueName(self):
+        for name, code in LEAGUES:
+            if code == self.code:
+                return name
+        return self.code
+
+    def previousLeague(self):
+        self.shiftLeague(-1)
+
+    def nextLeague(self):
+        self.shiftLeague(1)
+
+    def shiftLeague(self, step):
+        codes = [code for name, code in LEAGUES]
+        index = codes.index(self.code) if self.code in codes else 0
+        self.code = codes[(index + step) % len(codes)]
+        self["scores"].setText("")
+        self.load()
+
+    def load(self):
+        self["league_info"].setText("Table: " + self.leagueName())
+        self["status"].setText("Loading...")
+        self.serial += 1
+        serial = self.serial
+        self.service.requestStandings(self.code, lambda table, error: self.standingsLoaded(serial, table, error))
+        if self.service.budget.isQueued(REQUEST_STANDINGS):
+            self["status"].setText("Waiting for the request budget...")
+
+    def standingsLoaded(self, serial, table, error):
+        if serial != self.serial:
+            return
+        if table is None:
+            self["scores"].setText("Could not load the table:\n" + str(error))
+            self["status"].setText("Error")
+            return
+        self["scores"].setText(self.tableText(table))
+        when = time.strftime("%d.%m. %H:%M", time.localtime(table.fetched))
+        if error is not None:
+            self["status"].setText("Cached: " + when + " (update failed)")
+        elif table.outdated:
+            self["status"].setText("Updated: " + when + " | results pending")
+        else:
+            self["status"].setText("Updated: " + when)
+
+    def tableText(self, table):
+        favourite = self.service.favouriteTeamId()
+        lines = []
+        for group, rows in table.groups:
+            if group:
+                lines.append("--- " + group + " ---")
+            lines.append("Pos Team             P  W  D  L   GD Pts")
+            for row in rows:
+                mark = ">" if favourite is not None and row.team_id == favourite else " "
+                lines.append("%s%2d %-15s %2d %2d %2d %2d %+4d %3d" % (
+                    mark, row.position, row.team[:15], row.played, row.won, row.draw,
+                    row.lost, row.goal_difference, row.points))
+        if not lines:
+            return "No table for this competition."
+        return "\n".join(lines)
+
+    def pageUp(self):
+        self["scores"].pageUp()
+
+    def pageDown(self):
+        self["scores"].pageDown()
+
+# --- MATCH DETAILS ---
+class MatchDetailScreen(Screen):
+    """Scorers, cards, substitutions and lineups of one match (/matches/{id}).
+
+    Details are fetched only when a match is opened, from the service's
+    per-match cache; LEFT/RIGHT step through the matches of the list it
+    was opened from. Once a match is shown, the next one in the browsing
+    direction is prefetched if the request budget is mostly unused.
+    """
+    skin = """
+        <screen position="center,center" size="700,520" title="FootScores Match">
+            <widget name="scores" position="10,10" size="680,400" font="Regular;22" />
+            <widget name="status" position="10,420" size="680,40" font="Regular;20" halign="center" />
+            <widget name="key_red" position="10,475" size="200,40" font="Regular;20" halign="left" foregroundColor="#ff0000" />
+            <widget name="key_green" position="490,475" size="200,40" font="Regular;20" halign="right" foregroundColor="#00ff00" />
+        </screen>
+    """
+
+    def __init__(self, session, matches, index):
+        Screen.__init__(self, session)
+        self.service = getService()
+        self.renderer = renderer
+        self.matches = matches
+        self.index = index
+        self.step = 1
+        self.serial = 0
+
+        self["scores"] = ScrollLabel("")
+        self["status"] = Label("")
+        self["key_red"] = Label("< Match")
+        self["key_green"] = Label("Match >")
+
+        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions"],
+        {
+            "ok": self.close,
+            "cancel": self.close,
+            "up": self.pageUp,
+            "down": self.pageDown,
+            "left": self.previousMatch,
+            "right": self.nextMatch,
+            "red": self.previousMatch,
+            "green": self.nextMatch,
+        }, -1)
+
+        self.service.subscribe(self.serviceUpdated, viewer=False)
+        self.onClose.append(self.detach)
+        self.onLayoutFinish.append(self.load)
+
+    def detach(self):
+        self.serial += 1
+        self.service.cancelDetail()
+        self.service.unsubscribe(self.serviceUpdated)
+
+    def matchId(self):
+        return self.matches[self.index].id
+
+    def serviceUpdated(self, kind, value):
+        # A live match's details went stale (new goal, new status): refresh the open one
+        if kind == UPDATE_DATA and not self.service.details.isFresh(self.matchId()):
+            self.load()
+
+    def previousMatch(self):
+        self.shiftMatch(-1)
+
+    def nextMatch(self):
+        self.shiftMatch(1)
+
+    def shiftMatch(self, step):
+        self.step = step
+        self.index = (self.index + step) % len(self.matches)
+        self["scores"].setText("")
+        self.load()
+
+    def load(self):
+        match = self.matches[self.index]
+        self["scores"].setText(self.headerText(match))
+        self["status"].setText("Loading...")
+        self.serial += 1
+        serial = self.serial
+        self.service.requestDetail(match.id, lambda detail, error: self.detailLoaded(serial, detail, error))
+        if self.service.budget.isQueued(REQUEST_DETAIL):
+            self["status"].setText("Waiting for the request budget...")
+
+    def detailLoaded(self, serial, detail, error):
+        if serial != self.serial:
+            return
+        if detail is None:
+            self["status"].setText("Could not load details: " + str(error)[:40])
+            return
+        self["scores"].setText(self.detailText(detail))
+        when = time.strftime("%H:%M:%S", time.localtime(detail.fetched)) if detail.fetched else "-"
+        if error is not None:
+            self["status"].setText("Cached: " + when + " (update failed)")
+        else:
+            self["status"].setText("%d/%d | Updated: %s" % (self.index + 1, len(self.matches), when))
+        if len(self.matches) > 1:
+            # One neighbour at most, in the direction the user is browsing
+            self.service.prefetchDetail(self.matches[(self.index + self.step) % len(self.matches)].id)
+
+    def headerText(self, match):
+        # Shown from the list's record until the details arrive
+        return self.renderer.formatMatchLine(match) + "\n" + match.competition_name
+
+    def detailText(self, detail):
+        match = detail.match
+        lines = [self.renderer.formatMatchLine(match), match.competition_name]
+        info = []
+        if detail.half_time is not None:
+            info.append("HT %d-%d" % detail.half_time)
+        if detail.venue:
+            info.append(detail.venue)
+        if detail.referee:
+            info.append("Referee: " + detail.referee)
+        if info:
+            lines.append(" | ".join(info))
+
+        names = {"home": match.home, "away": match.away}
+        for title, events in (("Goals", detail.goals), ("Cards", detail.cards), ("Substitutions", detail.substitutions)):
+            if not events:
+                continue
+            lines.append("")
+            lines.append("--- " + title + " ---")
+            for minute, side, text in events:
+                lines.append("%6s  %s: %s" % (minute, names.get(side, "?"), text))
+        if detail.goals is None and detail.cards is None:
+            lines.append("")
+            lines.append("No goal or card details for this match on your API plan.")
+
+        for side, team, formation, coach, players, bench in detail.lineups or []:
+            lines.append("")
+            lines.append("--- " + team + (" (" + formation + ")" if formation else "") + " ---")
+            lines.extend(players)
+            if bench:
+                lines.append("Bench: " + ", ".join(bench))
+            if coach:
+                lines.append("Coach: " + coach)
+        return "\n".join(lines)
+
+    def pageUp(self):
+        self["scores"].pageUp()
+
+    def pageDown(self):
+        self["scores"].pageDown()
+
+# --- DIAGNOSTICS ---
+class DiagnosticsScreen(Screen):
+    skin = """
+        <screen position="center,center" size="1100,620" title="FootScores Diagnostics">
+            <widget name="report" position="10,10" size="1080,550" font="Console;18" />
+            <widget name="key_green" position="10,575" size="300,35" font="Regular;20" foregroundColor="#00ff00" />
+            <widget name="key_red" position="790,575" size="300,35" font="Regular;20" halign="right" foregroundColor="#ff0000" />
+        </screen>
+    """
+
+    REFRESH_MS = 2000
+
+    def __init__(self, session):
+        Screen.__init__(self, session)
+        self.service = getService()
+        self.diagnostics = self.service.diagnostics
+        self.shown_total = None
+
+        self["report"] = ScrollLabel("")
+        self["key_green"] = Label("")
+        self["key_red"] = Label("Close")
+
+        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions"],
+        {
+            "ok": self.close,
+            "cancel": self.close,
+            "red": self.close,
+            "up": self.pageUp,
+            "down": self.pageDown,
+            "green": self.toggleLog,
+        }, -1)
+
+        self.timer = eTimer()
+        self.timer.callback.append(self.refresh)
+        self.onClose.append(self.timer.stop)
+        self.refresh()
+
+    def refresh(self):
+        # Only re-render when another poll cycle was recorded
+        if self.diagnostics.total != self.shown_total:
+            self.shown_total = self.diagnostics.total
+            self["report"].setText(self.service.budget.status() + "\n" + self.diagnostics.summary())
+        self["key_green"].setText("Log: On" if self.diagnostics.log_enabled else "Log: Off")
+        self.timer.start(self.REFRESH_MS, True)
+
+    def toggleLog(self):
+        self.service.setDiagnosticsLog(not self.diagnostics.log_enabled)
+        self.shown_total = None
+        self.refresh()
+
+    def pageUp(self):
+        self["report"].pageUp()
+
+    def pageDown(self):
+        self["report"].pageDown()
+
+# --- SCREEN 1: MAIN WINDOW ---
+class FootballScoresScreen(Screen):
+    skin = """
+        <screen position="center,center" size="700,520" title="Live Football Scores">
+            <widget name="cover_bg" position="0,0" size="700,520" zPosition="10" backgroundColor="#000000" />
+            <widget name="cover_img" position="150,60" size="400,400" zPosition="11" alphatest="blend" scale="1" />
+            
+            <widget name="scores" position="10,10" size="680,350" font="Regular;26" zPosition="1" />
+            <widget name="league_info" position="10,365" size="680,40" font="Regular;23" halign="center" foregroundColor="#ff0000" zPosition="1" />
+            <widget name="status" position="10,410" size="680,50" font="Regular;20" halign="center" zPosition="1" />
+            <widget name="credit" position="10,475" size="200,40" font="Regular;20" halign="left" foregroundColor="#ffcc00" zPosition="1" />
+            
+            <widget name="key_green" position="220,475" size="150,40" font="Regular;20" halign="center" foregroundColor="#00ff00" zPosition="1" />
+            <widget name="key_yellow" position="380,475" size="150,40" font="Regular;20" halign="center" foregroundColor="#ffff00" zPosition="1" />
+            <widget name="key_blue" position="540,475" size="150,40" font="Regular;20" halign="right" foregroundColor="#00aaff" zPosition="1" />
+        </screen>
+    """
+    
+    def __init__(self, session):
+        Screen.__init__(self, session)
+        self.session = session
+        self.service = getService()
+        self.config = self.service.config
+        self.renderer = renderer
+        
+        self.shown_render = None
+        self.displayed_count = 0
+        self.bar_open = False
+        
+        self["cover_bg"] = Label("")
+        self["cover_img"] = Pixmap()
+        
+        self["scores"] = ScrollLabel("")
+        self["league_info"] = Label("")
+        self["status"] = Label("Initializing...")
+        self["credit"] = Label("Ver: " + PLUGIN_VERSION + " | By Reali22")
+        
+        self["key_green"] = Label("Mini Bar")
+        self["key_yellow"] = Label("Live Only")
+        self["key_blue"] = Label("Background")
+        
+        self["actions"] = ActionMap(["OkCancelActions", "DirectionActions", "ColorActions", "MenuActions"],
+        {
+            "ok": self.selectMatch, 
+            "cancel": self.quitPlugin,   
+            "menu": self.openMenu, 
+            "up": self.pageUp,
+            "down": self.pageDown,
+            "red": self.selectLeague,
+            "green": self.openBar,       
+            "yellow": self.toggleLiveMode,
+            "blue": self.hideToBackground, 
+        }, -1)
+        
+        self.cover_timer = eTimer()
+        self.cover_timer.callback.append(self.hideCover)
+        
+        self.updater = Updater(PLUGIN_PATH, PLUGIN_VERSION, REPO_BASE)
+        self.update_plan = None
+        
+        self.onLayoutFinish.append(self.startPlugin)
+        self.onClose.append(self.detach)
+    
+    def startPlugin(self):
+        self.updateLeagueInfo()
+        self.updateYellowButtonLabel()
+        
+        try:
+            icon_path = os.path.join(PLUGIN_PATH, ICON_FILENAME)
+            if os.path.exists(icon_path):
+                self["cover_img"].instance.setPixmapFromFile(icon_path)
+        except:
+            self.hideCover()
+        
+        self.cover_timer.start(3000, True) 
+        
+        self.update_timer = eTimer()
+        self.update_timer.callback.append(self.checkUpdates)
+        self.update_timer.start(3000, True) 
+        
+        self.service.subscribe(self.serviceUpdated)
+        self.config.addObserver(self.settingsChanged)
+        if self.service.matches is not None:
+            # Reopened while the service kept polling: show its data at once
+            self.displayScores()
+        
+        api_key = self.config.get("api_key", "")
+        
+        if not api_key or len(api_key) < 5:
+            self.displayApiKeyPrompt()
+        else:
+            self.service.start()
+
+    def detach(self):
+        self.service.unsubscribe(self.serviceUpdated)
+        self.config.removeObserver(self.settingsChanged)
+        self.updater.stop()
+
+    def settingsChanged(self, names):
+        if "league_name" in names:
+            self.updateLeagueInfo()
+
+    def serviceUpdated(self, kind, value):
+        if self.bar_open:
+            # Hidden below the bar; redrawn once the bar closes
+            return
+        if kind == UPDATE_DATA:
+            self.displayScores()
+        elif kind == UPDATE_STATUS:
+            self.updateStatusLine(self.renderer.modeText(), self.displayed_count)
+        elif kind == UPDATE_ERROR:
+            self.showError(*value)
+
+    def showError(self, kind, message, wait):
+        if kind == ERROR_NO_KEY:
+            self.setStatusText("Error: No API Key")
+        elif kind == ERROR_AUTH:
+            self.setStatusText("Error: Invalid API Key")
+            self.setScoresText("Your API key was rejected.")
+        elif kind == ERROR_RATE_LIMIT:
+            self.setStatusText("Error: Too Many Requests")
+            self.setScoresText("API Limit Reached. Slowing down...")
+        else:
+            self.setStatusText("Error: " + message[:40])
+            self.setScoresText("Connection error: " + message + "\n\nRetrying in " + str(wait) + "s...")
+
+    def hideCover(self):
+        try:
+            self["cover_bg"].hide()
+            self["cover_img"].hide()
+        except:
+            pass
+
+    def selectMatch(self):
+        matches = self.renderer.displayMatches()
+        if not matches:
+            return
+        prefix = self.service.groupsByCompetition()
+        options = []
+        for index, match in enumerate(matches):
+            line = self.renderer.matchLine(match)
+            if prefix:
+                line = "[" + match.competition_code + "] " + line
+            options.append((line, index))
+        self.session.openWithCallback(
+            lambda choice: self.matchSelected(matches, choice),
+            ChoiceBox, title="Match Details", list=options)
+
+    def matchSelected(self, matches, choice):
+        if choice is None: return
+        self.session.open(MatchDetailScreen, matches, choice[1])
+
+    def hideToBackground(self):
+        # Only the screen goes away; the service keeps polling for goals
+        self.close()
+        self.session.open(MessageBox, "FootScores in Background.\nNotifications Active.\nPress MENU to quit.", MessageBox.TYPE_INFO, timeout=2)
+
+    def openBar(self):
+        self.hide() 
+        try:
+            self.bar_open = True
+            self.session.openWithCallback(self.barClosed, FootballScoresBar)
+        except Exception as e:
+            self.bar_open = False
+            self.show()
+            self.setScoresText("Error opening Bar: " + str(e))
+
+    def barClosed(self, to_background=False):
+        self.bar_open = False
+        if to_background:
+            self.hideToBackground()
+            return
+        self.show()
+        self.updateYellowButtonLabel()
+        if self.service.matches is not None:
+            self.displayScores()
+
+    def openMenu(self):
+        options = [
+            ("Change API Key", "apikey"),
+            ("Fixtures (7 days)", "fixtures"),
+            ("League Table", "standings"),
+            ("Set Favourite Team", "favourite"),
+            ("Set API Server", "apibase"),
+            ("LAN Sharing", "share"),
+            ("Diagnostics", "diagnostics"),
+            ("Quit Plugin Completely", "quit")
+        ]
+        self.session.openWithCallback(self.menuCallback, ChoiceBox, title="Menu", list=options)
+
+    def menuCallback(self, choice):
+        if choice:
+            if choice[1] == "quit":
+                self.quitPlugin()
+            elif choice[1] == "apikey":
+                self.changeApiKey()
+            elif choice[1] == "fixtures":
+                self.session.open(FixtureBrowser)
+            elif choice[1] == "standings":
+                self.session.open(StandingsScreen, self.standingsCode())
+            elif choice[1] == "diagnostics":
+                self.session.open(DiagnosticsScreen)
+            elif choice[1] == "share":
+                self.selectShareMode()
+            elif choice[1] == "apibase":
+                self.session.openWithCallback(
+                    self.apiBaseEntered,
+                    VirtualKeyBoard,
+                    title="API base URL (empty for football-data.org):",
+                    text=self.service.apiBase()
+                )
+            elif choice[1] == "favourite":
+                self.session.openWithCallback(
+                    self.favouriteEntered,
+                    VirtualKeyBoard,
+                    title="Favourite team (name, short name or TLA, empty to clear):",
+                    text=self.config.get("favorite_team", "")
+                )
+
+    def selectShareMode(self):
+        options = [
+            ("Off: this box uses the API itself", SHARE_OFF),
+            ("Leader: fetch for the other boxes", SHARE_LEADER),
+            ("Follower: use another box's data", SHARE_FOLLOWER),
+        ]
+        title = "LAN Sharing (" + self.service.shareStatus() + ")"
+        self.session.openWithCallback(self.shareModeSelected, ChoiceBox, title=title, list=options)
+
+    def shareModeSelected(self, choice):
+        if choice is None: return
+        if choice[1] == SHARE_FOLLOWER:
+            self.session.openWithCallback(
+                self.shareLeaderEntered,
+                VirtualKeyBoard,
+                title="Leader box address (IP or IP:port):",
+                text=self.config.get("share_leader", "")
+            )
+            return
+        self.service.setShareMode(choice[1])
+        self["status"].setText("LAN sharing: " + self.service.shareStatus())
+
+    def shareLeaderEntered(self, result):
+        if not result or not result.strip(): return
+        self.service.setShareMode(SHARE_FOLLOWER, result.strip())
+        self["status"].setText("LAN sharing: " + self.service.shareStatus())
+
+    def standingsCode(self):
+        """The competition whose table to open first: the one being watched."""
+        if self.service.isMultiLeague():
+            return self.config["filter_leagues"][0]
+        if self.service.isTeamMode():
+            matches = self.service.matches
+            return matches[0].competition_code if matches else "PL"
+        return self.config.get("filter_league", "PL")
+
+    def apiBaseEntered(self, result):
+        if result is None: return
+        self.service.setApiBase(result.strip())
+        self["status"].setText("API server: " + self.service.apiBase())
+
+    def favouriteEntered(self, result):
+        if result is None: return
+        name = result.strip()
+        team_id = self.service.setFavourite(name)
+        if not name:
+            self["status"].setText("Favourite team cleared")
+        elif team_id is not None:
+            self["status"].setText("Favourite: " + self.service.favouriteName())
+        else:
+            self["status"].setText("Favourite saved; it will be matched once its team appears")
+
+    def quitPlugin(self):
+        shutdown()
+        self.close()
+
+    def checkUpdates(self):
+        # Manifest fetch and file hashing run on the updater's worker thread
+        self.updater.check(self.updateAvailable)
+
+    def updateAvailable(self, plan):
+        self.update_plan = plan
+        self.session.openWithCallback(
+            self.askUpdate, 
+            MessageBox, 
+            "New Update Available!\n\nLocal Ver: " + PLUGIN_VERSION + "\nOnline Ver: " + plan.version +
+            "\nDownload: %d files, %d KB" % (len(plan.files), plan.downloadSize() // 1024) +
+            "\n\nDo you want to update and restart now?", 
+            MessageBox.TYPE_YESNO
+        )
+
+    def askUpdate(self, result):
+        if result:
+            self.performUpdate()
+
+    def performUpdate(self):
+        self.setStatusText("Updating... Please wait.")
+        self.updater.install(self.update_plan, self.updateInstalled, self.updateFailed)
+
+    def updateInstalled(self):
+        self.session.open(MessageBox, "Update Successful!\nGUI will restart now...", MessageBox.TYPE_INFO, timeout=3)
+        self.restart_timer = eTimer()
+        self.restart_timer.callback.append(self.doRestart)
+        self.restart_timer.start(3000, True)
+
+    def updateFailed(self, error):
+        self.updateStatusLine(self.renderer.modeText(), self.displayed_count)
+        self.session.open(MessageBox, "Update Failed:\n" + str(error) + "\n\nThe installed version was left unchanged.", MessageBox.TYPE_ERROR)
+
+    def doRestart(self):
+        # The GUI restart would drop settings still waiting for their write
+        self.config.flush()
+        self.session.open(TryQuitMainloop, 3)
+
+    def toggleLiveMode(self):
+        self.renderer.live_only = not self.renderer.live_only
+        self.updateYellowButtonLabel()
+        if self.service.matches is not None:
+            self.displayScores()
+
+    def updateYellowButtonLabel(self):
+        if self.renderer.live_only:
+            self["key_yellow"].setText("Show All")
+        else:
+            self["key_yellow"].setText("Live Only")
+
+    def displayApiKeyPrompt(self):
+        try:
+            self.session.openWithCallback(
+                self.apiKeyEntered, 
+                VirtualKeyBoard, 
+                title="Enter Football-Data.org API Key:", 
+                text=self.config.get("api_key", "")
+            )
+        except Exception as e:
+            self.setScoresText("Error opening keyboard: " + str(e))
+
+    def apiKeyEntered(self, result):
+        if result:
+            self["status"].setText("Key saved. Loading matches...")
+            self.service.setApiKey(result.strip())
+        else:
+            if not self.config.get("api_key"):
+                self.setScoresText("API Key is required.\n\nPress BLUE button to enter key.")
+                self["status"].setText("Missing API Key")
+
+    def changeApiKey(self):
+        self.displayApiKeyPrompt()
+
+    def updateLeagueInfo(self):
+        league_name = self.config.get("league_name", "Premier League")
+        self["league_info"].setText("Filter: " + league_name)
+    
+    def pageUp(self):
+        self["scores"].pageUp()
+    
+    def pageDown(self):
+        self["scores"].pageDown()
+
+    def selectLeague(self):
+        leagues = [("Multiple Leagues...", MULTI_LEAGUE)] + LEAGUES
+        team_id = self.service.favouriteTeamId()
+        if team_id is not None:
+            # One request covers every competition the team plays in
+            leagues.insert(0, (self.service.favouriteLabel(), TEAM_MODE))
+        self.session.openWithCallback(self.leagueSelected, ChoiceBox, title="Select League Filter", list=leagues)
+    
+    def leagueSelected(self, choice):
+        if choice is None: return
+        if choice[1] == MULTI_LEAGUE:
+            if self.service.isMultiLeague():
+                self.multi_selection = list(self.config.get("filter_leagues", []))
+            else:
+                self.multi_selection = [self.config.get("filter_league", "PL")]
+            self.selectMultiLeagues()
+            return
+        self.service.setFilter(choice[1], choice[0])
+        self.showBudgetWait()
+
+    def selectMultiLeagues(self):
+        options = [("Done (" + str(len(self.multi_selection)) + " selected)", None)]
+        for name, code in LEAGUES:
+            mark = "[x] " if code in self.multi_selection else "[  ] "
+            options.append((mark + name, code))
+        self.session.openWithCallback(self.multiLeagueToggled, ChoiceBox, title="Select Leagues (OK toggles)", list=options)
+
+    def multiLeagueToggled(self, choice):
+        if choice is None: return
+        code = choice[1]
+        if code is not None:
+            if code in self.multi_selection:
+                self.multi_selection.remove(code)
+            else:
+                self.multi_selection.append(code)
+            self.selectMultiLeagues()
+            return
+        if not self.multi_selection: return
+
+        # Keep the user's picks in the menu order so groups display predictably
+        codes = [c for n, c in LEAGUES if c in self.multi_selection]
+        self.service.setFilter(MULTI_LEAGUE, ", ".join(codes), codes)
+        self.showBudgetWait()
+
+    def showBudgetWait(self):
+        # Switched faster than the quota allows: the fetch waits for a token
+        if self.service.budget.isQueued(REQUEST_SCORES):
+            self["status"].setText("Waiting for the request budget...")
+
+    def displayScores(self):
+        started = clock()
+        try:
+            mode_text = self.renderer.modeText()
+            if self.service.matches is None:
+                # Filter changed and nothing is known for it yet
+                self.setScoresText("Loading matches...")
+                self.setStatusText("Mode: " + mode_text + " | Loading...")
+                self.displayed_count = 0
+                return
+            output, count = self.renderer.renderText(LAYOUT_MAIN)
+            if not count:
+                if self.renderer.live_only:
+                    self.setScoresText("No LIVE matches right now.\n\nPress YELLOW to see Scheduled/Finished matches.")
+                else:
+                    self.setScoresText("No matches found.\nLeague: " + self.config.get("league_name", "Unknown"))
+                self.setStatusText("Mode: " + mode_text + " | 0 Matches")
+                self.displayed_count = 0
+                return
+
+            render_key = self.renderer.renderKey()
+            if render_key != self.shown_render:
+                self["scores"].setText(output)
+                self.service.addRenderCost(0, 1)
+                self.shown_render = render_key
+            self.updateStatusLine(mode_text, count)
+            self.displayed_count = count
+            
+        except Exception as e:
+            self.setScoresText("Display Error: " + str(e))
+        finally:
+            self.service.addRenderCost(clock() - started, 0)
+
+    def setScoresText(self, text):
+        self["scores"].setText(text)
+        self.service.addRenderCost(0, 1)
+        self.shown_render = None
+
+    def setStatusText(self, text):
+        self["status"].setText(text)
+        self.service.addRenderCost(0, 1)
+
+    def updateStatusLine(self, mode_text, count):
+        if not count:
+            return
+        service = self.service
+        if service.stale and service.fetched_at:
+            updated = "Cached: " + time.strftime("%H:%M", time.localtime(service.fetched_at))
+        else:
+            updated = "Last Upd: " + time.strftime("%H:%M:%S", time.localtime(service.fetched_at or time.time()))
+        self.setStatusText("Mode: " + mode_text + " | Found: " + str(count) + " | " + updated)
+
+def setup(session):
+    """The service plus the renderer and goal notifier living alongside it."""
+    global renderer, notifier
+    service = getService()
+    if renderer is None:
+        renderer = ScoreRenderer(service)
+    if notifier is None:
+        notifier = GoalNotifier(session, service)
+    return service
+
+def shutdown():
+    """Quit completely: stop polling and drop the goal notifier."""
+    global notifier
+    getService().stop()
+    if notifier is not None:
+        notifier.close()
+        notifier = None
+
+def main(session, **kwargs):
+    setup(session)
+    session.open(FootballScoresScreen)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import shutil
+import hashlib
+
+from .fetcher import FetchEngine
+from .httpclient import http_client
+
+MANIFEST_NAME = "manifest.json"
+STAGING_DIR = ".update"         # inside the plugin dir: same filesystem, so renames are atomic
+UPDATE_TIMEOUT = 30
+
+
+class UpdateError(Exception):
+    pass
+
+
+class UpdatePlan(object):
+    """A newer release: its version and the files whose content differs."""
+    __slots__ = ("version", "files", "manifest")
+
+    def __init__(self, version, files, manifest):
+        self.version = version
+        self.files = files          # [(name, sha256, size), ...]
+        self.manifest = manifest
+
+    def downloadSize(self):
+        return sum(size for name, sha256, size in self.files)
+
+
+def fileHash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(65536)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def isNewer(remote_version, local_version):
+    try:
+        return float(remote_version) > float(local_version)
+    except:
+        return False
+
+def safeName(name):
+    """Manifest entries are plain file names in the plugin directory."""
+    return name and name == os.path.basename(name) and not name.startswith(".")
+
+
+class Updater(object):
+    """Background self-update: check, download, verify, swap.
+
+    All network and disk work runs on the updater's own FetchEngine worker,
+    so the GUI never blocks and score polling is not queued behind a
+    download. The manifest lists every file with its SHA-256 and size;
+    files whose installed copy already matches are skipped. Downloads are
+    staged in STAGING_DIR and verified (hash, size, and compiled when
+    Python) before anything is touched; only then is each file renamed
+    over the live one, with the previous files restored if a rename fails.
+    """
+
+    def __init__(self, plugin_path, local_version, base_url):
+        self.plugin_path = plugin_path
+        self.local_version = local_version
+        self.base_url = base_url
+        self.engine = FetchEngine()
+        self.busy = False
+
+    def stop(self):
+        self.engine.stop()
+        self.busy = False
+
+    # --- main loop API ---
+    def check(self, callback):
+        """callback(plan) on the main loop when a newer version is available."""
+        if self.busy:
+            return
+        self.busy = True
+
+        def done(plan):
+            self.busy = False
+            if plan is not None:
+                callback(plan)
+
+        def failed(error):
+            self.busy = False
+            print("[FootScores] update check failed: %s" % error)
+
+        self.engine.submit(self.fetchPlan, done, failed)
+
+    def install(self, plan, callback, errback):
+        """Download, verify and swap in `plan`; callback() once the new files are live."""
+        if self.busy:
+            return
+        self.busy = True
+
+        def done(result):
+            self.busy = False
+            callback()
+
+        def failed(error):
+            self.busy = False
+            errback(error)
+
+        self.engine.submit(lambda: self.installPlan(plan), done, failed)
+
+    # --- worker thread ---
+    def fetch(self, name, timeout=UPDATE_TIMEOUT):
+        url = self.base_url + name + "?t=" + str(int(time.time()))
+        return http_client.get(url, timeout=timeout, conditional=False).body
+
+    def fetchPlan(self):
+        manifest = json.loads(self.fetch(MANIFEST_NAME, timeout=10).decode("utf-8"))
+        version = str(manifest.get("version", ""))
+        if not isNewer(version, self.local_version):
+            return None
+
+        files = []
+        for name, entry in sorted(manifest.get("files", {}).items()):
+            if not safeName(name):
+                raise UpdateError("bad file name in manifest: %r" % name)
+            local_path = os.path.join(self.plugin_path, name)
+            try:
+                if fileHash(local_path) == entry["sha256"]:
+                    continue
+            except (IOError, OSError):
+                pass
+            files.append((name, entry["sha256"], entry["size"]))
+        return UpdatePlan(version, files, manifest)
+
+    def installPlan(self, plan):
+        staging = os.path.join(self.plugin_path, STAGING_DIR)
+        self.clearStaging(staging)
+        os.makedirs(staging)
+        try:
+            staged = [self.stageFile(staging, name, sha256, size) for name, sha256, size in plan.files]
+            self.swap(staged)
+        finally:
+            self.clearStaging(staging)
+        return plan.version
+
+    def stageFile(self, staging, name, sha256, size):
+        data = self.fetch(name)
+        if len(data) != size:
+            raise UpdateError("%s: got %d bytes, expected %d" % (name, len(data), size))
+        if hashlib.sha256(data).hexdigest() != sha256:
+            raise UpdateError("%s: checksum mismatch" % name)
+        if name.endswith(".py"):
+            try:
+                compile(data, name, "exec")
+            except SyntaxError as e:
+                raise UpdateError("%s: %s" % (name, e))
+
+        path = os.path.join(staging, name)
+        with open(path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return name, path
+
+    def swap(self, staged):
+        """Rename every staged file over its live copy; all or nothing.
+
+        The live file is hard-linked aside first, so each rename replaces
+        it atomically and a failure part-way can put the old set back.
+        """
+        replaced = []
+        try:
+            for name, staged_path in staged:
+                target = os.path.join(self.plugin_path, name)
+                backup = staged_path + ".old"
+                if os.path.exists(target):
+                    try:
+                        os.link(target, backup)
+                    except OSError:
+                        shutil.copy2(target, backup)
+                else:
+                    backup = None
+                os.rename(staged_path, target)
+                replaced.append((target, backup))
+        except:
+            for target, backup in reversed(replaced):
+                try:
+                    if backup is not None:
+                        os.rename(backup, target)
+                    else:
+                        os.remove(target)
+                except Exception as e:
+                    print("[FootScores] update rollback failed for %s: %s" % (target, e))
+            raise
+
+    def clearStaging(self, staging):
+        if not os.path.isdir(staging):
+            return
+        for name in os.listdir(staging):
+            try:
+                os.remove(os.path.join(staging, name))
+            except OSError:
+                pass
+        try:
+            os.rmdir(staging)
+        except OSError:
+            pass